@@ -0,0 +1,71 @@
+"""
+Ambient mixer: layer decode/synthesis, a fresh mix vs. a cached balance,
+and what a slider drag sends to the client, on a headless page.
+
+    python benchmarks/bench_ambient.py --ticks 60
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flet as ft
+from headless import make_page
+from src.services import ambient_mixer
+from src.ui.components.ambient_audio import get_ambient_player, DEBOUNCE
+
+
+def timed(fn):
+    t = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t) * 1000
+
+
+async def drag(page, conn, ticks):
+    player = get_ambient_player(page)
+    await player.set_layer("rain", True)
+    await player.set_layer("wind", True)
+    await player.set_layer("thunder", True)
+    conn.reset()
+    for n in range(ticks):
+        player.set_volume("wind", 50 + n * 40 // ticks)
+        await asyncio.sleep(0.01)  # ~100 slider events a second
+    while player._pending is not None or player._apply_lock.locked():
+        await asyncio.sleep(DEBOUNCE)
+    audios = sum(isinstance(c, ft.Audio) for c in page.overlay)
+    return conn.messages, conn.bytes_sent, audios
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ticks", type=int, default=60, help="slider events in one drag")
+    args = parser.parse_args()
+
+    mixer = ambient_mixer.AmbientMixer(root=tempfile.mkdtemp())
+    ambient_mixer._mixer = mixer  # Scratch folder instead of the app's assets/
+
+    rows = [
+        ("decode/synthesize 3 layers", timed(lambda: [mixer.layer(n) for n in ambient_mixer.LAYERS])),
+        ("mix 3 layers (new balance)", timed(lambda: mixer.mix({"rain": 80, "wind": 40, "thunder": 60}))),
+        ("mix 3 layers (cached)", timed(lambda: mixer.mix({"rain": 80, "wind": 40, "thunder": 60}))),
+        ("only the loudest moved (cached)", timed(lambda: mixer.mix({"rain": 95, "wind": 48, "thunder": 71}))),
+    ]
+
+    async def run():
+        page, conn = make_page(loop=asyncio.get_running_loop())
+        return await drag(page, conn, args.ticks)
+    messages, sent, audios = asyncio.run(run())
+
+    for name, ms in rows:
+        print(f"{name:<36}{ms:>10.1f} ms")
+    print(f"{args.ticks}-event slider drag sent {messages} messages ({sent} bytes); "
+          f"{audios} player(s) on the page")
+    print(f"mixes on disk: {len(os.listdir(mixer.dir))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Focus-mode background through the asset cache, against the local fake CDN:
+cold fetch, sessions asking at once, warm lookups, and entering focus mode
+on a headless page online, then with the CDN gone.
+
+    python benchmarks/bench_assets.py --latency 0.2 --sessions 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_cdn import FakeCDN
+from headless import make_page
+
+
+async def enter_focus(timeout=10.0):
+    # A fresh session entering focus mode: how long until the local copy is up
+    from src.ui.focus_mode import FocusMode
+
+    async def nothing(*args):
+        pass
+
+    page, conn = make_page(loop=asyncio.get_running_loop())
+    t = time.perf_counter()
+    view = FocusMode(page, task_title="Bench", on_exit=nothing, on_complete=nothing)
+    page.add(view)
+    deadline = time.perf_counter() + timeout
+    while not view.background.src.startswith("/cache/"):
+        if time.perf_counter() > deadline:
+            return None, view.background.src
+        await asyncio.sleep(0.001)
+    return (time.perf_counter() - t) * 1000, view.background.src
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.2, help="Fake CDN latency per request (s)")
+    parser.add_argument("--sessions", type=int, default=20, help="sessions asking for the same variant at once")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=800)
+    args = parser.parse_args()
+
+    cdn = FakeCDN(latency=args.latency).start()
+    os.chdir(tempfile.mkdtemp())
+    os.environ["FLOWDECK_BACKGROUND"] = f"{cdn.url}/photo.jpg?q=80&auto=format&fit=crop"
+
+    from src.services import assets
+    cache = assets.AssetCache(root=tempfile.mkdtemp())
+    assets._cache = cache  # Scratch folder instead of the app's assets/
+    source = assets.focus_background()
+
+    rows = []
+    t = time.perf_counter()
+    cache.fetch(source, args.width, args.height)
+    rows.append(("cold fetch", cdn.requests, (time.perf_counter() - t) * 1000))
+
+    # Same picture, new window size: one more request; a size in the same bucket: none
+    before, t = cdn.requests, time.perf_counter()
+    threads = [threading.Thread(target=cache.fetch, args=(source, 1920, 1080)) for _ in range(args.sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    rows.append((f"{args.sessions} sessions, new size at once", cdn.requests - before, (time.perf_counter() - t) * 1000))
+    before, t = cdn.requests, time.perf_counter()
+    cache.fetch(source, args.width - 20, args.height - 10)
+    rows.append(("same size bucket", cdn.requests - before, (time.perf_counter() - t) * 1000))
+
+    before, t = cdn.requests, time.perf_counter()
+    for _ in range(1000):
+        cache.lookup(source, args.width, args.height)
+    rows.append(("1000 warm lookups", cdn.requests - before, (time.perf_counter() - t) * 1000))
+
+    async def focus_runs():
+        online = await enter_focus()
+        cdn.stop()  # Offline from here on
+        offline = await enter_focus()
+        return online, offline
+    (online_ms, _), (offline_ms, offline_src) = asyncio.run(focus_runs())
+
+    print(f"fake CDN latency {args.latency * 1000:.0f} ms, window {args.width}x{args.height}")
+    print(f"{'scenario':<36}{'requests':>10}{'ms':>10}")
+    for name, requests, ms in rows:
+        print(f"{name:<36}{requests:>10}{ms:>10.1f}")
+    print(f"{'enter focus mode (cached)':<36}{'':>10}{online_ms:>10.1f}")
+    print(f"{'enter focus mode (offline)':<36}{'':>10}" + (f"{offline_ms:>10.1f}" if offline_ms else "    FAILED"))
+    print(f"cache: {len(os.listdir(cache.dir)) - 1} files, background src {offline_src}")
+    if offline_ms is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Range queries over the binary focus-session log.
+
+    python benchmarks/bench_focus_log.py --years 5 --runs-per-day 30
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.focus_log import FocusLog, RECORD, START, PAUSE, RESUME, FINISH
+
+
+def generate(path, years, runs_per_day, tasks):
+    # Written straight to the file: going through append() would fsync every record
+    rng = random.Random(42)
+    now = time.time()
+    ts = now - years * 365 * 86400
+    count = 0
+    with open(path, "wb") as f:
+        while ts < now:
+            day_end = ts + 86400
+            for _ in range(runs_per_day):
+                task = rng.randrange(1, tasks)
+                run = rng.randrange(60, 1500)
+                f.write(RECORD.pack(ts, task, 0, rng.choice((START, RESUME))))
+                ts += run
+                f.write(RECORD.pack(ts, task, run, rng.choice((PAUSE, FINISH))))
+                ts += rng.randrange(30, 600)
+                count += 2
+            ts = max(ts, day_end)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--runs-per-day", type=int, default=30)
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "focus_sessions.bin")
+    count = generate(path, args.years, args.runs_per_day, args.tasks)
+    log = FocusLog(path)
+    print(f"{count} records, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    now = datetime.datetime.now()
+    for label, days in (("today", 1), ("last 7 days", 7), ("last 90 days", 90), ("last year", 365)):
+        start = now - datetime.timedelta(days=days)
+        t = time.perf_counter()
+        for _ in range(args.repeat):
+            result = log.focus_by_task_day(start, now)
+        ms = (time.perf_counter() - t) * 1000 / args.repeat
+        print(f"  per task per day, {label:<14}{ms:>8.2f} ms  ({len(result)} task-days)")
+
+
+if __name__ == "__main__":
+    main()
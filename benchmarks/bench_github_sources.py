@@ -0,0 +1,73 @@
+"""
+Several GitHub sources (assigned issues, PRs awaiting review, watched repos,
+a saved search) synced one after another vs. concurrently over one pooled
+session, against the local fake API. Overlapping sources are deduped.
+
+    python benchmarks/bench_github_sources.py --latency 0.05
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import FakeGitHub, make_issues
+from src.services.github_sync import GitHubSync, parse_sources
+
+SPEC = "assigned; review-requested; repo:acme/repo-1; repo:acme/repo-2; search:is:open is:issue org:acme 7"
+
+
+def timed(fake, fn):
+    before = fake.requests
+    start = time.perf_counter()
+    fn()
+    return fake.requests - before, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=250, help="assigned issues")
+    parser.add_argument("--others", type=int, default=1500, help="other open issues in the org")
+    parser.add_argument("--reviews", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake per-request server latency (s)")
+    args = parser.parse_args()
+
+    fake = FakeGitHub(
+        make_issues(args.issues),
+        others=make_issues(args.others, first=args.issues),
+        reviews=make_issues(args.reviews, first=args.issues + args.others, pulls=True),
+        latency=args.latency,
+    ).start()
+    folder = tempfile.mkdtemp()
+    sources = parse_sources(SPEC)
+
+    def fresh(name, picked):
+        return GitHubSync(token="bench", cache_file=os.path.join(folder, name), base_url=fake.url, sources=picked)
+
+    rows = []
+    one_by_one = 0.0
+    listed = 0
+    for source in sources:
+        sync = fresh(f"{len(rows)}.json", [source])
+        count, ms = timed(fake, sync.sync_once)
+        rows.append((f"  {source.key}", count, ms))
+        one_by_one += ms
+        listed += len(sync.get_cached_issues())
+
+    sync = fresh("all.json", sources)
+    rows.append(("all sources, concurrent", *timed(fake, sync.sync_once)))
+    rows.append(("  again (304s)", *timed(fake, sync.sync_once)))
+    fake.stop()
+
+    print(f"{len(sources)} sources, {args.latency * 1000:.0f} ms fake latency")
+    print(f"{'scenario':<48}{'requests':>10}{'ms':>10}")
+    for name, count, ms in rows:
+        print(f"{name:<48}{count:>10}{ms:>10.1f}")
+    print(f"sum of the sources one by one: {one_by_one:.1f} ms, slowest: {max(r[2] for r in rows[:len(sources)]):.1f} ms")
+    print(f"issues listed {listed}, cached after dedupe {len(sync.get_cached_issues())}")
+
+
+if __name__ == "__main__":
+    main()
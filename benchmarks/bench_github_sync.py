@@ -0,0 +1,61 @@
+"""
+Request count and latency of a full GitHub listing vs. incremental sync,
+against the local fake API.
+
+    python benchmarks/bench_github_sync.py --issues 600 --latency 0.02
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import FakeGitHub, make_issues
+from src.services.github_sync import GitHubClient, GitHubSync, _fetch_pages
+
+
+def timed(fake, fn):
+    before = fake.requests
+    start = time.perf_counter()
+    fn()
+    return fake.requests - before, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--issues", type=int, default=600)
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake per-request server latency (s)")
+    parser.add_argument("--edits", type=int, default=5)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(make_issues(args.issues), latency=args.latency).start()
+    cache = os.path.join(tempfile.mkdtemp(), "github_cache.json")
+    sync = GitHubSync(token="bench", cache_file=cache, base_url=fake.url)
+
+    def legacy():
+        # What the old PyGithub loop did: 30 per page, every time
+        _fetch_pages(GitHubClient("bench", fake.url), {"filter": "assigned", "state": "open", "per_page": 30})
+
+    rows = [
+        ("legacy full listing (per_page=30)", timed(fake, legacy)),
+        ("first sync (full, per_page=100)", timed(fake, lambda: sync.sync_once())),
+        ("next sync (boundary re-read)", timed(fake, lambda: sync.sync_once())),
+        ("no changes (304)", timed(fake, lambda: sync.sync_once())),
+    ]
+    fake.touch(args.edits, close=1)
+    rows.append((f"{args.edits} edited / 1 closed (delta)", timed(fake, lambda: sync.sync_once())))
+    rows.append(("settle (boundary re-read)", timed(fake, lambda: sync.sync_once())))
+    rows.append(("no changes (304)", timed(fake, lambda: sync.sync_once())))
+    fake.stop()
+
+    print(f"{args.issues} issues, {args.latency * 1000:.0f} ms fake latency")
+    print(f"{'scenario':<38}{'requests':>10}{'ms':>10}")
+    for name, (count, ms) in rows:
+        print(f"{name:<38}{count:>10}{ms:>10.1f}")
+    print(f"cached issues: {len(sync.get_cached_issues())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+A mouse sweep over a list of cards: what it costs the server and the wire
+with the old GlassCard (update per enter/exit, blur on every card) and
+with the current one (hover changes batched per page every HOVER_THROTTLE,
+one shared blur layer for long lists), on a headless page. The pointer
+spends --dwell ms on each card and finally rests on the middle one.
+
+The client's own frame time can't be measured without a client; the server
+time per hover event is reported against a 60 fps frame instead, since a
+handler slower than that makes the glow lag the pointer.
+
+    python benchmarks/bench_hover.py --cards 200 --sweeps 3 --dwell 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import flet as ft
+from headless import make_page
+from src.ui.components.glass_card import BLUR_LIMIT, HOVER_THROTTLE, GlassCard, glass_backdrop
+
+FRAME_MS = 1000 / 60
+
+warnings.filterwarnings("ignore", category=DeprecationWarning)  # ft.colors in the legacy copy
+
+
+class LegacyGlassCard(ft.Container):
+    # GlassCard as it was: every enter/exit goes to Python and back
+    def __init__(self, content, width=None, height=None):
+        super().__init__(
+            content=content, width=width, height=height, border_radius=15, padding=20,
+            bgcolor=ft.colors.with_opacity(0.05, ft.colors.WHITE),
+            border=ft.border.all(1, ft.colors.with_opacity(0.1, ft.colors.WHITE)),
+            blur=ft.Blur(10, 10, ft.BlurTileMode.MIRROR),
+            shadow=ft.BoxShadow(spread_radius=1, blur_radius=10, color=ft.colors.with_opacity(0.1, ft.colors.BLACK)),
+            on_hover=self.handle_hover,
+            animate=ft.animation.Animation(200, "easeOut"),
+            animate_scale=ft.animation.Animation(200, "easeOut"),
+        )
+
+    async def handle_hover(self, e):
+        if e.data == "true":
+            self.bgcolor = ft.colors.with_opacity(0.1, "#6200EA")
+            self.border = ft.border.all(1, ft.colors.with_opacity(0.5, "#BB86FC"))
+            self.shadow.blur_radius = 20
+            self.shadow.color = ft.colors.with_opacity(0.4, "#6200EA")
+            self.scale = 1.02
+        else:
+            self.bgcolor = ft.colors.with_opacity(0.05, ft.colors.WHITE)
+            self.border = ft.border.all(1, ft.colors.with_opacity(0.1, ft.colors.WHITE))
+            self.shadow.blur_radius = 10
+            self.shadow.color = ft.colors.with_opacity(0.1, ft.colors.BLACK)
+            self.scale = 1.0
+        self.update()
+
+
+def card_content(i):
+    # What a TaskCard holds
+    return ft.Row(
+        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+        controls=[
+            ft.Row(controls=[
+                ft.Checkbox(value=False),
+                ft.Column(spacing=2, controls=[ft.Text(f"Task {i}", size=16), ft.Text("Manual Entry", size=12)]),
+            ]),
+            ft.IconButton(ft.icons.PLAY_ARROW, icon_color="#BB86FC"),
+        ]
+    )
+
+
+class Hover:
+    def __init__(self, entered):
+        self.data = "true" if entered else "false"
+
+
+def walk(control):
+    yield control
+    for child in control._get_children():
+        yield from walk(child)
+
+
+async def hover(card, entered, samples):
+    t = time.perf_counter()
+    await card.handle_hover(Hover(entered))
+    samples.append((time.perf_counter() - t) * 1000)
+
+
+async def sweep(cards, conn, sweeps, dwell):
+    # What the client would send: enter + exit for every card under the
+    # pointer, dwell ms apart, then the pointer stops on the middle card
+    conn.reset()
+    samples = []
+    for _ in range(sweeps):
+        for card in cards:
+            await hover(card, True, samples)
+            await asyncio.sleep(dwell / 1000)
+            await hover(card, False, samples)
+    await hover(cards[len(cards) // 2], True, samples)
+    await asyncio.sleep(HOVER_THROTTLE * 2)  # Let the last batch go out
+    return samples, conn.messages / sweeps, conn.bytes_sent / sweeps
+
+
+async def run(n, sweeps, dwell):
+    loop = asyncio.get_running_loop()
+    results = {}
+    for name in ("legacy", "current"):
+        page, conn = make_page(loop=loop)
+        if name == "legacy":
+            cards = [LegacyGlassCard(card_content(i), width=600, height=80) for i in range(n)]
+            root = ft.Column(cards)
+        else:
+            shared = n > BLUR_LIMIT
+            cards = [GlassCard(card_content(i), width=600, height=80, blur=not shared) for i in range(n)]
+            root = glass_backdrop(ft.Column(cards)) if shared else ft.Column(cards)
+        t = time.perf_counter()
+        page.add(root)
+        add_ms = (time.perf_counter() - t) * 1000
+        add_bytes = conn.bytes_sent
+        samples, messages, sent = await sweep(cards, conn, sweeps, dwell)
+        results[name] = {
+            "first paint bytes": add_bytes,
+            "first paint ms": add_ms,
+            "blur layers": sum(1 for c in walk(root) if getattr(c, "blur", None) is not None),
+            "hover listeners": sum(1 for c in walk(root) if c._get_attr("onHover")),
+            "messages / sweep": messages,
+            "bytes / sweep": sent,
+            "server ms / event p50": statistics.median(samples) if samples else 0.0,
+            "server ms / event p95": sorted(samples)[int(len(samples) * 0.95)] if samples else 0.0,
+            "events over a frame": sum(1 for s in samples if s > FRAME_MS),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cards", type=int, default=200)
+    parser.add_argument("--sweeps", type=int, default=3)
+    parser.add_argument("--dwell", type=float, default=10, help="ms the pointer spends on each card")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.cards, args.sweeps, args.dwell))
+    print(f"{args.cards} cards, mouse swept across all of them {args.sweeps}x, {args.dwell:g} ms per card")
+    print(f"{'':<26}{'legacy':>14}{'current':>14}")
+    for key in results["legacy"]:
+        print(f"{key:<26}{results['legacy'][key]:>14.1f}{results['current'][key]:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Latency of a task mutation (add / toggle) as seen by the UI thread, against
+the number of tasks in the store, compared with the old save_tasks() path
+that rewrote the whole pretty-printed file on every change.
+
+    python benchmarks/bench_mutations.py --sizes 100 1000 10000 100000
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.local_db import TaskStore
+
+
+def seed(path, count):
+    base = int(datetime.datetime(2024, 1, 1).timestamp())
+    tasks = [{"id": base + i, "title": f"Task {i}", "type": "manual",
+              "completed": i % 3 == 0, "created_at": "2024-01-01 09:00:00"}
+             for i in range(count)]
+    tasks.reverse()  # Snapshot is newest first
+    with open(path, "w") as f:
+        json.dump(tasks, f, indent=4)
+    return [t["id"] for t in tasks]
+
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def bench_store(count, mutations):
+    folder = tempfile.mkdtemp()
+    db = os.path.join(folder, "my_tasks.json")
+    ids = seed(db, count)
+    store = TaskStore(db, os.path.join(folder, "my_tasks.log"))
+    rng = random.Random(1)
+
+    samples = []
+    for i in range(mutations):
+        task_id = rng.choice(ids)
+        t = time.perf_counter()
+        if i % 10 == 0:
+            store.add(f"New task {i}")
+        else:
+            task = store.get(task_id)
+            store.update(task_id, completed=not task["completed"])
+        samples.append((time.perf_counter() - t) * 1000)
+
+    t = time.perf_counter()
+    store.flush()
+    flush_ms = (time.perf_counter() - t) * 1000
+    store.close()
+
+    # Reload to make sure every mutation made it to disk
+    reloaded = TaskStore(db, os.path.join(folder, "my_tasks.log"))
+    assert reloaded.all(include_completed=True) == store.all(include_completed=True)
+    reloaded.close()
+    return samples, flush_ms
+
+
+def bench_rewrite(count, mutations):
+    # What every click used to cost: load-modify-dump of the whole file
+    folder = tempfile.mkdtemp()
+    db = os.path.join(folder, "my_tasks.json")
+    ids = seed(db, count)
+    with open(db) as f:
+        tasks = json.load(f)
+    rng = random.Random(1)
+
+    samples = []
+    for _ in range(mutations):
+        task_id = rng.choice(ids)
+        t = time.perf_counter()
+        for task in tasks:
+            if task["id"] == task_id:
+                task["completed"] = not task["completed"]
+                break
+        with open(db, "w") as f:
+            json.dump(tasks, f, indent=4)
+        samples.append((time.perf_counter() - t) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--mutations", type=int, default=500)
+    parser.add_argument("--rewrite-mutations", type=int, default=20,
+                        help="the full-rewrite baseline is slow on big stores, so it runs fewer")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>8} | {'write-behind p50':>16} {'p99':>8} {'flush':>8} | {'full rewrite p50':>16} {'p99':>8}")
+    for count in args.sizes:
+        samples, flush_ms = bench_store(count, args.mutations)
+        rewrite = bench_rewrite(count, args.rewrite_mutations)
+        print(f"{count:>8} | {percentile(samples, 0.5):>13.3f} ms {percentile(samples, 0.99):>5.3f} ms"
+              f" {flush_ms:>5.1f} ms | {percentile(rewrite, 0.5):>13.2f} ms {percentile(rewrite, 0.99):>5.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+GitHub write-back through the outbox against the local fake API: requests
+per queued write (GraphQL batches vs. one REST call each), draining through
+injected 403 / 429 secondary rate limits and a spent primary budget, and a
+queue that outlives a restart.
+
+The waits GitHub asks for are real seconds, so the fake's are kept short:
+Retry-After 1, a 2 s budget window, --secondary for 429s without one.
+
+    python benchmarks/bench_outbox.py --writes 60
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fake_github import FakeGitHub, make_issues
+from src.services import github_outbox
+from src.services.github_outbox import GitHubOutbox, CLOSE, REOPEN, COMMENT
+from src.services.github_sync import normalize_issue
+
+
+def queue(outbox, issues, writes, rest=False):
+    # Closes, with a focus-time comment on every third; returns the slowest enqueue (ms)
+    slowest = 0.0
+    for n, raw in enumerate(issues[:writes]):
+        issue = normalize_issue(raw)
+        if rest:
+            issue["node_id"] = None  # Cache from before node ids: REST only
+        t = time.perf_counter()
+        if n % 3 == 0:
+            outbox.enqueue(COMMENT, issue, "Focused on this for 25 min in FlowDeck.")
+        outbox.enqueue(CLOSE, issue)
+        slowest = max(slowest, (time.perf_counter() - t) * 1000)
+    return slowest
+
+
+async def drain(outbox, timeout=120):
+    # The real sender task, until the queue is empty
+    outbox.start()
+    start = time.perf_counter()
+    while outbox.pending() and time.perf_counter() - start < timeout:
+        await asyncio.sleep(0.02)
+    outbox.stop()
+    return time.perf_counter() - start
+
+
+def scenario(name, writes, rest=False, faults=(), limit=5000, window=3600, restart=False):
+    fake = FakeGitHub(make_issues(writes), limit=limit, window=window).start()
+    for status, count, retry_after in faults:
+        fake.inject(status, count, retry_after)
+    path = os.path.join(tempfile.mkdtemp(), "outbox.json")
+    outbox = GitHubOutbox(token="bench", outbox_file=path, base_url=fake.url)
+    enqueue_ms = queue(outbox, fake.issues, writes, rest)
+    queued = outbox.pending()
+    if restart:
+        outbox = GitHubOutbox(token="bench", outbox_file=path, base_url=fake.url)  # Fresh process, same file
+        outbox.hydrate()
+    seconds = asyncio.run(drain(outbox))
+    fake.stop()
+    closed = sum(1 for i in fake.issues if i["state"] == "closed")
+    comments = sum(len(c) for c in fake.comments.values())
+    return {
+        "scenario": name, "queued": queued, "requests": fake.writes, "rate limited": outbox.counts["rate_limited"],
+        "left": outbox.pending(), "closed": closed, "comments": comments,
+        "drain s": seconds, "enqueue ms max": enqueue_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writes", type=int, default=60, help="issues closed (plus a comment on every third)")
+    parser.add_argument("--secondary", type=float, default=1.0, help="wait after a 429 with no Retry-After (s)")
+    args = parser.parse_args()
+
+    github_outbox.SECONDARY_WAIT = args.secondary
+    github_outbox.BACKOFF_BASE = 0.5
+    n = args.writes
+    rows = [
+        scenario("GraphQL batches", n),
+        scenario("REST, one call per write", min(n, 10), rest=True),
+        scenario("403 Retry-After x2, 429 x1", n, faults=[(403, 2, 1), (429, 1, None)]),
+        scenario("primary budget: 2 per 2 s", n, limit=2 + github_outbox.RESERVE, window=2),
+        scenario("queued, restarted, drained", n, restart=True),
+    ]
+
+    # Ticked then unticked before it went out: nothing is sent
+    outbox = GitHubOutbox(token="bench", outbox_file=os.path.join(tempfile.mkdtemp(), "outbox.json"))
+    issue = normalize_issue(make_issues(1)[0])
+    outbox.enqueue(CLOSE, issue)
+    outbox.enqueue(REOPEN, issue)
+
+    keys = list(rows[0])[1:]
+    print(f"{'scenario':<30}" + "".join(f"{k:>16}" for k in keys))
+    for row in rows:
+        print(f"{row['scenario']:<30}" + "".join(
+            f"{row[k]:>16.2f}" if isinstance(row[k], float) else f"{row[k]:>16}" for k in keys))
+    print(f"close + reopen before sending leaves {outbox.pending()} op(s) queued")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Headless timing of the Dashboard and DailyDebrief control trees: building
+them, the first paint on mount (store page + cards + one update) and a
+refresh after a change, against synthetic data and the local fake GitHub
+API. No Flet client needed: the page's connection only counts the bytes.
+The views' clock is pinned to the fixtures' datagen.NOW, so byte and control
+counts don't depend on the time of day the benchmark runs.
+
+    python benchmarks/bench_render.py --tasks 100000 --issues 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datagen import NOW, seed_folder
+from fake_github import FakeGitHub, make_issues
+from headless import make_page
+
+
+def count_controls(control):
+    return 1 + sum(count_controls(c) for c in control._get_children())
+
+
+async def wait_for(check, timeout=30.0):
+    deadline = time.perf_counter() + timeout
+    while not check():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("view never painted")
+        await asyncio.sleep(0)
+
+
+async def measure(repeat):
+    from src.services.github_sync import get_sync
+    from src.services.local_db import get_store
+    from src.ui.dashboard import Dashboard
+    from src.ui.debrief import DailyDebrief
+
+    async def nothing(*args):
+        pass
+
+    def now():
+        return NOW
+
+    # Store and issues are loaded once, like a running app (their own costs
+    # are the store and sync cases of the suite); each repeat is a fresh
+    # session building its views on top
+    get_store()
+    get_sync().sync_once()
+
+    samples = []
+    loop = asyncio.get_running_loop()
+    for _ in range(repeat):
+        row = {}
+        page, conn = make_page(loop=loop)
+
+        t = time.perf_counter()
+        dashboard = Dashboard(page, on_start_focus=nothing, on_show_debrief=nothing, now=now)
+        row["dashboard_construct_ms"] = (time.perf_counter() - t) * 1000
+        t = time.perf_counter()
+        page.add(dashboard)  # build() + did_mount() -> load_tasks() + update
+        row["dashboard_mount_ms"] = (time.perf_counter() - t) * 1000
+        row["dashboard_controls"] = count_controls(dashboard)
+        row["dashboard_bytes"] = conn.bytes_sent
+
+        conn.reset()
+        dashboard.input_task.value = "Benchmark task"
+        t = time.perf_counter()
+        await dashboard.add_manual_task(None)
+        row["dashboard_add_ms"] = (time.perf_counter() - t) * 1000
+        row["dashboard_add_bytes"] = conn.bytes_sent
+        dashboard.stop_listening()
+        page.controls.clear()
+
+        conn.reset()
+        t = time.perf_counter()
+        debrief = DailyDebrief(page, on_back=nothing, now=now)
+        page.add(debrief)
+        await wait_for(lambda: debrief.today is not None and debrief.wins_list.loaded)
+        row["debrief_mount_ms"] = (time.perf_counter() - t) * 1000
+        row["debrief_controls"] = count_controls(debrief)
+        row["debrief_bytes"] = conn.bytes_sent
+        samples.append(row)
+
+    # Best of the repeats for timings; the counts are the same every time
+    return {key: min(r[key] for r in samples) for key in samples[0]}
+
+
+def run(tasks, issues, repeat=5, days=90):
+    """Seeds a scratch folder and measures there. Call once per process: the app's services are singletons."""
+    workdir = seed_folder(tempfile.mkdtemp(), tasks, days)
+    fake = FakeGitHub(make_issues(issues)).start()
+    os.chdir(workdir)
+    os.environ.update(GITHUB_API_URL=fake.url, GITHUB_TOKEN="bench")
+    try:
+        return asyncio.run(measure(repeat))
+    finally:
+        fake.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--issues", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the metrics as one JSON line")
+    args = parser.parse_args()
+
+    result = run(args.tasks, args.issues, args.repeat)
+    if args.json:
+        print(json.dumps(result))
+        return
+    print(f"{args.tasks} tasks, {args.issues} issues, best of {args.repeat}")
+    for key, value in result.items():
+        print(f"  {key:<26}{value:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
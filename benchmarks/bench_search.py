@@ -0,0 +1,90 @@
+"""
+Build the search index over synthetic tasks + issues and time queries and
+incremental updates.
+
+    python benchmarks/bench_search.py --tasks 40000 --issues 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.search_index import SearchIndex
+
+VERBS = ["fix", "add", "refactor", "review", "write", "update", "remove", "investigate",
+         "document", "migrate", "test", "deploy", "design", "profile", "cleanup"]
+NOUNS = ["dashboard", "timer", "sync", "login", "cache", "debrief", "sidebar", "checkbox",
+         "scheduler", "database", "ambient", "audio", "search", "export", "import", "release",
+         "notification", "settings", "keyboard", "shortcut", "theme", "layout", "issue", "token"]
+EXTRA = ["bug", "crash", "slow", "flaky", "docs", "ui", "api", "v2", "mobile", "desktop",
+         "groceries", "dentist", "invoice", "taxes", "birthday", "gym", "milk", "tickets"]
+REPOS = ["flowdesk", "flet-widgets", "dotfiles", "website", "infra", "mobile-app", "api-server"]
+
+
+def make_data(n_tasks, n_issues, seed=7):
+    rng = random.Random(seed)
+    def title():
+        words = [rng.choice(VERBS), rng.choice(NOUNS)] + rng.sample(EXTRA, rng.randrange(0, 3))
+        return " ".join(words) + f" #{rng.randrange(1, 5000)}"
+    tasks = [{"id": i, "title": title(), "type": "manual", "completed": rng.random() < 0.4}
+             for i in range(1, n_tasks + 1)]
+    issues = [{"id": 10_000_000 + i, "title": title(), "repo": rng.choice(REPOS),
+               "url": f"https://github.com/x/y/issues/{i}"} for i in range(n_issues)]
+    return tasks, issues
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2], samples[-1], result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=40000)
+    parser.add_argument("--issues", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    tasks, issues = make_data(args.tasks, args.issues)
+    index = SearchIndex()
+    t = time.perf_counter()
+    for task in tasks:
+        index.put_task(task)
+    index.sync_issues(issues)
+    print(f"index of {len(index)} items built in {(time.perf_counter() - t) * 1000:.0f} ms")
+
+    print(f"\n{'query':<28}{'p50':>9}{'max':>9}{'hits':>8}")
+    for query in ["d", "dash", "dashboard", "fix dash", "dashbaord", "scheduer crash",
+                  "is:open", "is:done sync", "repo:flow", "repo:infra is:issue token",
+                  "milk", "nothing-like-this"]:
+        p50, worst, keys = timed(lambda: index.search(query), args.repeat)
+        print(f"{query:<28}{p50:>6.2f} ms{worst:>6.2f} ms{len(keys):>8}")
+
+    print("\nincremental updates")
+    rng = random.Random(1)
+    p50, worst, _ = timed(lambda: index.put_task(dict(rng.choice(tasks), completed=True)), args.repeat)
+    print(f"  toggle one task             {p50:>6.3f} ms{worst:>7.3f} ms")
+    counter = iter(range(10**9))
+    p50, worst, _ = timed(lambda: index.put_task({"id": -next(counter), "title": "brand new task zebra"}),
+                          args.repeat)
+    print(f"  add one task                {p50:>6.3f} ms{worst:>7.3f} ms")
+
+    def resync():
+        changed = list(issues)
+        for i in rng.sample(range(len(changed)), 10):
+            changed[i] = dict(changed[i], title=changed[i]["title"] + " (edited)")
+        index.sync_issues(changed)
+    p50, worst, _ = timed(resync, 5)
+    print(f"  sync, 10 of {len(issues)} issues edited {p50:>6.2f} ms{worst:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
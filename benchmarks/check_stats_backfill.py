@@ -0,0 +1,107 @@
+"""
+First run after upgrading to the stats rollups: there is a task store but no
+my_stats.json / my_stats.log yet, so the first completion or reopen also
+builds the stats from the stored tasks. Checks the task being ticked off is
+counted exactly once, whichever comes first:
+
+  - complete first: today has one completion and one win for it, older
+    completions are backfilled on their own day
+  - reopen first: the reopened task's day goes back to zero, not below
+
+Every scenario runs in a fresh interpreter (the store and stats are
+per-process singletons), in its own scratch folder.
+
+    python benchmarks/check_stats_backfill.py
+"""
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def seed(folder, now):
+    # Two open tasks, one completed a few days ago (still has its wins) and
+    # one completed a month ago (rollups only)
+    recent = (now - datetime.timedelta(days=3)).replace(microsecond=0)
+    old = (now - datetime.timedelta(days=30)).replace(microsecond=0)
+    tasks = [
+        {"id": 4, "title": "old win", "type": "manual", "completed": True,
+         "created_at": str(old), "completed_at": old.isoformat()},
+        {"id": 3, "title": "recent win", "type": "manual", "completed": True,
+         "created_at": str(recent), "completed_at": recent.isoformat()},
+        {"id": 2, "title": "open", "type": "manual", "completed": False, "created_at": str(old)},
+        {"id": 1, "title": "to finish", "type": "manual", "completed": False, "created_at": str(old)},
+    ]
+    with open(os.path.join(folder, "my_tasks.json"), "w") as f:
+        json.dump(tasks, f)
+    return recent, old
+
+
+def scenario(first):
+    # In the child: the scratch folder is the cwd, like the app's
+    from src.services.local_db import mark_task_complete, flush_tasks
+    from src.services.stats import StatsStore
+
+    now = datetime.datetime.now()
+    recent, old = seed(os.getcwd(), now)
+    steps = [(1, True), (3, False)] if first == "complete" else [(3, False), (1, True)]
+    for task_id, done in steps:
+        mark_task_complete(task_id, is_complete=done, focus_seconds=300 if done else 0)
+    flush_tasks()
+
+    errors = []
+    stats = StatsStore()  # What the next start reads back from disk
+    today = stats.day(now)
+    if today["completed"] != 1 or today["focus_seconds"] != 300:
+        errors.append(f"today: {today['completed']} completed, {today['focus_seconds']} s, expected 1, 300 s")
+    ids = [w["id"] for w in today["wins"]]
+    if ids != [1]:
+        errors.append(f"today's wins: {ids}, expected [1]")
+    if len({w["at"] for w in today["wins"]}) != len(today["wins"]):
+        errors.append("today's wins share a timestamp (the debrief list keys them by it)")
+    reopened = stats.day(recent)
+    if reopened["completed"] != 0 or reopened["wins"]:
+        errors.append(f"{reopened['date']} after the reopen: {reopened['completed']} completed, "
+                      f"{len(reopened['wins'])} win(s), expected 0")
+    backfilled = stats.day(old)
+    if backfilled["completed"] != 1:
+        errors.append(f"{backfilled['date']}: {backfilled['completed']} completed, expected 1 (backfill)")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(scenario(args.child)))
+        return
+
+    failed = False
+    for first in ("complete", "reopen"):
+        env = dict(os.environ, PYTHONPATH=ROOT, GITHUB_TOKEN="")
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", first],
+                             cwd=tempfile.mkdtemp(), env=env, capture_output=True, text=True)
+        if out.returncode != 0:
+            print(f"{first} first: crashed\n{out.stderr}")
+            failed = True
+            continue
+        errors = json.loads(out.stdout.strip().splitlines()[-1])
+        print(f"{first} first: " + ("OK" if not errors else f"FAILED: {len(errors)} problems"))
+        for error in errors:
+            print("  " + error)
+        failed = failed or bool(errors)
+    if failed:
+        sys.exit(1)
+    print("OK: every completion counted once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Synthetic FlowDeck data, deterministic for a given seed and `now`: the
+task store, the stats rollups and the focus-session log, in the app's own
+file formats. `now` defaults to the fixed NOW, so benchmark fixtures are the
+same bytes at any time of day; the command line seeds up to the real now,
+for running the app on the result. Issues come from fake_github.make_issues().
+
+    python benchmarks/datagen.py --tasks 100000 --days 365 --out /tmp/flowdeck-data
+    cd /tmp/flowdeck-data && python /path/to/main.py
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.focus_log import RECORD, START, PAUSE, RESUME, FINISH
+
+VERBS = ["fix", "add", "refactor", "review", "write", "update", "remove", "investigate",
+         "document", "migrate", "test", "deploy", "design", "profile", "cleanup"]
+NOUNS = ["dashboard", "timer", "sync", "login", "cache", "debrief", "sidebar", "checkbox",
+         "scheduler", "database", "ambient", "audio", "search", "export", "import", "release"]
+EXTRA = ["bug", "crash", "slow", "docs", "ui", "api", "groceries", "dentist", "invoice", "gym"]
+
+NOW = datetime.datetime(2026, 3, 4, 10, 30)  # Fixture "now": a Wednesday morning
+
+
+def make_titles(rng):
+    while True:
+        words = [rng.choice(VERBS), rng.choice(NOUNS)] + rng.sample(EXTRA, rng.randrange(0, 3))
+        yield " ".join(words) + f" #{rng.randrange(1, 5000)}"
+
+
+def make_tasks(count, done_ratio=0.3, seed=42, now=NOW):
+    """`count` manual tasks, newest first (snapshot order), created over the 30 days before `now`."""
+    rng = random.Random(seed)
+    titles = make_titles(rng)
+    now = now.replace(microsecond=0)
+    step = datetime.timedelta(days=30) / max(count, 1)
+    tasks = []
+    for i in range(count):
+        created = now - step * (count - i)
+        task = {"id": i + 1, "title": next(titles), "type": "manual",
+                "completed": rng.random() < done_ratio,
+                "created_at": created.strftime("%Y-%m-%d %H:%M:%S")}
+        tasks.append(task)
+    tasks.reverse()
+    return tasks
+
+
+def write_tasks(folder, count, done_ratio=0.3, seed=42, now=NOW):
+    # Compact JSON: at 1M tasks the pretty-printed form is a lot of whitespace to parse
+    with open(os.path.join(folder, "my_tasks.json"), "w") as f:
+        json.dump(make_tasks(count, done_ratio, seed, now), f, separators=(",", ":"))
+
+
+def write_stats(folder, days, wins_per_day=5, seed=42, now=NOW):
+    """Rollups for `days` days up to `now`; the last week keeps its individual wins."""
+    rng = random.Random(seed)
+    titles = make_titles(rng)
+    today = now.date()
+    data = {"days": {}, "weeks": {}, "wins": {}, "seq": 0}
+    for back in range(days):
+        day = today - datetime.timedelta(days=back)
+        key = day.isoformat()
+        wins = [{"id": rng.randrange(1, 10_000), "title": next(titles),
+                 "focus_seconds": rng.randrange(0, 3600),
+                 "at": f"{key}T{9 + n % 12:02d}:{rng.randrange(60):02d}:00"}
+                for n in range(rng.randrange(0, wins_per_day * 2 + 1))]
+        data["days"][key] = {"completed": len(wins), "focus_seconds": sum(w["focus_seconds"] for w in wins)}
+        year, week, _ = day.isocalendar()
+        row = data["weeks"].setdefault(f"{year}-W{week:02d}", {"completed": 0, "focus_seconds": 0})
+        row["completed"] += len(wins)
+        row["focus_seconds"] += data["days"][key]["focus_seconds"]
+        if back < 7:
+            data["wins"][key] = wins
+    with open(os.path.join(folder, "my_stats.json"), "w") as f:
+        json.dump(data, f)
+
+
+def write_focus_log(folder, days, runs_per_day=20, tasks=1000, seed=42, now=NOW):
+    """Start/stop pairs in the binary focus log, oldest first, ending at `now`."""
+    rng = random.Random(seed)
+    now = now.timestamp()
+    ts = now - days * 86400
+    count = 0
+    # Written straight to the file: going through append() would fsync every record
+    with open(os.path.join(folder, "focus_sessions.bin"), "wb") as f:
+        while ts < now:
+            day_end = ts + 86400
+            for _ in range(runs_per_day):
+                task = rng.randrange(1, tasks)
+                run = rng.randrange(60, 1500)
+                f.write(RECORD.pack(ts, task, 0, rng.choice((START, RESUME))))
+                ts += run
+                f.write(RECORD.pack(ts, task, run, rng.choice((PAUSE, FINISH))))
+                ts += rng.randrange(30, 600)
+                count += 2
+            ts = max(ts, day_end)
+    return count
+
+
+def seed_folder(folder, tasks, days=90, seed=42, now=NOW):
+    """Everything the app reads at startup, in `folder`."""
+    os.makedirs(folder, exist_ok=True)
+    write_tasks(folder, tasks, seed=seed, now=now)
+    write_stats(folder, days, seed=seed, now=now)
+    write_focus_log(folder, days, tasks=max(tasks, 2), seed=seed, now=now)
+    return folder
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write synthetic FlowDeck data files")
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--days", type=int, default=90, help="days of stats and focus-log history")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    seed_folder(args.out, args.tasks, args.days, args.seed, now=datetime.datetime.now())
+    print(f"{args.tasks} tasks, {args.days} days of history -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
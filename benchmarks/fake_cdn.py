@@ -0,0 +1,82 @@
+"""
+Local stand-in for the image CDN the focus background comes from: any path
+answers with a PNG of the ?w=&h= it was asked for (imgix style), so the
+asset cache can be exercised, and the app run, without the network.
+
+    python benchmarks/fake_cdn.py --port 8766
+    FLOWDECK_BACKGROUND=http://127.0.0.1:8766/photo.jpg python main.py
+"""
+import argparse
+import struct
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+def make_png(width, height, rgb=(40, 30, 60)):
+    # A flat-colour PNG: real image bytes, without needing Pillow
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    row = b"\x00" + bytes(rgb) * width
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(row * height, 6))
+            + chunk(b"IEND", b""))
+
+
+class FakeCDN:
+    def __init__(self, port=0, latency=0.0):
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        cdn = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if cdn.latency:
+                    threading.Event().wait(cdn.latency)
+                query = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                width, height = int(query.get("w", 2070)), int(query.get("h", 1380))
+                body = make_png(width, height)
+                with cdn._lock:
+                    cdn.requests += 1
+                    cdn.bytes_sent += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local fake image CDN")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    cdn = FakeCDN(port=args.port, latency=args.latency)
+    print(f"Fake image CDN on {cdn.url}")
+    cdn._server.serve_forever()
@@ -0,0 +1,357 @@
+"""
+Tiny local stand-in for the GitHub REST API, enough for github_sync: the
+assigned-issue listing, per-repo listings and issue search (with just the
+qualifiers the app's sources use). For github_outbox it takes writes too
+(closing / reopening issues and comments, over REST or GraphQL), keeps an
+X-RateLimit-* budget per resource and can be told to answer the next
+writes with 403 / 429 rate limits (inject()).
+
+    python benchmarks/fake_github.py --issues 500 --port 8765
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=x python main.py
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+
+
+def _stamp(offset_seconds):
+    base = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    return (base + datetime.timedelta(seconds=offset_seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def make_issues(count, repos=20, first=0, pulls=False):
+    # Newest first, like the real listing. `first` offsets ids/numbers so
+    # several sets can share the fake's repos without clashing
+    kind, name = ("pull", "PR") if pulls else ("issues", "Issue")
+    issues = []
+    for i in reversed(range(first, first + count)):
+        issue = {
+            "id": 1000 + i,
+            "node_id": f"{'PR' if pulls else 'I'}_{1000 + i}",
+            "number": i + 1,
+            "title": f"{name} {i + 1}",
+            "state": "open",
+            "created_at": _stamp(i),
+            "updated_at": _stamp(i),
+            "html_url": f"https://github.com/acme/repo-{i % repos}/{kind}/{i + 1}",
+            "url": f"https://api.github.com/repos/acme/repo-{i % repos}/issues/{i + 1}",
+            "repository_url": f"https://api.github.com/repos/acme/repo-{i % repos}",
+            "repository": {
+                "id": i % repos,
+                "name": f"repo-{i % repos}",
+                "full_name": f"acme/repo-{i % repos}",
+            },
+        }
+        if pulls:
+            issue["pull_request"] = {"html_url": issue["html_url"]}
+        issues.append(issue)
+    return issues
+
+
+def _bare(issue):
+    # Repo listings and search results carry repository_url, not the repository
+    return {k: v for k, v in issue.items() if k != "repository"}
+
+
+class FakeGitHub:
+    """
+    `issues` are assigned to the caller; `others` are the rest of the org's
+    issues (seen through repo listings and search); `reviews` are pull
+    requests waiting on the caller's review.
+    """
+
+    def __init__(self, issues=None, port=0, latency=0.0, others=(), reviews=(), limit=5000, window=3600):
+        self.issues = issues if issues is not None else make_issues(50)
+        self.others = list(others)
+        self.reviews = list(reviews)
+        self.latency = latency
+        self.requests = 0
+        self.writes = 0       # POST / PATCH requests, rate limited or not
+        self.applied = []     # (kind, issue id) of every write that went through, in order
+        self.comments = {}    # issue id -> [body]
+        self.limit = limit    # Requests per resource per window, like the real hourly budget
+        self.window = window
+        self._used = {}
+        self._reset_at = time.time() + window
+        self._faults = []     # (status, retry_after) for the next writes
+        self._clock = len(self.issues)  # Fake "now" for updated_at stamps
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._thread = None
+
+    def touch(self, count, close=0):
+        """Bump `count` issues as edited and close `close` of them."""
+        with self._lock:
+            self._clock += 1
+            for n, issue in enumerate(self.issues[:count]):
+                issue["updated_at"] = _stamp(self._clock)
+                issue["title"] += " (edited)"
+                if n < close:
+                    issue["state"] = "closed"
+
+    def inject(self, status, count=1, retry_after=None):
+        """Answer the next `count` writes with a secondary rate limit (403 or 429)."""
+        with self._lock:
+            self._faults.extend([(status, retry_after)] * count)
+
+    def spend(self, resource):
+        """Takes one request off the budget. Returns the rate headers, and False if it was spent already."""
+        with self._lock:
+            now = time.time()
+            if now >= self._reset_at:
+                self._used = {}
+                self._reset_at = now + self.window
+            used = self._used.get(resource, 0)
+            ok = used < self.limit
+            if ok:
+                used = self._used[resource] = used + 1
+            headers = {
+                "X-RateLimit-Limit": str(self.limit),
+                "X-RateLimit-Remaining": str(self.limit - used),
+                "X-RateLimit-Reset": str(int(self._reset_at + 0.999)),
+                "X-RateLimit-Used": str(used),
+                "X-RateLimit-Resource": resource,
+            }
+            return headers, ok
+
+    def fault(self):
+        with self._lock:
+            self.writes += 1
+            return self._faults.pop(0) if self._faults else None
+
+    def find(self, node_id=None, full_name=None, number=None):
+        for i in self.issues + self.others + self.reviews:
+            if i["node_id"] == node_id or (i["repository"]["full_name"] == full_name and i["number"] == number):
+                return i
+        return None
+
+    def write(self, kind, issue, body=None):
+        # Called with the lock held
+        self._clock += 1
+        issue["updated_at"] = _stamp(self._clock)
+        if kind == "comment":
+            self.comments.setdefault(issue["id"], []).append(body)
+        else:
+            issue["state"] = "closed" if kind == "close" else "open"
+        self.applied.append((kind, issue["id"]))
+
+    def select(self, query):
+        state = query.get("state", "open")
+        since = query.get("since")
+        with self._lock:
+            return [
+                i for i in self.issues
+                if (state == "all" or i["state"] == state)
+                and (since is None or i["updated_at"] >= since)
+            ]
+
+    def search(self, q):
+        words = q.split()
+        pool = self.reviews if "review-requested:@me" in words else self.issues + self.others + self.reviews
+        found = {}
+        for i in pool:
+            full_name = i["repository"]["full_name"]
+            keep = True
+            for word in words:
+                key, _, value = word.partition(":")
+                if key == "is" and value in ("open", "closed"):
+                    keep = i["state"] == value
+                elif key == "is" and value in ("pr", "issue"):
+                    keep = ("pull_request" in i) == (value == "pr")
+                elif key == "repo":
+                    keep = full_name == value
+                elif key == "org":
+                    keep = full_name.startswith(value + "/")
+                elif key == "review-requested":
+                    continue
+                elif not value:
+                    keep = word.lower() in i["title"].lower()
+                if not keep:
+                    break
+            if keep:
+                found[i["id"]] = i
+        return list(found.values())
+
+    def repo_issues(self, full_name, query):
+        state = query.get("state", "open")
+        return [
+            i for i in self.issues + self.others
+            if i["repository"]["full_name"] == full_name and (state == "all" or i["state"] == state)
+        ]
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def end_headers(self):
+                for k, v in getattr(self, "rate_headers", {}).items():
+                    self.send_header(k, v)
+                super().end_headers()
+
+            def begin(self, resource, write=False):
+                # Latency, budget and injected faults. False if already answered.
+                with fake._lock:
+                    fake.requests += 1
+                if fake.latency:
+                    threading.Event().wait(fake.latency)
+                self.rate_headers, ok = fake.spend(resource)
+                if not ok:
+                    self.send_json({"message": "API rate limit exceeded"}, status=403)
+                    return False
+                fault = fake.fault() if write else None
+                if fault is not None:
+                    status, retry_after = fault
+                    headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+                    self.send_json({"message": "You have exceeded a secondary rate limit."}, status=status, headers=headers)
+                    return False
+                return True
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_PATCH(self):
+                payload = self.read_json()
+                if not self.begin("core", write=True):
+                    return
+                m = re.fullmatch(r"/repos/([^/]+/[^/]+)/issues/(\d+)", urlparse(self.path).path)
+                with fake._lock:
+                    issue = m and fake.find(full_name=m.group(1), number=int(m.group(2)))
+                    if issue and payload.get("state") in ("open", "closed"):
+                        fake.write("close" if payload["state"] == "closed" else "reopen", issue)
+                        self.send_json(_bare(issue))
+                        return
+                self.send_json({"message": "Not Found"}, status=404)
+
+            def do_POST(self):
+                payload = self.read_json()
+                path = urlparse(self.path).path
+                if path == "/graphql":
+                    if self.begin("graphql", write=True):
+                        self.graphql(payload)
+                    return
+                if not self.begin("core", write=True):
+                    return
+                m = re.fullmatch(r"/repos/([^/]+/[^/]+)/issues/(\d+)/comments", path)
+                with fake._lock:
+                    issue = m and fake.find(full_name=m.group(1), number=int(m.group(2)))
+                    if issue:
+                        fake.write("comment", issue, payload.get("body"))
+                        self.send_json({"id": len(fake.applied), "body": payload.get("body")}, status=201)
+                        return
+                self.send_json({"message": "Not Found"}, status=404)
+
+            def graphql(self, payload):
+                # Just the mutations github_outbox sends, run in order like the real thing
+                variables = payload.get("variables", {})
+                fields = re.findall(r"(\w+): (closeIssue|reopenIssue|addComment)\(input: \{\w+: \$(\w+)(?:, body: \$(\w+))?\}\)",
+                                    payload.get("query", ""))
+                if not fields:
+                    self.send_json({"errors": [{"message": "Parse error"}]})
+                    return
+                data, errors = {}, []
+                kinds = {"closeIssue": "close", "reopenIssue": "reopen", "addComment": "comment"}
+                with fake._lock:
+                    for alias, mutation, node_var, body_var in fields:
+                        issue = fake.find(node_id=variables.get(node_var))
+                        if issue is None:
+                            data[alias] = None
+                            errors.append({"path": [alias], "type": "NOT_FOUND",
+                                           "message": f"Could not resolve to a node with the global id of '{variables.get(node_var)}'"})
+                            continue
+                        fake.write(kinds[mutation], issue, variables.get(body_var) if body_var else None)
+                        data[alias] = {"clientMutationId": None}
+                self.send_json({"data": data, **({"errors": errors} if errors else {})})
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if not self.begin("search" if parsed.path.startswith("/search/") else "core"):
+                    return
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                if parsed.path in ("/issues", "/user/issues"):
+                    self.send_page(parsed.path, query, fake.select(query))
+                elif parsed.path == "/search/issues":
+                    with fake._lock:
+                        items = [_bare(i) for i in fake.search(query.get("q", ""))]
+                    self.send_page(parsed.path, query, self.ordered(items, query), search=True)
+                elif parsed.path.startswith("/repos/") and parsed.path.endswith("/issues"):
+                    full_name = parsed.path[len("/repos/"):-len("/issues")]
+                    with fake._lock:
+                        items = [_bare(i) for i in fake.repo_issues(full_name, query)]
+                    self.send_page(parsed.path, query, self.ordered(items, query))
+                elif parsed.path == "/user":
+                    self.send_json({"login": "octocat", "id": 1})
+                else:
+                    self.send_json({"message": "Not Found"}, status=404)
+
+            def ordered(self, items, query):
+                if query.get("sort") == "updated":
+                    return sorted(items, key=lambda i: i["updated_at"], reverse=query.get("direction") != "asc")
+                return items
+
+            def send_page(self, path, query, items, search=False):
+                per_page = int(query.get("per_page", 30))
+                page = int(query.get("page", 1))
+                chunk = items[(page - 1) * per_page: page * per_page]
+                headers = {}
+                payload = {"total_count": len(items), "incomplete_results": False, "items": chunk} if search else chunk
+                body = json.dumps(payload).encode()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                headers["ETag"] = etag
+                if page * per_page < len(items):
+                    query["page"] = str(page + 1)
+                    qs = urlencode(query)
+                    headers["Link"] = f'<{fake.url}{path}?{qs}>; rel="next"'
+                self.send_json(payload, headers=headers, body=body)
+
+            def send_json(self, payload, status=200, headers=None, body=None):
+                body = body or json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local fake GitHub API")
+    parser.add_argument("--issues", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeGitHub(make_issues(args.issues), port=args.port, latency=args.latency)
+    print(f"Fake GitHub API on {fake.url} ({args.issues} issues)")
+    fake._server.serve_forever()
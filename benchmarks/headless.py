@@ -0,0 +1,59 @@
+"""
+Headless Flet page for benchmarks: a real ft.Page wired to a connection
+that does everything the socket server does except send. It counts the
+messages and bytes that would have gone over the websocket.
+"""
+import asyncio
+import json
+
+import flet as ft
+from flet.core.local_connection import LocalConnection
+from flet.core.protocol import (
+    ClientMessage,
+    CommandEncoder,
+    PageCommandResponsePayload,
+    PageCommandsBatchResponsePayload,
+)
+
+
+class HeadlessConnection(LocalConnection):
+    def __init__(self):
+        super().__init__()
+        self.messages = 0
+        self.bytes_sent = 0
+
+    def send_command(self, session_id, command):
+        result, message = self._process_command(command)
+        if message:
+            self._send(message)
+        return PageCommandResponsePayload(result=result, error="")
+
+    def send_commands(self, session_id, commands):
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ["add", "get"]:
+                results.append(result)
+            if message:
+                messages.append(message)
+        if messages:
+            self._send(ClientMessage("pageControlsBatch", messages))
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    def _send(self, message):
+        self.messages += 1
+        self.bytes_sent += len(json.dumps(message, cls=CommandEncoder, separators=(",", ":")))
+
+    def reset(self):
+        self.messages = 0
+        self.bytes_sent = 0
+
+
+def make_page(width=1280, height=800, loop=None):
+    # Pass the running loop when driving the async app (main, handlers, ticks)
+    conn = HeadlessConnection()
+    page = ft.Page(conn, "headless", loop=loop or asyncio.new_event_loop())
+    page.window.width = width
+    page.window.height = height
+    return page, conn
@@ -0,0 +1,130 @@
+"""
+Many sessions on one FlowDeck process, the way `ft.app(..., view=WEB_BROWSER)`
+serves browser tabs: every session runs the async main() on one shared event
+loop, against a headless page, with the local fake GitHub API standing in
+for github.com.
+
+Checks that N sessions cost one task-store read and one GitHub listing, and
+measures how long a task added in one tab takes to show up in all the others.
+
+    python benchmarks/load_sessions.py --sessions 50 --issues 300 --adds 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_cdn import make_png
+from fake_github import FakeGitHub, make_issues
+from headless import make_page
+
+
+def seed(workdir, count):
+    tasks = [{"id": i, "title": f"Task {i}", "type": "manual", "completed": i % 4 == 0, "created_at": ""}
+             for i in range(count, 0, -1)]
+    with open(os.path.join(workdir, "my_tasks.json"), "w") as f:
+        json.dump(tasks, f)
+
+
+async def wait_for(check, timeout=10.0):
+    deadline = time.perf_counter() + timeout
+    while not check():
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.001)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--issues", type=int, default=300)
+    parser.add_argument("--adds", type=int, default=20, help="tasks added from random tabs while all are open")
+    parser.add_argument("--latency", type=float, default=0.02, help="Fake per-request GitHub latency (s)")
+    asyncio.run(run(parser.parse_args()))
+
+
+async def run(args):
+    fake = FakeGitHub(make_issues(args.issues), latency=args.latency).start()
+    workdir = tempfile.mkdtemp()
+    seed(workdir, args.tasks)
+    os.chdir(workdir)  # The store and the issue cache live next to the app
+    with open("background.png", "wb") as f:
+        f.write(make_png(64, 40))  # Local source for the background prefetch: no network
+    os.environ.update(GITHUB_API_URL=fake.url, GITHUB_TOKEN="load-test",
+                      FLOWDECK_BACKGROUND=os.path.abspath("background.png"))
+
+    from src.services import assets, local_db
+    import main as app
+    assets._cache = assets.AssetCache(root=workdir)
+
+    # Count snapshot reads: however many sessions connect, the store is read once
+    reads = []
+    read_disk = local_db.TaskStore._read_disk
+    def counting_read(self, *a, **kw):
+        reads.append(1)
+        return read_disk(self, *a, **kw)
+    local_db.TaskStore._read_disk = counting_read
+
+    # Connect every session at once, like tabs reopening after a server restart
+    loop = asyncio.get_running_loop()
+    pages = [make_page(loop=loop) for _ in range(args.sessions)]
+    connect_ms = [0.0] * args.sessions
+    async def connect(n):
+        t = time.perf_counter()
+        await app.main(pages[n][0])
+        connect_ms[n] = (time.perf_counter() - t) * 1000
+    started = time.perf_counter()
+    await asyncio.gather(*(connect(n) for n in range(args.sessions)))
+    connected_s = time.perf_counter() - started
+
+    # Dashboard of each session: the first view the ViewManager mounted
+    dashboards = []
+    for page, _ in pages:
+        stack = page.controls[0].controls[1]
+        dashboards.append(stack.controls[0])
+
+    # The sync task lists GitHub once; the hub pushes the issues into every tab
+    t = time.perf_counter()
+    issues_ok = await wait_for(lambda: all(len(d.gh_issues) == args.issues for d in dashboards))
+    issues_ms = (time.perf_counter() - t) * 1000
+    github_requests = fake.requests
+
+    # Add tasks from random tabs; every other tab should show the new card
+    propagation = []
+    for i in range(args.adds):
+        source = dashboards[i * 7 % len(dashboards)]
+        source.input_task.value = f"Shared task {i}"
+        t = time.perf_counter()
+        await source.add_manual_task(None)
+        task_id = local_db.get_store().page(0, 1, include_completed=True)[0]["id"]
+        ok = await wait_for(lambda: all(("local", task_id) in d.task_list.cards for d in dashboards))
+        propagation.append((time.perf_counter() - t) * 1000 if ok else float("inf"))
+
+    sent = [conn.bytes_sent for _, conn in pages]
+    fake.stop()
+
+    print(f"{args.sessions} sessions, {args.tasks} tasks, {args.issues} issues "
+          f"({args.latency * 1000:.0f} ms fake GitHub latency)")
+    print(f"  all sessions connected in      {connected_s * 1000:8.0f} ms "
+          f"(main() p50 {statistics.median(connect_ms):.0f} ms, max {max(connect_ms):.0f} ms)")
+    print(f"  task snapshot reads            {len(reads):8d}")
+    print(f"  GitHub requests                {github_requests:8d}  (one listing of {args.issues} issues)")
+    print(f"  issues in every tab after      {issues_ms:8.0f} ms" + ("" if issues_ok else "  (TIMED OUT)"))
+    print(f"  add in one tab -> all tabs     {statistics.median(propagation):8.1f} ms p50, "
+          f"{max(propagation):.1f} ms max over {args.adds} adds")
+    print(f"  bytes sent per session         {statistics.median(sent):8.0f} median")
+    if len(reads) != 1 or not issues_ok or max(propagation) == float("inf"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
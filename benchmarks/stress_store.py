@@ -0,0 +1,145 @@
+"""
+Hammers one task store from several processes, each with several threads,
+and checks that no update was lost:
+
+  - every task a worker added is there, with the title and state it left
+  - a shared task has the last value every worker wrote to its own field
+  - a shared counter bumped with modify() (cross-process read-modify-write)
+    counts every increment
+  - per-process counters bumped with update(expected_version=...) and a
+    retry on ConflictError count every increment
+
+Some workers also force compactions while the others are writing.
+
+    python benchmarks/stress_store.py --processes 4 --threads 4 --ops 200
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.local_db import TaskStore, ConflictError
+
+
+def open_store(folder):
+    return TaskStore(os.path.join(folder, "my_tasks.json"), os.path.join(folder, "my_tasks.log"),
+                     compact_every=100, flush_window=0.01, archive_after_days=None)
+
+
+def worker(store, p, t, ops, shared_id, counter_id, local_counter_id):
+    for i in range(ops):
+        task = store.add(f"p{p}-t{t}-{i}")
+        store.update(task["id"], completed=True)
+        store.update(task["id"], completed=i % 2 == 0, owner=f"p{p}-t{t}")
+
+        store.update(shared_id, **{f"w{p}_{t}": i})
+        store.modify(counter_id, lambda task: {"count": task.get("count", 0) + 1})
+
+        while True:
+            current = store.get(local_counter_id)
+            try:
+                store.update(local_counter_id, expected_version=current["version"],
+                             count=current.get("count", 0) + 1)
+                break
+            except ConflictError:
+                continue
+
+        if t == 0 and i % 50 == 49:
+            store.compact()
+
+
+def process_main(folder, p, threads, ops, shared_id, counter_id, ready):
+    store = open_store(folder)
+    # Each process has its own CAS counter: threads of one process race on it
+    local_counter_id = store.add(f"counter-p{p}")["id"]
+    store.flush()
+    ready.wait()
+    pool = [threading.Thread(target=worker, args=(store, p, t, ops, shared_id, counter_id, local_counter_id))
+            for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    folder = tempfile.mkdtemp()
+    store = open_store(folder)
+    shared_id = store.add("shared")["id"]
+    counter_id = store.add("counter")["id"]
+    store.close()
+
+    ctx = multiprocessing.get_context("spawn")
+    ready = ctx.Event()
+    procs = [ctx.Process(target=process_main,
+                         args=(folder, p, args.threads, args.ops, shared_id, counter_id, ready))
+             for p in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    time.sleep(1)  # Let every process open the store before the race starts
+    started = time.perf_counter()
+    ready.set()
+    for proc in procs:
+        proc.join()
+    elapsed = time.perf_counter() - started
+    if any(proc.exitcode for proc in procs):
+        print("a worker process crashed")
+        sys.exit(1)
+
+    store = open_store(folder)
+    tasks = store.all(include_completed=True)
+    by_title = {}
+    for task in tasks:
+        by_title.setdefault(task["title"], []).append(task)
+
+    errors = []
+    workers = [(p, t) for p in range(args.processes) for t in range(args.threads)]
+    for p, t in workers:
+        for i in range(args.ops):
+            found = by_title.get(f"p{p}-t{t}-{i}", [])
+            if len(found) != 1:
+                errors.append(f"p{p}-t{t}-{i}: {len(found)} copies")
+            elif found[0]["completed"] != (i % 2 == 0) or found[0].get("owner") != f"p{p}-t{t}":
+                errors.append(f"p{p}-t{t}-{i}: wrong state {found[0]}")
+    if len({task["id"] for task in tasks}) != len(tasks):
+        errors.append("duplicate ids")
+
+    shared = store.get(shared_id)
+    for p, t in workers:
+        if shared.get(f"w{p}_{t}") != args.ops - 1:
+            errors.append(f"shared field w{p}_{t} = {shared.get(f'w{p}_{t}')}, expected {args.ops - 1}")
+
+    total = store.get(counter_id).get("count", 0)
+    if total != len(workers) * args.ops:
+        errors.append(f"modify() counter = {total}, expected {len(workers) * args.ops}")
+    for p in range(args.processes):
+        (counter,) = by_title.get(f"counter-p{p}", [{}])
+        if counter.get("count", 0) != args.threads * args.ops:
+            errors.append(f"CAS counter p{p} = {counter.get('count', 0)}, expected {args.threads * args.ops}")
+    store.close()
+
+    writes = len(workers) * args.ops * 6
+    print(f"{args.processes} processes x {args.threads} threads x {args.ops} rounds: "
+          f"{writes} writes in {elapsed:.1f}s ({writes / elapsed:.0f}/s), {len(tasks)} tasks")
+    if errors:
+        print(f"FAILED: {len(errors)} problems")
+        for error in errors[:20]:
+            print("  " + error)
+        sys.exit(1)
+    print("OK: no update lost")
+
+
+if __name__ == "__main__":
+    main()
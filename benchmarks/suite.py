@@ -0,0 +1,237 @@
+"""
+The benchmark suite: storage, GitHub sync and rendering at several data
+sizes, with results written as JSON so runs can be compared. Every case runs
+in a fresh interpreter (the app's services are per-process singletons).
+
+    python benchmarks/suite.py --profile quick --out bench.json
+    python benchmarks/suite.py --profile quick --baseline bench.json
+
+With --baseline, a timing that got slower by more than the threshold (and
+by more than --min-ms), or a byte / control / request count that went up at
+all, is a regression and the exit status is 1, so CI can fail the build on
+it. Timings are the best of --repeat runs, which shrugs off the odd slow
+fsync or GC pause better than a median does; counts are exact.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# (case, size) pairs; render sizes are (tasks, issues)
+PROFILES = {
+    "quick": [
+        ("store", 1000), ("store", 10_000),
+        ("sync", 10), ("sync", 500),
+        ("render", (1000, 10)), ("render", (10_000, 500)),
+    ],
+    "full": [
+        ("store", 1000), ("store", 10_000), ("store", 100_000), ("store", 1_000_000),
+        ("sync", 10), ("sync", 500), ("sync", 5000),
+        ("render", (1000, 10)), ("render", (100_000, 500)), ("render", (1_000_000, 5000)),
+    ],
+}
+
+
+def best_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return min(samples)
+
+
+# --- Cases (run in the child) ---
+def case_store(tasks, repeat):
+    from datagen import write_tasks
+    from src.services.local_db import TaskStore
+
+    folder = tempfile.mkdtemp()
+    write_tasks(folder, tasks)
+    db = os.path.join(folder, "my_tasks.json")
+    log = os.path.join(folder, "my_tasks.log")
+
+    def load():
+        TaskStore(db, log, archive_after_days=None).close()
+    result = {"load_ms": best_ms(load, repeat)}
+
+    store = TaskStore(db, log, flush_window=0, archive_after_days=None)
+    result["page_ms"] = best_ms(lambda: store.page(0, 50, include_completed=True), repeat * 20)
+    result["page_open_ms"] = best_ms(lambda: store.page(0, 50), repeat * 20)
+    result["add_flush_ms"] = best_ms(lambda: (store.add("Benchmark task"), store.flush()), repeat * 10)
+    result["compact_ms"] = best_ms(store.compact, repeat)
+    store.close()
+    return result
+
+
+def case_sync(issues, repeat):
+    from fake_github import FakeGitHub, make_issues
+    from src.services.github_sync import GitHubSync
+
+    fake = FakeGitHub(make_issues(issues)).start()
+    folder = tempfile.mkdtemp()
+    result = {}
+    try:
+        def requests_and_ms(fn):
+            before, t = fake.requests, time.perf_counter()
+            fn()
+            return fake.requests - before, (time.perf_counter() - t) * 1000
+
+        full = []
+        for n in range(repeat):
+            sync = GitHubSync(token="bench", cache_file=os.path.join(folder, f"cache-{n}.json"), base_url=fake.url)
+            full.append(requests_and_ms(sync.sync_once))
+        result["full_requests"] = full[0][0]
+        result["full_ms"] = min(ms for _, ms in full)
+
+        sync.sync_once()  # Settle the boundary re-read
+        result["noop_ms"] = best_ms(sync.sync_once, repeat)
+        deltas = []
+        for _ in range(repeat):
+            fake.touch(5)
+            deltas.append(requests_and_ms(sync.sync_once))
+            sync.sync_once()
+        result["delta_requests"] = deltas[0][0]
+        result["delta_ms"] = min(ms for _, ms in deltas)
+
+        cache = sync.cache_file
+        result["cache_load_ms"] = best_ms(
+            lambda: GitHubSync(token="bench", cache_file=cache, base_url=fake.url).hydrate(), repeat)
+    finally:
+        fake.stop()
+    return result
+
+
+def case_render(size, repeat):
+    from bench_render import run
+    tasks, issues = size
+    return run(tasks, issues, repeat)
+
+
+CASES = {"store": case_store, "sync": case_sync, "render": case_render}
+
+
+def case_name(case, size):
+    if case == "render":
+        return f"render/tasks={size[0]},issues={size[1]}"
+    return f"{case}/{'tasks' if case == 'store' else 'issues'}={size}"
+
+
+def run_case(case, size, repeat):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, HERE]), GITHUB_TOKEN="")
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", case, json.dumps(size), "--repeat", str(repeat)],
+        cwd=tempfile.mkdtemp(), env=env, capture_output=True, text=True
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"{case_name(case, size)} failed:\n{out.stderr}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# --- Comparison ---
+def compare(results, baseline, threshold, min_ms):
+    """Rows of (case, metric, old, new, change); the second value is the list of regressions."""
+    rows, regressions = [], []
+    for name, metrics in results.items():
+        old_metrics = baseline.get(name)
+        if old_metrics is None:
+            continue
+        for metric, new in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None:
+                continue
+            change = (new - old) / old if old else (0.0 if new == old else float("inf"))
+            if metric.endswith("_ms"):
+                # Sub-millisecond jitter on a fast path is noise, not a regression
+                worse = change > threshold and new - old > min_ms
+            else:
+                # Fixtures and the views' clock are pinned (datagen.NOW), so
+                # counts repeat exactly and any growth is real
+                worse = new > old
+            row = (name, metric, old, new, change)
+            rows.append(row)
+            if worse:
+                regressions.append(row)
+    return rows, regressions
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES), help="run just these cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", help="write the results here (JSON)")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare with")
+    # Loose defaults: shared CI runners swing by a third from run to run. On a
+    # quiet machine 0.2 catches much smaller slowdowns
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="timing changes below this never count")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        case, size = args.child[0], json.loads(args.child[1])
+        print(json.dumps(CASES[case](tuple(size) if isinstance(size, list) else size, args.repeat)))
+        return
+
+    results = {}
+    for case, size in PROFILES[args.profile]:
+        if args.only and case not in args.only:
+            continue
+        name = case_name(case, size)
+        t = time.perf_counter()
+        results[name] = run_case(case, size, args.repeat)
+        print(f"{name:<36}{time.perf_counter() - t:>8.1f} s", file=sys.stderr)
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "profile": args.profile,
+        "repeat": args.repeat,
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if not args.baseline:
+        for name, metrics in results.items():
+            print(name)
+            for metric, value in metrics.items():
+                print(f"  {metric:<26}{value:>12.2f}")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    rows, regressions = compare(results, baseline["results"], args.threshold, args.min_ms)
+    print(f"vs. {args.baseline} (commit {baseline.get('commit')}), threshold {args.threshold:.0%}")
+    print(f"{'case':<36}{'metric':<24}{'old':>12}{'new':>12}{'change':>9}")
+    for row in rows:
+        name, metric, old, new, change = row
+        flag = "  REGRESSION" if row in regressions else ""
+        print(f"{name:<36}{metric:<24}{old:>12.2f}{new:>12.2f}{change:>+9.0%}{flag}")
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Bulk import / export for the FlowDeck task store.
+
+    python cli.py import backlog.jsonl
+    python cli.py import todoist.csv --id-field "Task ID" --title-field Content
+    python cli.py export archive.jsonl --completed-only
+    python cli.py export - --format csv > tasks.csv
+    python cli.py archive --days 90
+
+Files are streamed: rows are parsed one at a time and inserted in batches
+(one flush per batch), so a million-row file never sits in memory. Rows
+whose external id is already in the store are skipped, so re-running an
+import is safe (to re-import an export of this store, pass --id-field id).
+A running app picks the import up within a few seconds (it re-reads the
+store's log every SYNC_EVERY seconds, see local_db).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+import itertools
+
+from src.services.local_db import get_store
+
+FIELDS = ["id", "external_id", "title", "type", "completed", "created_at", "completed_at"]
+TRUE = {"1", "true", "yes", "y", "x", "done", "completed"}
+
+
+def guess_format(path, fmt):
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_rows(f, fmt):
+    """Yields one dict per row, without reading ahead."""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for n, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            print(f"line {n}: not valid JSON, skipped", file=sys.stderr)
+            yield None
+
+
+def to_task(row, id_field, title_field):
+    if not isinstance(row, dict):
+        return None
+    title = row.get(title_field)
+    if title is None or not str(title).strip():
+        return None
+    completed = row.get("completed", False)
+    if isinstance(completed, str):
+        completed = completed.strip().lower() in TRUE
+    external_id = row.get(id_field)
+    return {
+        "title": str(title).strip(),
+        "type": row.get("type") or "manual",
+        "completed": bool(completed),
+        "created_at": row.get("created_at") or None,
+        "completed_at": row.get("completed_at") or None,
+        "external_id": str(external_id) if external_id not in (None, "") else None,
+    }
+
+
+def run_import(args):
+    fmt = guess_format(args.file, args.format)
+    store = get_store()
+    read = added = skipped = invalid = 0
+    started = last_report = time.perf_counter()
+
+    f = sys.stdin if args.file == "-" else open(args.file, "r", newline="", encoding="utf-8")
+    try:
+        rows = read_rows(f, fmt)
+        with store.bulk():
+            while True:
+                batch = list(itertools.islice(rows, args.batch))
+                if not batch:
+                    break
+                read += len(batch)
+                tasks = [to_task(row, args.id_field, args.title_field) for row in batch]
+                invalid += sum(1 for t in tasks if t is None)
+                a, s = store.add_many(t for t in tasks if t is not None)
+                added += a
+                skipped += s
+                now = time.perf_counter()
+                if now - last_report >= 1:
+                    last_report = now
+                    print(f"\r{read:,} rows  {read / (now - started):,.0f} rows/s", end="", file=sys.stderr)
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    print(f"Imported {added:,} tasks from {read:,} rows in {elapsed:.1f}s "
+          f"({read / max(elapsed, 1e-9):,.0f} rows/s); "
+          f"{skipped:,} duplicates skipped, {invalid:,} invalid rows")
+
+
+def run_export(args):
+    fmt = guess_format(args.file, args.format)
+    store = get_store()
+    started = time.perf_counter()
+    count = 0
+
+    f = sys.stdout if args.file == "-" else open(args.file, "w", newline="", encoding="utf-8")
+    try:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction="ignore")
+            writer.writeheader()
+        # Archived history first (oldest months first), then the working set
+        tasks = store.iter_tasks(include_completed=not args.open_only)
+        if not args.open_only:
+            tasks = itertools.chain(store.iter_archived(newest_first=False), tasks)
+        for task in tasks:
+            if args.completed_only and not task.get("completed", False):
+                continue
+            if fmt == "csv":
+                writer.writerow(task)
+            else:
+                f.write(json.dumps(task) + "\n")
+            count += 1
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Exported {count:,} tasks in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)",
+          file=sys.stderr)
+
+
+def run_archive(args):
+    store = get_store()
+    started = time.perf_counter()
+    moved = store.archive_completed(args.days)
+    print(f"Archived {moved:,} completed tasks in {time.perf_counter() - started:.1f}s; "
+          f"{store.count(include_completed=True):,} tasks left in the working set, "
+          f"{store.archive.count():,} in the archive")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py", description="Bulk import / export FlowDeck tasks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    imp = sub.add_parser("import", help="load tasks from a JSON Lines or CSV file ('-' for stdin)")
+    imp.add_argument("file")
+    imp.add_argument("--format", choices=["jsonl", "csv"], help="default: from the file extension")
+    imp.add_argument("--batch", type=int, default=5000, help="rows per batch / flush (default 5000)")
+    imp.add_argument("--id-field", default="external_id", help="column holding the source tool's id, for dedupe")
+    imp.add_argument("--title-field", default="title")
+    imp.set_defaults(run=run_import)
+
+    exp = sub.add_parser("export", help="write tasks to a JSON Lines or CSV file ('-' for stdout)")
+    exp.add_argument("file")
+    exp.add_argument("--format", choices=["jsonl", "csv"], help="default: from the file extension")
+    which = exp.add_mutually_exclusive_group()
+    which.add_argument("--open-only", action="store_true")
+    which.add_argument("--completed-only", action="store_true")
+    exp.set_defaults(run=run_export)
+
+    arc = sub.add_parser("archive", help="move old completed tasks to the monthly archive now")
+    arc.add_argument("--days", type=int, default=None, help="completed more than this many days ago (default 30)")
+    arc.set_defaults(run=run_archive)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+    get_store().close()
+
+
+if __name__ == "__main__":
+    main()
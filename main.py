@@ -1,63 +1,146 @@
+import os
 import flet as ft
 from src.ui.components.ambient_bg import get_ambient_background
 from src.ui.dashboard import Dashboard
-from src.ui.focus_mode import FocusMode
-from src.ui.debrief import DailyDebrief
-from src.services.local_db import mark_task_complete # <--- Import this
+from src.ui.view_manager import ViewManager
+from src.services.github_sync import get_sync
 
-def main(page: ft.Page):
+# Async target: every session (every tab in web mode) runs on Flet's one event
+# loop. Handlers are coroutines; file and network I/O goes to the I/O pool.
+async def main(page: ft.Page):
     page.title = "FlowDeck"
     page.theme_mode = ft.ThemeMode.DARK
     page.padding = 0
     page.bgcolor = "#050505"
+    # Every update is timed (and its controls / bytes counted) while the
+    # perf recorder is on: FLOWDECK_PERF=1, FLOWDECK_TRACE=file, or the overlay
+    if os.getenv("FLOWDECK_PERF") or os.getenv("FLOWDECK_TRACE"):
+        from src.services import perf
+        perf.instrument_page(page)
 
-    current_view_container = ft.Container(expand=True)
+    # Views stay alive and are swapped by visibility. Focus mode and the
+    # debrief are imported and built the first time they are opened.
+    views = ViewManager(page)
 
-    def show_dashboard(e=None):
-        dashboard = Dashboard(
-            page, 
-            on_start_focus=start_focus_mode,
-            on_show_debrief=show_debrief
-        )
-        current_view_container.content = dashboard
-        page.update()
+    # Task edits are written behind the UI; push out whatever is still
+    # queued when the window goes away (atexit covers a normal shutdown).
+    # The store, GitHub sync and hub are shared by every session of this
+    # process (every tab in web mode): a closed session just unsubscribes.
+    async def flush_on_disconnect(e):
+        from src.services.io_pool import run_io
+        from src.services.local_db import flush_tasks
+        await run_io(flush_tasks)
+    async def close_session(e):
+        from src.services.io_pool import run_io
+        from src.services.local_db import flush_tasks
+        await views.close()
+        await run_io(flush_tasks)
+    page.on_disconnect = flush_on_disconnect
+    page.on_close = close_session
 
-    # FIX: Accept task_id and title
-    def start_focus_mode(task_id, task_title):
-        focus_view = FocusMode(
-            page, 
-            task_title=task_title, 
+    def make_focus_mode():
+        from src.ui.focus_mode import FocusMode
+        return FocusMode(
+            page,
+            task_title="",
             on_exit=show_dashboard,
             # FIX: When 'Complete' is clicked, mark DB then show debrief
-            on_complete=lambda e: complete_and_debrief(task_id)
+            on_complete=complete_and_debrief
         )
-        current_view_container.content = focus_view
-        page.update()
-
-    def complete_and_debrief(task_id):
-        # 1. Update the Database
-        mark_task_complete(task_id, is_complete=True)
-        # 2. Go to Debrief
-        show_debrief()
 
-    def show_debrief(e=None):
-        debrief_view = DailyDebrief(
+    def make_debrief():
+        from src.ui.debrief import DailyDebrief
+        return DailyDebrief(
             page,
             on_back=show_dashboard
         )
-        current_view_container.content = debrief_view
-        page.update()
+
+    views.register("dashboard", lambda: Dashboard(
+        page, 
+        on_start_focus=start_focus_mode,
+        on_show_debrief=show_debrief
+    ))
+    views.register("focus", make_focus_mode)
+    views.register("debrief", make_debrief)
+
+    async def show_dashboard(e=None):
+        await views.show("dashboard")
+
+    # GitHub issue being focused on (task_id is None for those)
+    focus_issue = None
+
+    # FIX: Accept task_id and title
+    async def start_focus_mode(task_id, task_title, issue=None):
+        nonlocal focus_issue
+        focus_issue = issue
+        await views.get("focus").set_task(task_id, task_title)
+        await views.show("focus")
+
+    async def complete_and_debrief(task_id, task_title, focus_seconds):
+        # 1. Update the Database (completion events also feed the stats)
+        from src.services.io_pool import run_io
+        from src.services.local_db import mark_task_complete
+        from src.services.stats import get_stats
+        if task_id is not None:
+            await run_io(mark_task_complete, task_id, is_complete=True, focus_seconds=focus_seconds)
+        else:
+            # GitHub issue: the win counts here, and the issue is closed (with
+            # the focus time as a comment) through the outbox, never waited on
+            await run_io(get_stats().record_completion, None, task_title, focus_seconds)
+            if focus_issue is not None and focus_issue['title'] == task_title:
+                await run_io(queue_completion, focus_issue, focus_seconds)
+        # 2. Go to Debrief
+        await show_debrief()
+
+    def queue_completion(issue, focus_seconds):
+        from src.services.github_outbox import get_outbox, is_pull, CLOSE, COMMENT
+        outbox = get_outbox()
+        if focus_seconds >= 60:
+            outbox.enqueue(COMMENT, issue, f"Focused on this for {focus_seconds // 60} min in FlowDeck.")
+        if not is_pull(issue):
+            outbox.enqueue(CLOSE, issue)
+
+    async def show_debrief(e=None):
+        await views.show("debrief")
+
+    # Debug overlay with the live timings (HOTKEY), built on first use
+    perf_overlay = None
+    async def on_keyboard(e):
+        nonlocal perf_overlay
+        from src.ui.components.perf_overlay import PerfOverlay, HOTKEY  # Key events only come after first paint
+        if e.key != HOTKEY:
+            return
+        if perf_overlay is None:
+            from src.services import perf
+            perf.instrument_page(page)  # No-op if FLOWDECK_PERF already did it
+            perf_overlay = PerfOverlay()
+            page.overlay.append(perf_overlay)
+            page.update()
+        await perf_overlay.toggle()
+    page.on_keyboard_event = on_keyboard
 
     layout = ft.Stack(
         expand=True,
         controls=[
             get_ambient_background(page.window_width, page.window_height),
-            current_view_container
+            views.stack
         ]
     )
     
     page.add(layout)
-    show_dashboard()
+    # First paint comes from the local store; the sync task then loads the
+    # issue cache and refreshes GitHub on the I/O pool
+    await show_dashboard()
+    # Everything below runs after first paint, so its modules load after it too
+    from src.services.github_outbox import get_outbox
+    from src.services.local_db import get_store
+    from src.services.io_pool import get_io_pool
+    from src.services.assets import prefetch_background
+    get_sync().start()            # No-op if another session already started it
+    get_outbox().start()          # Sends GitHub writes left over from last time, then new ones
+    get_store().start_archiver()  # Old completed tasks -> monthly archive, on the I/O pool (once per process)
+    # Focus-mode photo for this window size, so entering focus is instant (and works offline later)
+    get_io_pool().submit(prefetch_background, page.window.width, page.window.height)
 
 if __name__ == "__main__":
-    ft.app(target=main)
\ No newline at end of file
+    ft.app(target=main)
@@ -0,0 +1,247 @@
+import io
+import os
+import math
+import wave
+import array
+import random
+import shutil
+import hashlib
+import threading
+import subprocess
+
+from src.services.assets import ASSETS_DIR, CACHE_DIR
+from src.services import perf
+
+RATE = 22050          # Mono 16-bit: plenty for rain and wind, and a loop stays under 1 MB
+LOOP_SECONDS = 20
+CROSSFADE_SECONDS = 1.0
+VOLUME_STEP = 5       # Balances are cached rounded to this (sliders go 0-100)
+KEEP_MIXES = 8        # Mixed loops kept on disk; the least recently used go first
+MIX_DIR = "ambient"   # Under the asset cache, so Flet serves the mixes
+
+# Layer -> recording under assets/. None (or a recording we can't decode:
+# mp3 needs ffmpeg on the PATH) means the layer is synthesized instead.
+LAYERS = {
+    "rain": "sounds/rain.mp3",
+    "wind": None,
+    "thunder": None,
+}
+
+
+def _loop_length():
+    return int(RATE * LOOP_SECONDS)
+
+def _fade_length():
+    return int(RATE * CROSSFADE_SECONDS)
+
+
+# --- Decoding ---
+def _decode(path):
+    """The first LOOP + CROSSFADE seconds of a recording as floats in [-1, 1], or None."""
+    want = _loop_length() + _fade_length()
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as w:
+            if (w.getframerate(), w.getnchannels(), w.getsampwidth()) == (RATE, 1, 2):
+                pcm = w.readframes(want)
+            else:
+                pcm = _ffmpeg(path, want)
+    else:
+        pcm = _ffmpeg(path, want)
+    if pcm is None:
+        return None
+    samples = array.array("h")
+    samples.frombytes(pcm)
+    if len(samples) < want:
+        return None  # Too short to loop
+    return array.array("f", (s / 32768 for s in samples))
+
+def _ffmpeg(path, frames):
+    if shutil.which("ffmpeg") is None:
+        return None
+    # -t on the input stops decoding just past what the loop needs (-frames:a
+    # would count codec frames, ~1152 samples each for mp3, not samples);
+    # atrim then cuts the resampled stream at exactly `frames` samples
+    seconds = frames / RATE + 0.5
+    out = subprocess.run(
+        ["ffmpeg", "-v", "error", "-t", f"{seconds:.3f}", "-i", path, "-f", "s16le", "-ac", "1",
+         "-af", f"aresample={RATE},atrim=end_sample={frames}", "-"],
+        capture_output=True
+    )
+    return out.stdout if out.returncode == 0 else None
+
+
+# --- Synthesis (seeded, so every process makes the same loop) ---
+def _synth(name):
+    rng = random.Random(name)
+    n = _loop_length() + _fade_length()
+    out = array.array("f", bytes(4 * n))
+    if name == "rain":
+        # Hiss, softened by a one-pole low-pass, with droplets on top
+        lp = 0.0
+        for i in range(n):
+            lp += 0.45 * (rng.uniform(-1, 1) - lp)
+            out[i] = 0.35 * lp
+        for _ in range(int(n / RATE * 40)):
+            at, amp = rng.randrange(n - 400), rng.uniform(0.05, 0.25)
+            for k in range(400):
+                out[at + k] += amp * math.exp(-k / 60) * rng.uniform(-1, 1)
+    elif name == "wind":
+        # Brown noise, with a slow swell that repeats exactly twice per loop
+        brown = 0.0
+        period = _loop_length() / 2
+        for i in range(n):
+            brown = 0.995 * brown + 0.05 * rng.uniform(-1, 1)
+            swell = 0.6 + 0.4 * math.sin(2 * math.pi * i / period)
+            out[i] = 0.8 * brown * swell
+    else:
+        # Distant rumble, with two rolls of thunder
+        lp = 0.0
+        for i in range(n):
+            lp += 0.02 * (rng.uniform(-1, 1) - lp)
+            out[i] = 1.5 * lp
+        for start in (0.15, 0.6):
+            at, length = int(n * start), int(RATE * 4)
+            lp = 0.0
+            for k in range(length):
+                lp += 0.05 * (rng.uniform(-1, 1) - lp)
+                envelope = min(1.0, k / (RATE * 0.3)) * math.exp(-k / (RATE * 1.2))
+                out[at + k] += 2.5 * lp * envelope
+    return out
+
+
+def _make_loop(samples):
+    """
+    LOOP_SECONDS of samples that play back-to-back without a seam: the extra
+    CROSSFADE seconds after the loop are faded into its start, so the wrap
+    from the last sample to the first continues the recording.
+    """
+    n, fade = _loop_length(), _fade_length()
+    loop = samples[:n]
+    for i in range(fade):
+        t = i / fade
+        loop[i] = loop[i] * t + samples[n + i] * (1 - t)
+    return loop
+
+
+class AmbientMixer:
+    """
+    Mixes the enabled ambient layers into one looping WAV, played by a
+    single player per page, instead of one looping player per layer.
+
+    Layers are decoded (or synthesized) once per process and kept as float
+    loops. A mix depends only on the balance between the enabled layers
+    (the loudest one is the player's volume), rounded to VOLUME_STEP, and is
+    cached on disk by that balance: moving the only enabled slider never
+    re-mixes, and going back to an earlier balance costs a file lookup.
+    Mixing takes one lock, so however many sessions drag sliders at once,
+    at most one mix is being computed.
+    """
+
+    def __init__(self, root=ASSETS_DIR, subdir=CACHE_DIR):
+        self.subdir = f"{subdir}/{MIX_DIR}"
+        self.dir = os.path.join(root, subdir, MIX_DIR)
+        self._layers = {}  # name -> float loop
+        self._lock = threading.Lock()
+
+    def balance(self, volumes):
+        """
+        ({layer: relative gain}, master volume) for {layer: 0-100}. The
+        loudest layer gets gain 1 and sets the master volume.
+        """
+        volumes = {name: v for name, v in volumes.items() if v > 0 and name in LAYERS}
+        if not volumes:
+            return {}, 0.0
+        peak = max(volumes.values())
+        gains = {}
+        for name, v in volumes.items():
+            step = round(v / peak * 100 / VOLUME_STEP) * VOLUME_STEP
+            if step:
+                gains[name] = step / 100
+        return gains, peak / 100
+
+    @perf.timed("ambient.mix", "audio")
+    def mix(self, volumes):
+        """(src, player volume) of the loop for {layer: 0-100}, or (None, 0.0) for silence. Blocking."""
+        gains, master = self.balance(volumes)
+        if not gains:
+            return None, 0.0
+        key = ",".join(f"{name}={gains[name]:.2f}" for name in sorted(gains))
+        name = "mix-" + hashlib.sha1(f"{key};{RATE};{LOOP_SECONDS}".encode()).hexdigest()[:16] + ".wav"
+        path = os.path.join(self.dir, name)
+        with self._lock:
+            if os.path.exists(path):
+                os.utime(path)  # Recently used: keep it through eviction
+            else:
+                loops = [(self.layer(layer), gain) for layer, gain in gains.items()]
+                data = _to_wav(_mix(loops))
+                os.makedirs(self.dir, exist_ok=True)
+                tmp = path + ".tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+                self._evict()
+        return f"/{self.subdir}/{name}", master
+
+    def layer(self, name):
+        # Caller holds the lock
+        if name not in self._layers:
+            with perf.span("ambient.decode", "audio", layer=name):
+                samples = None
+                if LAYERS[name]:
+                    path = os.path.join(ASSETS_DIR, LAYERS[name])
+                    if os.path.exists(path):
+                        samples = _decode(path)
+                if samples is None:
+                    samples = _synth(name)
+                self._layers[name] = _make_loop(samples)
+        return self._layers[name]
+
+    def _evict(self):
+        mixes = sorted((e for e in os.scandir(self.dir) if e.name.endswith(".wav")),
+                       key=lambda e: e.stat().st_mtime)
+        for entry in mixes[:-KEEP_MIXES]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _mix(loops):
+    # Headroom for the sum of gains, then hard-clip the odd peak
+    scale = 1 / max(1.0, sum(g for _, g in loops))
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    if np is not None:
+        out = sum(np.frombuffer(samples, dtype=np.float32) * (gain * scale) for samples, gain in loops)
+        return np.clip(out * 32767, -32768, 32767).astype("<i2").tobytes()
+    # No NumPy: one pass per layer over plain arrays
+    out = array.array("f", bytes(4 * _loop_length()))
+    for samples, gain in loops:
+        g = gain * scale
+        for i, s in enumerate(samples):
+            out[i] += s * g
+    pcm = array.array("h", (max(-32768, min(32767, int(s * 32767))) for s in out))
+    return pcm.tobytes()
+
+def _to_wav(pcm):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(pcm)
+    return buf.getvalue()
+
+
+_mixer = None
+_mixer_lock = threading.Lock()
+
+def get_ambient_mixer():
+    global _mixer
+    if _mixer is None:
+        with _mixer_lock:
+            if _mixer is None:
+                _mixer = AmbientMixer()
+    return _mixer
@@ -0,0 +1,107 @@
+import os
+import json
+import gzip
+import threading
+
+from src.services.local_db import atomic_write
+
+INDEX_FILE = "index.json"
+
+
+def month_of(task):
+    # Month the task was finished in; tasks completed before completed_at
+    # existed fall back to when they were created
+    day = task.get('completed_at') or task.get('created_at') or ""
+    return day[:7] if len(day) >= 7 else "unknown"
+
+
+class TaskArchive:
+    """
+    Cold storage for old completed tasks: one gzipped JSON Lines segment per
+    month (tasks-2025-03.jsonl.gz) plus a small index of months and counts.
+    Nothing is read until someone asks for history, and then only the
+    segments for the months asked for are opened.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._index = None  # month -> task count, loaded on first use
+        self._lock = threading.Lock()
+
+    def _path(self, month):
+        return os.path.join(self.folder, f"tasks-{month}.jsonl.gz")
+
+    def _load_index(self):
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        path = os.path.join(self.folder, INDEX_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path, "r") as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Archive: could not read {path}: {e}")
+        # Segments the index doesn't know about (crash before it was saved)
+        if os.path.isdir(self.folder):
+            for name in os.listdir(self.folder):
+                if name.startswith("tasks-") and name.endswith(".jsonl.gz"):
+                    month = name[len("tasks-"):-len(".jsonl.gz")]
+                    if month not in self._index:
+                        self._index[month] = sum(1 for _ in self._read(month))
+        return self._index
+
+    # --- Writing ---
+    def add(self, tasks):
+        """Files tasks under their month. Re-adding a task id replaces it."""
+        by_month = {}
+        for task in tasks:
+            by_month.setdefault(month_of(task), []).append(task)
+        with self._lock:
+            index = self._load_index()
+            os.makedirs(self.folder, exist_ok=True)
+            for month, new in by_month.items():
+                merged = {t['id']: t for t in self._read(month)}
+                merged.update((t['id'], t) for t in new)
+                self._write_segment(month, merged.values())
+                index[month] = len(merged)
+            atomic_write(os.path.join(self.folder, INDEX_FILE), json.dumps(index))
+
+    def _write_segment(self, month, tasks):
+        # Same temp + fsync + rename dance as atomic_write, through gzip
+        path = self._path(month)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                for task in tasks:
+                    gz.write((json.dumps(task) + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, path)
+
+    # --- Reading ---
+    def _read(self, month):
+        path = self._path(month)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def months(self):
+        """Archived months, newest first. Reads only the index."""
+        with self._lock:
+            return sorted(self._load_index(), reverse=True)
+
+    def count(self, month=None):
+        with self._lock:
+            index = self._load_index()
+            return index.get(month, 0) if month else sum(index.values())
+
+    def iter_month(self, month):
+        """Tasks archived under one month; only that segment is opened."""
+        yield from self._read(month)
+
+    def iter_tasks(self, newest_first=True):
+        for month in (self.months() if newest_first else reversed(self.months())):
+            yield from self._read(month)
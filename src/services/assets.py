@@ -0,0 +1,202 @@
+import io
+import os
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from src.services.local_db import atomic_write
+from src.services import perf
+
+# Flet serves this folder (ft.app's default assets_dir, next to main.py), so
+# anything cached under it can be shown with a plain local src
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "assets")
+CACHE_DIR = "cache"       # Under ASSETS_DIR; the image src is "/cache/<file>"
+INDEX_FILE = "index.json"
+SIZE_STEP = 160           # Window sizes round up to this grid, so a resize doesn't mint a variant per pixel
+MAX_SIZE = 3840
+DEFAULT_SIZE = (1280, 800)  # Until the client has told us the window size
+KEEP_VARIANTS = 4         # Per source; the least recently used go first
+
+# The focus-mode photo. An imgix CDN: it crops and scales to ?w=&h= for us.
+# FLOWDECK_BACKGROUND swaps in another URL (a local stand-in) or an image file.
+FOCUS_BACKGROUND = "https://images.unsplash.com/photo-1490750967868-58cb9bdda31c?q=80&auto=format&fit=crop"
+
+EXTENSIONS = {"image/jpeg": ".jpg", "image/png": ".png", "image/webp": ".webp", "image/avif": ".avif"}
+
+
+def focus_background():
+    return os.getenv("FLOWDECK_BACKGROUND") or FOCUS_BACKGROUND
+
+def is_remote(source):
+    return source.startswith(("http://", "https://"))
+
+def bucket(width, height):
+    """The variant size a window gets: rounded up to SIZE_STEP, at most MAX_SIZE on the long side."""
+    if not width or not height:
+        width, height = DEFAULT_SIZE
+    scale = min(1.0, MAX_SIZE / max(width, height))
+    def snap(v):
+        return max(SIZE_STEP, -(-int(v * scale) // SIZE_STEP) * SIZE_STEP)
+    return snap(width), snap(height)
+
+def sized_url(url, width, height):
+    # Same photo, cropped to the window's shape and scaled by the CDN
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.update(w=str(width), h=str(height), fit="crop")
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class AssetCache:
+    """
+    Content-addressed image cache under the Flet assets folder. Every file is
+    named after the hash of its bytes, so the same picture fetched twice (or
+    two sizes that came out identical) is stored once; index.json maps
+    (source, size) to the file, and remembers when each was last used.
+
+    A source is a URL or a local file. Variants are made per window size
+    bucket: remote ones are asked from the CDN at that size, local ones are
+    cropped with Pillow if it's installed (otherwise the original is used
+    for every size). Once a variant is on disk nothing goes over the network
+    again, so focus mode opens instantly and offline.
+    """
+
+    def __init__(self, root=ASSETS_DIR, subdir=CACHE_DIR):
+        self.subdir = subdir
+        self.dir = os.path.join(root, subdir)
+        self.index_file = os.path.join(self.dir, INDEX_FILE)
+        self._index = self._load_index()  # source -> {"WxH": {"file": name, "used": ts}}
+        self._inflight = {}  # (source, size) -> Event, so sessions asking at once fetch once
+        self._lock = threading.Lock()
+
+    def _load_index(self):
+        try:
+            with open(self.index_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def src(self, name):
+        return f"/{self.subdir}/{name}"
+
+    # --- Reading ---
+    def lookup(self, source, width, height):
+        """
+        (src, exact) of the best variant on disk for this window, or
+        (None, False). Not exact means a different size of the same picture:
+        good enough to show while the right one is fetched.
+        """
+        want = "%dx%d" % bucket(width, height)
+        with self._lock:
+            variants = {size: v for size, v in self._index.get(source, {}).items()
+                        if os.path.exists(os.path.join(self.dir, v["file"]))}
+            if want in variants:
+                variants[want]["used"] = time.time()
+                return self.src(variants[want]["file"]), True
+        if not variants:
+            return None, False
+        # Otherwise the closest in area: a bit blurry or a bit heavy beats nothing
+        w, h = bucket(width, height)
+        def distance(size):
+            vw, vh = map(int, size.split("x"))
+            return abs(vw * vh - w * h)
+        return self.src(variants[min(variants, key=distance)]["file"]), False
+
+    # --- Filling ---
+    @perf.timed("assets.fetch", "assets")
+    def fetch(self, source, width, height):
+        """Makes sure the variant for this window is on disk; returns its src. Blocking."""
+        size = bucket(width, height)
+        key = "%dx%d" % size
+        while True:
+            with self._lock:
+                entry = self._index.get(source, {}).get(key)
+                if entry and os.path.exists(os.path.join(self.dir, entry["file"])):
+                    entry["used"] = time.time()
+                    return self.src(entry["file"])
+                waiting = self._inflight.get((source, key))
+                if waiting is None:
+                    done = self._inflight[(source, key)] = threading.Event()
+                    break
+            waiting.wait()  # Someone else is fetching it; then read what they stored
+
+        try:
+            data, ext = self._read_source(source, *size)
+            name = hashlib.sha256(data).hexdigest()[:24] + ext
+            os.makedirs(self.dir, exist_ok=True)
+            path = os.path.join(self.dir, name)
+            if not os.path.exists(path):
+                tmp = f"{path}.{threading.get_ident()}.tmp"  # Two sizes can hash to one file
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            with self._lock:
+                self._index.setdefault(source, {})[key] = {"file": name, "used": time.time()}
+                self._evict(source)
+                # Written under the lock: atomic_write always goes through the
+                # same .tmp file, and a later index must not be overwritten by
+                # an earlier one
+                atomic_write(self.index_file, json.dumps(self._index))
+            return self.src(name)
+        finally:
+            with self._lock:
+                del self._inflight[(source, key)]
+            done.set()
+
+    def _read_source(self, source, width, height):
+        if is_remote(source):
+            import requests  # Heavy, and only needed on a cache miss
+
+            resp = requests.get(sized_url(source, width, height), timeout=15)
+            resp.raise_for_status()
+            kind = resp.headers.get("Content-Type", "").split(";")[0].strip()
+            return resp.content, EXTENSIONS.get(kind, ".jpg")
+        return _crop_file(source, width, height)
+
+    def _evict(self, source):
+        # Caller holds the lock. Files still named by another entry stay.
+        variants = self._index[source]
+        while len(variants) > KEEP_VARIANTS:
+            oldest = min(variants, key=lambda size: variants[size]["used"])
+            name = variants.pop(oldest)["file"]
+            if not any(v["file"] == name for vs in self._index.values() for v in vs.values()):
+                try:
+                    os.remove(os.path.join(self.dir, name))
+                except OSError:
+                    pass
+
+
+def _crop_file(path, width, height):
+    ext = os.path.splitext(path)[1].lower() or ".jpg"
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        # No Pillow: every size gets the original (hashing dedupes it to one file)
+        with open(path, "rb") as f:
+            return f.read(), ext
+    with Image.open(path) as img:
+        out = io.BytesIO()
+        ImageOps.fit(img.convert("RGB"), (width, height), Image.LANCZOS).save(out, "JPEG", quality=85)
+        return out.getvalue(), ".jpg"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_asset_cache():
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AssetCache()
+    return _cache
+
+def prefetch_background(width, height):
+    """Fetches the focus background for this window size ahead of time. For the I/O pool; never raises."""
+    try:
+        return get_asset_cache().fetch(focus_background(), width, height)
+    except Exception as e:
+        print(f"Background prefetch failed: {e}")  # Offline: focus mode shows whatever is cached
+        return None
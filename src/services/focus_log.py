@@ -0,0 +1,151 @@
+import os
+import mmap
+import bisect
+import time
+import struct
+import datetime
+import threading
+
+from src.services import perf
+
+FOCUS_LOG_FILE = "focus_sessions.bin"
+
+START, PAUSE, RESUME, FINISH = 1, 2, 3, 4
+
+# One fixed-width little-endian record per event:
+#   timestamp (float64, epoch seconds), task id (int64, 0 = not a local task),
+#   seconds of focus in the run that just ended (uint32), kind (uint8), padding
+RECORD = struct.Struct("<dqIB3x")
+
+
+class FocusLog:
+    """
+    Append-only binary log of focus events (start / pause / resume / finish).
+
+    Records are 24 bytes and written in time order, so the file is its own
+    index: a range query binary-searches the memory-mapped file for its first
+    record and then only walks the records inside the range. Pause and finish
+    records carry the length of the run they end, so a query never has to
+    pair them up with the matching start.
+    """
+
+    def __init__(self, path=FOCUS_LOG_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_ts = 0.0
+        self._file = None
+
+    @perf.timed("focus_log.append", "store")
+    def append(self, kind, task_id=None, seconds=0, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            if self._file is None:
+                self._drop_torn_tail()
+                self._file = open(self.path, "ab")
+                self._last_ts = self._read_last_ts()
+            # Keep the file sorted even if the wall clock steps backwards
+            ts = max(ts, self._last_ts)
+            self._last_ts = ts
+            self._file.write(RECORD.pack(ts, task_id or 0, int(seconds), kind))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _drop_torn_tail(self):
+        # A crash mid-write leaves a partial record; appending after it
+        # would shift every later record off the 24-byte grid
+        if os.path.exists(self.path):
+            size = os.path.getsize(self.path)
+            if size % RECORD.size:
+                with open(self.path, "r+b") as f:
+                    f.truncate(size - size % RECORD.size)
+
+    def _read_last_ts(self):
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        if size < RECORD.size:
+            return 0.0
+        with open(self.path, "rb") as f:
+            f.seek(size - RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))[0]
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    # --- Reading ---
+    def records(self, start_ts, end_ts):
+        """Yields (ts, task_id, seconds, kind) with start_ts <= ts < end_ts."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            count = size // RECORD.size  # Ignores a torn trailing record
+            if count == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lo = self._bisect(mm, count, start_ts)
+                hi = self._bisect(mm, count, end_ts)
+                yield from RECORD.iter_unpack(mm[lo * RECORD.size:hi * RECORD.size])
+
+    @staticmethod
+    def _bisect(mm, count, ts):
+        # Index of the first record with timestamp >= ts
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if RECORD.unpack_from(mm, mid * RECORD.size)[0] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def focus_by_task_day(self, start, end):
+        """
+        {(task_id, "YYYY-MM-DD"): focus seconds} for runs that ended in
+        [start, end) (datetimes). Runs that cross midnight are split.
+        """
+        # Local midnights covering the range (one day early, for runs that
+        # started the day before), so each run is bucketed with a bisect
+        # instead of building datetimes per record
+        first = start.date() - datetime.timedelta(days=1)
+        n_days = (end.date() - first).days + 2
+        days = [first + datetime.timedelta(days=k) for k in range(n_days)]
+        bounds = [datetime.datetime.combine(d, datetime.time()).timestamp() for d in days]
+        labels = [d.strftime("%Y-%m-%d") for d in days]
+
+        totals = {}
+        for ts, task_id, seconds, kind in self.records(start.timestamp(), end.timestamp()):
+            if kind not in (PAUSE, FINISH) or not seconds:
+                continue
+            run_start = ts - seconds
+            i = bisect.bisect_right(bounds, ts) - 1
+            while i >= 0:
+                chunk_start = max(run_start, bounds[i])
+                if ts > chunk_start:
+                    key = (task_id, labels[i])
+                    totals[key] = totals.get(key, 0) + ts - chunk_start
+                if run_start >= bounds[i]:
+                    break
+                ts = bounds[i]  # Rest of the run belongs to the previous day
+                i -= 1
+        return totals
+
+    def focus_by_task(self, start, end):
+        """{task_id: focus seconds} for runs that ended in [start, end)."""
+        totals = {}
+        for (task_id, _), seconds in self.focus_by_task_day(start, end).items():
+            totals[task_id] = totals.get(task_id, 0) + seconds
+        return totals
+
+
+_focus_log = None
+_focus_log_lock = threading.Lock()
+
+def get_focus_log():
+    global _focus_log
+    if _focus_log is None:
+        with _focus_log_lock:
+            if _focus_log is None:
+                _focus_log = FocusLog()
+    return _focus_log
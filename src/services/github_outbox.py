@@ -0,0 +1,405 @@
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from urllib.parse import urlparse
+
+from src.services.io_pool import run_io
+from src.services.local_db import atomic_write
+from src.services.github_sync import GitHubClient, get_token, get_sync
+from src.services import perf
+
+OUTBOX_FILE = "github_outbox.json"
+MAX_BATCH = 20          # Mutations per GraphQL request, at most
+MIN_GAP = 1.0           # Seconds between two writes: GitHub's advice against secondary rate limits
+RESERVE = 50            # Requests of the hourly budget left for the sync's reads
+BACKOFF_BASE = 2.0      # Seconds, doubled per failure in a row
+BACKOFF_MAX = 15 * 60
+SECONDARY_WAIT = 60     # At least this long after a secondary rate limit with no Retry-After
+MAX_ATTEMPTS = 8        # Failed sends before an op is given up on (rate limits don't count)
+APPLIED_TTL = 10 * 60   # Seconds a written state wins over a sync cache that hasn't caught up
+
+CLOSE, REOPEN, COMMENT = "close", "reopen", "comment"
+STATES = {CLOSE: "closed", REOPEN: "open"}
+DONE, DROP, RETRY = "done", "drop", "retry"
+WAIT = "wait"  # Retry without counting an attempt: rate limited or offline, not the op's fault
+
+_MUTATIONS = {
+    CLOSE: "closeIssue(input: {{issueId: ${v}}}) {{ clientMutationId }}",
+    REOPEN: "reopenIssue(input: {{issueId: ${v}}}) {{ clientMutationId }}",
+    COMMENT: "addComment(input: {{subjectId: ${v}, body: ${v}_body}}) {{ clientMutationId }}",
+}
+_GIVE_UP = {"NOT_FOUND", "FORBIDDEN", "UNPROCESSABLE"}  # GraphQL error types retrying won't fix
+
+
+def is_pull(issue):
+    # Review requests are PRs: "done" there means reviewed, not closed
+    return "/pull/" in (issue.get("url") or "")
+
+def rest_path(html_url):
+    # https://github.com/owner/repo/issues/7 -> /repos/owner/repo/issues/7
+    owner, repo, _, number = urlparse(html_url).path.strip("/").split("/")[:4]
+    return f"/repos/{owner}/{repo}/issues/{number}"
+
+def graphql_batch(ops):
+    """One mutation document for a list of ops; field opN answers ops[N]."""
+    decls, fields, variables = [], [], {}
+    for n, op in enumerate(ops):
+        v = f"i{n}"
+        decls.append(f"${v}: ID!")
+        variables[v] = op["issue"]["node_id"]
+        if op["kind"] == COMMENT:
+            decls.append(f"${v}_body: String!")
+            variables[f"{v}_body"] = op["body"]
+        fields.append(f"op{n}: " + _MUTATIONS[op["kind"]].format(v=v))
+    return {"query": f"mutation({', '.join(decls)}) {{ {' '.join(fields)} }}", "variables": variables}
+
+
+class GitHubOutbox:
+    """
+    Writes to GitHub made from FlowDeck (closing / reopening an issue,
+    posting the focus time of a finished session), kept in a file and sent
+    by a task on the event loop, with the HTTP calls on the I/O pool. The UI
+    shows the new state as soon as the op is queued (state_of) and never
+    waits on the network; queued ops outlive a restart.
+
+    Ops on issues we know the node id of go out together as one GraphQL
+    mutation document (up to batch_size), the rest one REST call each, at
+    least MIN_GAP apart. The X-RateLimit-* budget is tracked from every
+    answer and RESERVE requests of it are left to the sync. A 403 / 429 rate
+    limit halves the batch size and pauses until Retry-After or the reset
+    time (exponential backoff with jitter when GitHub gives neither); each
+    success doubles it back up.
+
+    A close queued while a reopen of the same issue is still waiting (a
+    checkbox ticked and unticked) cancels it instead of sending both.
+    """
+
+    def __init__(self, token=None, outbox_file=OUTBOX_FILE, base_url=None):
+        self.token = token  # Resolved from .env on the I/O pool if not given
+        self.outbox_file = outbox_file
+        self.base_url = base_url
+        self.batch_size = MAX_BATCH
+        self.counts = {"requests": 0, "sent": 0, "dropped": 0, "rate_limited": 0}
+        self._client = None
+        self._ops = []          # Waiting, oldest first
+        self._seq = 0
+        self._inflight = set()  # Seqs of the batch being sent
+        self._applied = {}      # issue id -> (state, time.time()) of writes GitHub took
+        self._failures = 0      # In a row, for the backoff
+        self._not_before = 0.0  # Nothing is sent before this (time.time())
+        self._last_send = 0.0
+        self._hydrated = False
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()  # One drain() at a time
+        self._loop = None
+        self._wake = None  # asyncio.Event, made on the loop in start()
+        self._task = None
+
+    # --- Queue ---
+    @perf.timed("outbox.load", "sync")
+    def hydrate(self):
+        """Read the queue file (once)."""
+        if self._hydrated:
+            return
+        ops, seq = [], 0
+        if os.path.exists(self.outbox_file):
+            try:
+                with open(self.outbox_file, "r") as f:
+                    data = json.load(f)
+                ops, seq = data.get("ops", []), data.get("seq", 0)
+            except (OSError, ValueError) as e:
+                print(f"GitHub outbox unreadable, starting empty: {e}")
+        with self._lock:
+            if self._hydrated:
+                return
+            self._ops = ops + self._ops
+            self._seq = max(seq, self._seq)
+            self._hydrated = True
+            listeners = list(self._listeners)
+        if ops:
+            self._notify(listeners, False)  # Cards closed last time still show done
+
+    def _save(self):
+        # Called with the lock held; the file is tiny (only what's still waiting)
+        atomic_write(self.outbox_file, json.dumps({"seq": self._seq, "ops": self._ops}))
+
+    def enqueue(self, kind, issue, body=None):
+        """Queue a write (from the I/O pool: it saves the file). Returns False if it cancelled out."""
+        self.hydrate()
+        queued = True
+        with self._lock:
+            if kind in STATES:
+                waiting = next((op for op in self._ops
+                                if op["kind"] in STATES and op["issue"]["id"] == issue["id"]
+                                and op["seq"] not in self._inflight), None)
+                if waiting is not None:
+                    if waiting["kind"] != kind:
+                        self._ops.remove(waiting)  # Toggled back before it went out: nothing to send
+                        queued = False
+                    kind = None
+            if kind is not None:
+                self._seq += 1
+                self._ops.append({
+                    "seq": self._seq, "kind": kind, "body": body, "at": time.time(), "attempts": 0,
+                    "issue": {"id": issue["id"], "node_id": issue.get("node_id"), "url": issue["url"]},
+                })
+            self._save()
+            listeners = list(self._listeners)
+        self._notify(listeners, False)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        return queued
+
+    def state_of(self, issue_id):
+        """"closed" / "open" if FlowDeck changed the issue and the sync may not show it yet, else None."""
+        with self._lock:
+            for op in reversed(self._ops):
+                if op["kind"] in STATES and op["issue"]["id"] == issue_id:
+                    return STATES[op["kind"]]
+            applied = self._applied.get(issue_id)
+        if applied and time.time() - applied[1] < APPLIED_TTL:
+            return applied[0]
+        return None
+
+    def pending(self):
+        with self._lock:
+            return len(self._ops)
+
+    def subscribe(self, callback):
+        """callback(applied) after the queue changed; applied is True when GitHub took some of it."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def _notify(self, listeners, applied):
+        for callback in listeners:
+            try:
+                callback(applied)
+            except Exception as e:
+                print(f"GitHub outbox listener error: {e}")
+
+    # --- Sending ---
+    def _client_or_new(self):
+        if self.token is None:
+            self.token = get_token()
+        if self._client is None and self.token:
+            self._client = GitHubClient(self.token, self.base_url)
+        return self._client
+
+    def _next_batch(self):
+        # Called with the lock held. GraphQL ops go out together, in queue order
+        if not self._ops:
+            return []
+        batch = [self._ops[0]]
+        if batch[0]["issue"]["node_id"]:
+            for op in self._ops[1:self.batch_size]:
+                if not op["issue"]["node_id"]:
+                    break
+                batch.append(op)
+        self._inflight = {op["seq"] for op in batch}
+        return batch
+
+    def _wait_time(self, client, batch):
+        now = time.time()
+        wait = max(self._not_before - now, self._last_send + MIN_GAP - now)
+        resource = "graphql" if batch[0]["issue"]["node_id"] else "core"
+        remaining, reset = client.rate.get(resource, (None, 0))
+        if remaining is not None and remaining < RESERVE + len(batch) and reset > now:
+            wait = max(wait, reset - now + 1)  # Budget spent: wait for the window to roll over
+        return wait
+
+    @perf.timed("outbox.drain", "sync")
+    def drain(self):
+        """
+        Send what's waiting, as far as the rate limits allow. Returns the
+        seconds until it should be called again, or None once it's empty.
+        """
+        self.hydrate()
+        with self._send_lock:
+            client = self._client_or_new()
+            if client is None:
+                return None  # No token: keep the ops for when there is one
+            while True:
+                with self._lock:
+                    batch = self._next_batch()
+                if not batch:
+                    return None
+                wait = self._wait_time(client, batch)
+                if wait > 0:
+                    with self._lock:
+                        self._inflight = set()
+                    return wait
+                self._send(client, batch)
+
+    def _send(self, client, batch):
+        self._last_send = time.time()
+        self.counts["requests"] += 1
+        try:
+            if batch[0]["issue"]["node_id"]:
+                outcome = self._send_graphql(client, batch)
+            else:
+                outcome = self._send_rest(client, batch[0])
+        except Exception as e:  # Offline, timeout, DNS...
+            print(f"GitHub write-back failed: {e}")
+            self._not_before = time.time() + self._backoff()
+            outcome = {op["seq"]: WAIT for op in batch}
+        self._settle(batch, outcome)
+
+    def _send_rest(self, client, op):
+        path = rest_path(op["issue"]["url"])
+        if op["kind"] == COMMENT:
+            resp = client.send("POST", path + "/comments", {"body": op["body"]})
+        else:
+            resp = client.send("PATCH", path, {"state": STATES[op["kind"]]})
+        if resp.ok:
+            return self._took({op["seq"]: DONE})
+        if self._limited(resp):
+            return {op["seq"]: WAIT}
+        if resp.status_code >= 500 or resp.status_code == 401:
+            self._not_before = time.time() + self._backoff()
+            return {op["seq"]: RETRY if resp.status_code >= 500 else WAIT}
+        print(f"GitHub write-back dropped ({op['kind']} {op['issue']['url']}): {resp.status_code}")
+        return {op["seq"]: DROP}  # 404 / 410 / 422 / no permission: retrying won't help
+
+    def _send_graphql(self, client, batch):
+        resp = client.send("POST", "/graphql", graphql_batch(batch))
+        if self._limited(resp):
+            return {op["seq"]: WAIT for op in batch}
+        if resp.status_code >= 500 or resp.status_code == 401:
+            self._not_before = time.time() + self._backoff()
+            return {op["seq"]: RETRY if resp.status_code >= 500 else WAIT for op in batch}
+        errors = (resp.json().get("errors") or []) if resp.ok else [{"type": str(resp.status_code)}]
+        if any(e.get("type") == "RATE_LIMITED" for e in errors):
+            self._limit(self._reset_wait(resp) or self._backoff(SECONDARY_WAIT))
+            return {op["seq"]: WAIT for op in batch}
+        by_field = {e["path"][0]: e for e in errors if e.get("path")}
+        if len(by_field) < len(errors):
+            # The document itself was refused: send one at a time to find the bad op
+            if len(batch) > 1:
+                self.batch_size = 1
+                return {op["seq"]: RETRY for op in batch}
+            print(f"GitHub write-back dropped ({batch[0]['kind']}): {errors}")
+            return {batch[0]["seq"]: DROP}
+        outcome = {}
+        for n, op in enumerate(batch):
+            error = by_field.get(f"op{n}")
+            if error is None:
+                outcome[op["seq"]] = DONE
+            elif error.get("type") in _GIVE_UP:
+                print(f"GitHub write-back dropped ({op['kind']} {op['issue']['url']}): {error.get('message')}")
+                outcome[op["seq"]] = DROP
+            else:
+                outcome[op["seq"]] = RETRY
+        if RETRY in outcome.values():
+            # Some mutation failed on GitHub's side: back off before resending it,
+            # or a passing outage burns through MAX_ATTEMPTS in seconds
+            self._not_before = time.time() + self._backoff()
+            return outcome
+        return self._took(outcome)
+
+    def _took(self, outcome):
+        # GitHub answered: the backoff starts over and the batch grows back
+        self._failures = 0
+        self.batch_size = min(MAX_BATCH, self.batch_size * 2)
+        return outcome
+
+    def _limited(self, resp):
+        """True (and the pause set) if resp is a rate limit answer."""
+        if resp.status_code not in (403, 429):
+            return False
+        retry_after = resp.headers.get("Retry-After")
+        if retry_after:
+            self._limit(float(retry_after))
+        elif resp.headers.get("X-RateLimit-Remaining") == "0":
+            self._limit(self._reset_wait(resp))  # Primary limit: the hour's budget is gone
+        elif resp.status_code == 429 or "rate limit" in resp.text.lower():
+            self._limit(self._backoff(SECONDARY_WAIT))
+        else:
+            return False  # A plain 403: no permission
+        return True
+
+    def _limit(self, wait):
+        self.counts["rate_limited"] += 1
+        self.batch_size = max(1, self.batch_size // 2)
+        self._not_before = time.time() + wait
+
+    def _reset_wait(self, resp):
+        reset = int(resp.headers.get("X-RateLimit-Reset", 0))
+        return max(1.0, reset - time.time() + 1) if reset else None
+
+    def _backoff(self, floor=0):
+        self._failures += 1
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self._failures - 1))
+        return max(floor, delay * random.uniform(0.5, 1.0))  # Jitter: many clients don't retry in step
+
+    def _settle(self, batch, outcome):
+        now = time.time()
+        applied = False
+        with self._lock:
+            for op in batch:
+                result = outcome.get(op["seq"], RETRY)
+                if result == RETRY:
+                    op["attempts"] += 1
+                    if op["attempts"] >= MAX_ATTEMPTS:
+                        print(f"GitHub write-back gave up ({op['kind']} {op['issue']['url']})")
+                        result = DROP
+                if result in (RETRY, WAIT):
+                    continue
+                if op in self._ops:
+                    self._ops.remove(op)
+                if result == DONE:
+                    self.counts["sent"] += 1
+                    applied = True
+                    if op["kind"] in STATES:
+                        self._applied[op["issue"]["id"]] = (STATES[op["kind"]], now)
+                else:
+                    self.counts["dropped"] += 1
+            self._inflight = set()
+            self._save()
+            listeners = list(self._listeners)
+        self._notify(listeners, applied)
+
+    async def _run(self):
+        while True:
+            try:
+                delay = await run_io(self.drain)
+            except Exception as e:
+                print(f"GitHub outbox error: {e}")
+                delay = BACKOFF_MAX
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)  # None: until the next enqueue
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self):
+        """Starts the sender on the running event loop. Every session calls this; only the first one starts it."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._task is None or self._task.done():
+                self._loop = loop
+                self._wake = asyncio.Event()
+                self._task = loop.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._task = None
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+def get_outbox():
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                outbox = GitHubOutbox()
+                # Once a write lands, have the issue list catch up with it
+                outbox.subscribe(lambda applied: applied and get_sync().refresh_now())
+                _outbox = outbox
+    return _outbox
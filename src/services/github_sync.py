@@ -1,30 +1,465 @@
-from github import Github
 import os
-from dotenv import load_dotenv
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-# Load keys from .env file
-load_dotenv()
+from src.services.io_pool import run_io
+from src.services import perf
+
+API_URL = "https://api.github.com"
+CACHE_FILE = "github_cache.json"
+SYNC_INTERVAL = 120          # Seconds between background refreshes
+FULL_SYNC_EVERY = 24 * 3600  # Full re-list now and then to drop un-assigned issues
+PER_PAGE = 100
+FETCH_WORKERS = 6            # Sources fetched at once, over one pooled session
+DEFAULT_SOURCES = "assigned"
+
+_env_loaded = False
+
+
+def _load_env():
+    global _env_loaded
+    if not _env_loaded:
+        # Load keys from .env file (lazily, so it stays off the startup path)
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def get_token():
+    _load_env()
+    return os.getenv("GITHUB_TOKEN")
+
+
+class GitHubClient:
+    """
+    Thin REST client over one pooled requests.Session. Supports conditional
+    GETs: a 304 answer is returned as-is (and does not count against the
+    rate limit). `rate` keeps the last X-RateLimit-* budget seen per
+    resource ("core", "search", "graphql"): resource -> (remaining, reset).
+    """
+
+    def __init__(self, token, base_url=None):
+        import requests  # Heavy, and only needed once we actually talk to GitHub
+
+        # GITHUB_API_URL lets us point the app at a local fake API
+        self.base_url = (base_url or os.getenv("GITHUB_API_URL") or API_URL).rstrip("/")
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"token {token}",
+            "Accept": "application/vnd.github+json",
+        })
+        # Sources are fetched from several threads at once: keep a connection each
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=FETCH_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.request_count = 0
+        self.rate = {}
+        self._count_lock = threading.Lock()
+
+    @perf.timed("sync.http_get", "sync")
+    def get(self, path_or_url, params=None, etag=None, last_modified=None):
+        url = path_or_url if path_or_url.startswith("http") else self.base_url + path_or_url
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        resp = self.session.get(url, params=params, headers=headers, timeout=15)
+        self._track(resp)
+        if resp.status_code != 304:
+            resp.raise_for_status()
+        return resp
+
+    def send(self, method, path_or_url, payload):
+        """A write (POST / PATCH). The response is returned whatever its status."""
+        url = path_or_url if path_or_url.startswith("http") else self.base_url + path_or_url
+        resp = self.session.request(method, url, json=payload, timeout=15)
+        self._track(resp)
+        return resp
+
+    def _track(self, resp):
+        headers = resp.headers
+        with self._count_lock:
+            self.request_count += 1
+            if "X-RateLimit-Remaining" in headers:
+                resource = headers.get("X-RateLimit-Resource", "core")
+                self.rate[resource] = (int(headers["X-RateLimit-Remaining"]),
+                                       int(headers.get("X-RateLimit-Reset", 0)))
+
+
+def normalize_issue(raw):
+    # The list payload already carries the repository, no per-issue lookup needed
+    repo = raw.get("repository") or {}
+    repo_name = repo.get("name") or raw.get("repository_url", "").rsplit("/", 1)[-1]
+    return {
+        "title": raw["title"],
+        "repo": repo_name,
+        "url": raw["html_url"],
+        "id": raw["id"],
+        "node_id": raw.get("node_id"),  # For GraphQL write-back (see github_outbox)
+        "created_at": raw.get("created_at", ""),
+    }
+
+@perf.timed("sync.fetch_pages", "sync")
+def _fetch_pages(client, params, etag=None, last_modified=None, path="/issues", items=None):
+    """
+    Walks every page of a listing (`items`: the key holding the list, for
+    the search API). Returns (raw_issues, first_response), or
+    (None, first_response) when the first page came back 304 Not Modified.
+    """
+    def page(resp):
+        data = resp.json()
+        return data[items] if items else data
+
+    resp = client.get(path, params=params, etag=etag, last_modified=last_modified)
+    if resp.status_code == 304:
+        return None, resp
+    first = resp
+    issues = list(page(resp))
+    while "next" in resp.links:
+        resp = client.get(resp.links["next"]["url"])
+        issues.extend(page(resp))
+    return issues, first
+
+
+class Source:
+    """One listing the sync pulls issues from, named by `key` in the cache."""
+
+    def __init__(self, key, path, params, items=None, incremental=False):
+        self.key = key
+        self.path = path
+        self.params = params
+        self.items = items              # Key of the list in the payload (search API)
+        self.incremental = incremental  # Takes `since`, so later syncs only ask for changes
+
+def parse_sources(spec=None):
+    """
+    Sources from a ';'-separated spec (GITHUB_SOURCES in .env):
+        assigned             issues assigned to you (the default)
+        review-requested     open pull requests waiting for your review
+        repo:owner/name      open issues of one repository
+        search:<query>       any issue search, e.g. search:is:open label:bug org:acme
+    """
+    sources = []
+    for part in (spec or DEFAULT_SOURCES).split(";"):
+        part = part.strip()
+        if part == "assigned":
+            sources.append(Source(part, "/issues", {"filter": "assigned", "state": "open"}, incremental=True))
+        elif part == "review-requested":
+            sources.append(Source(part, "/search/issues",
+                                  {"q": "is:pr is:open review-requested:@me", "sort": "updated"}, items="items"))
+        elif part.startswith("repo:"):
+            # Newest-updated first, so any edit changes the first page (and its ETag)
+            sources.append(Source(part, f"/repos/{part[5:].strip()}/issues",
+                                  {"state": "open", "sort": "updated", "direction": "desc"}))
+        elif part.startswith("search:"):
+            sources.append(Source(part, "/search/issues", {"q": part[7:].strip(), "sort": "updated"}, items="items"))
+        elif part:
+            print(f"GitHub: unknown source {part!r}, skipped")
+    return sources
+
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
+def get_fetch_pool():
+    # Its own small pool: sync_once already runs on the I/O pool, and waiting
+    # there on work queued behind it in the same pool could starve it
+    global _fetch_pool
+    if _fetch_pool is None:
+        with _fetch_pool_lock:
+            if _fetch_pool is None:
+                _fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="flowdeck-github")
+    return _fetch_pool
 
 def fetch_my_issues():
-    token = os.getenv("GITHUB_TOKEN")
+    token = get_token()
     if not token:
         print("Error: GITHUB_TOKEN not found in .env")
         return []
 
     try:
-        g = Github(token)
-        # "None" means get issues for the authenticated user
-        issues = g.get_user().get_issues(state='open', filter='assigned')
-        
-        task_list = []
-        for issue in issues:
-            task_list.append({
-                "title": issue.title,
-                "repo": issue.repository.name,
-                "url": issue.html_url,
-                "id": issue.id
-            })
-        return task_list
+        params = {"filter": "assigned", "state": "open", "per_page": PER_PAGE}
+        issues, _ = _fetch_pages(GitHubClient(token), params)
+        return [normalize_issue(i) for i in issues]
     except Exception as e:
         print(f"GitHub Error: {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+class GitHubSync:
+    """
+    Keeps the issue list (the union of every configured Source, deduped by
+    id) in an on-disk cache and refreshes it from a task on the event loop,
+    with each sync (HTTP calls and the cache file) run on the I/O pool. The
+    UI only ever reads the cache, so it never waits on the network;
+    listeners are called (from the I/O pool) when new data arrives.
+
+    Sources are fetched concurrently over one pooled session, so a sync
+    takes about as long as the slowest source. After the first full listing
+    the incremental ones ask only for issues updated `since` the newest one
+    we have; all send the last ETag / Last-Modified, so an unchanged source
+    costs a single 304.
+    """
+
+    def __init__(self, token=None, cache_file=CACHE_FILE, interval=SYNC_INTERVAL, base_url=None, sources=None):
+        self.token = token  # Resolved from .env on the I/O pool if not given
+        self.cache_file = cache_file
+        self.interval = interval
+        self.base_url = base_url
+        self.sources = sources  # From GITHUB_SOURCES (see parse_sources) if not given
+        self._client = None
+        self._issues = {}     # id -> normalized issue, all sources merged
+        self._by_source = {}  # source key -> {id -> issue}
+        self._state = {"full_synced_at": 0, "sources": {}}  # Per source: since / etag / last_modified / query
+        self._hydrated = False  # Cache file is read on the I/O pool, not at startup
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None  # asyncio.Event, made on the loop in start()
+        self._task = None
+
+    @perf.timed("sync.load_cache", "sync")
+    def _load_cache(self):
+        if not os.path.exists(self.cache_file):
+            return {}, {}
+        try:
+            with open(self.cache_file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        if isinstance(data, list):  # Old cache format: plain issue list
+            data = {"issues": data}
+        issues = {i["id"]: i for i in data.get("issues", [])}
+        state = data.get("state", {})
+        if "sources" not in state:
+            # Cache from before sources: it all came from "assigned"
+            old = {k: state.get(k) for k in ("since", "etag", "last_modified", "query")}
+            state = {"full_synced_at": state.get("full_synced_at", 0), "sources": {"assigned": old}}
+            data["sources"] = {"assigned": list(issues)}
+        by_source = {key: {i: issues[i] for i in ids if i in issues}
+                     for key, ids in data.get("sources", {}).items()}
+        return by_source, state
+
+    def hydrate(self):
+        """Load the on-disk cache (once) and hand it to the listeners."""
+        if self._hydrated:
+            return
+        by_source, state = self._load_cache()
+        with self._lock:
+            self._hydrated = True
+            self._by_source = by_source
+            self._issues = self._merge(by_source)
+            self._state.update(state)
+            issues = self._sorted()
+            listeners = list(self._listeners)
+        if issues:
+            self._notify(listeners, issues)
+
+    def _notify(self, listeners, issues):
+        for callback in listeners:
+            try:
+                callback(issues)
+            except Exception as e:
+                print(f"GitHub sync listener error: {e}")
+
+    @perf.timed("sync.save_cache", "sync")
+    def _save_cache(self, issues):
+        tmp = self.cache_file + ".tmp"
+        sources = {key: list(found) for key, found in self._by_source.items()}
+        with open(tmp, "w") as f:
+            json.dump({"issues": issues, "state": self._state, "sources": sources}, f)
+        os.replace(tmp, self.cache_file)
+
+    def _merge(self, by_source):
+        # An issue that several sources list (assigned *and* in a watched repo) is kept once
+        merged = {}
+        for found in by_source.values():
+            merged.update(found)
+        return merged
+
+    def _sorted(self):
+        # Same order GitHub lists them in: newest first
+        return sorted(self._issues.values(), key=lambda i: i.get("created_at", ""), reverse=True)
+
+    # --- Reading ---
+    def get_cached_issues(self):
+        with self._lock:
+            return self._sorted()
+
+    def subscribe(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    # --- Syncing ---
+    def _client_or_new(self):
+        if self._client is None:
+            # One client (and connection pool) for the life of the app
+            self._client = GitHubClient(self.token, self.base_url)
+        return self._client
+
+    def _list_source(self, client, source, old):
+        # Whole listing, sorted by last update where it isn't already, so any
+        # change shows on page one and changes its ETag
+        params = dict(source.params, per_page=PER_PAGE)
+        query = json.dumps(params, sort_keys=True)
+        same_query = query == old.get("query")
+        raw, first = _fetch_pages(
+            client, params,
+            etag=old.get("etag") if same_query else None,
+            last_modified=old.get("last_modified") if same_query else None,
+            path=source.path, items=source.items,
+        )
+        if raw is None:
+            return None, old  # 304: nothing changed
+        fresh = {i["id"]: normalize_issue(i) for i in raw}
+        state = {"since": max((i.get("updated_at", "") for i in raw), default=None), "query": query,
+                 "etag": first.headers.get("ETag"), "last_modified": first.headers.get("Last-Modified")}
+        return fresh, state
+
+    def _delta_sync(self, client, source, old):
+        params = dict(source.params, state="all", since=old["since"], per_page=PER_PAGE)
+        query = json.dumps(params, sort_keys=True)
+        same_query = query == old.get("query")
+        raw, first = _fetch_pages(
+            client, params,
+            etag=old.get("etag") if same_query else None,
+            last_modified=old.get("last_modified") if same_query else None,
+            path=source.path, items=source.items,
+        )
+        if raw is None:
+            return None, old  # 304: nothing changed
+
+        fresh = dict(self._by_source.get(source.key, {}))
+        for i in raw:
+            if i.get("state") == "closed":
+                fresh.pop(i["id"], None)
+            else:
+                fresh[i["id"]] = normalize_issue(i)
+        newest = max([i.get("updated_at", "") for i in raw] + [old["since"] or ""])
+        state = dict(old)
+        if newest != old["since"]:
+            # `since` moves, so next time is a different URL with no validators yet
+            state.update({"since": newest, "etag": None, "last_modified": None, "query": None})
+        else:
+            state.update({"query": query, "etag": first.headers.get("ETag"),
+                          "last_modified": first.headers.get("Last-Modified")})
+        return fresh, state
+
+    def _sync_source(self, client, source, full):
+        # Runs on the fetch pool, one call per source
+        old = self._state["sources"].get(source.key) or {}
+        with perf.span("sync.source", "sync"):
+            if full:
+                return self._list_source(client, source, {})  # No validators: a fresh copy
+            if source.incremental and old.get("since"):
+                return self._delta_sync(client, source, old)
+            return self._list_source(client, source, old)
+
+    @perf.timed("sync.sync_once", "sync")
+    def sync_once(self, full=False):
+        self.hydrate()
+        if self.token is None:
+            self.token = get_token()
+        if not self.token:
+            return False
+        if self.sources is None:
+            _load_env()
+            self.sources = parse_sources(os.getenv("GITHUB_SOURCES"))
+        client = self._client_or_new()
+        needs_full = (full or not self._state["full_synced_at"]
+                      or time.time() - self._state["full_synced_at"] > FULL_SYNC_EVERY)
+
+        pool = get_fetch_pool()
+        futures = [(s, pool.submit(self._sync_source, client, s, needs_full)) for s in self.sources]
+        by_source, states, fetched = {}, {}, False
+        for source, future in futures:
+            try:
+                fresh, state = future.result()
+            except Exception as e:
+                print(f"GitHub Error ({source.key}): {e}")  # Keep serving this source's cached copy
+                fresh, state = None, self._state["sources"].get(source.key)
+            fetched = fetched or fresh is not None
+            by_source[source.key] = self._by_source.get(source.key, {}) if fresh is None else fresh
+            if state:
+                states[source.key] = state
+        if not fetched:
+            return False  # All 304s (or errors)
+
+        with self._lock:
+            merged = self._merge(by_source)  # Sources no longer configured drop out here
+            changed = merged != self._issues
+            self._issues = merged
+            self._by_source = by_source
+            self._state = {"full_synced_at": time.time() if needs_full else self._state["full_synced_at"],
+                           "sources": states}
+            issues = self._sorted()
+            listeners = list(self._listeners)
+        self._save_cache(issues)
+        if not changed:
+            return False
+
+        self._notify(listeners, issues)
+        return True
+
+    def refresh_now(self):
+        # Safe from any thread
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def _run(self):
+        while True:
+            try:
+                await run_io(self.sync_once)
+            except Exception as e:
+                print(f"GitHub sync error: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self):
+        """Starts the sync task on the running event loop. Every session calls this; only the first one starts it."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._task is None or self._task.done():
+                self._loop = loop
+                self._wake = asyncio.Event()
+                self._task = loop.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._task = None
+
+
+_syncs = {}  # token -> GitHubSync
+_syncs_lock = threading.Lock()
+
+def get_sync(token=None):
+    """
+    The sync worker for a GitHub token: one per token per process, shared by
+    every session using it, so N open tabs cost one fetch. No token means the
+    app's own from .env (resolved on the I/O pool), cached in CACHE_FILE.
+    """
+    with _syncs_lock:
+        sync = _syncs.get(token)
+        if sync is None:
+            cache_file = CACHE_FILE
+            if token is not None:
+                digest = hashlib.sha256(token.encode("utf-8")).hexdigest()[:12]
+                cache_file = f"github_cache-{digest}.json"
+            sync = _syncs[token] = GitHubSync(token=token, cache_file=cache_file)
+        return sync
+
+def get_cached_issues():
+    return get_sync().get_cached_issues()
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import itertools
+
+FANOUT_WINDOW = 0.05  # Seconds a burst of changes may pile up before sessions are told
+
+TASKS = "tasks"
+OUTBOX = "outbox"  # GitHub writes queued / sent (see github_outbox)
+
+
+class SessionHub:
+    """
+    Process-wide pub/sub between the shared services (task store, GitHub sync
+    workers) and the connected sessions. In web mode every browser tab runs
+    its own main() on the same event loop; they all read the one store and
+    the one sync cache, and the hub tells each of them when something
+    changed, whichever session (or I/O thread) changed it.
+
+    Publishing works from any thread and never blocks on a session: changes
+    are collected per topic and handed to the subscribers on their event
+    loop, at most once per FANOUT_WINDOW. A burst (a bulk import, a tab
+    adding ten tasks) becomes a single callback per session with the topics
+    that changed and the last payload of each. Callbacks may be coroutines.
+    """
+
+    def __init__(self, window=FANOUT_WINDOW):
+        self.window = window
+        self._subs = {}     # token -> (topics, callback, loop)
+        self._pending = {}  # loop -> {topic: last payload since the previous delivery}
+        self._syncs = {}    # GitHubSync -> its topic
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, topics, callback):
+        """Call from the event loop; callbacks are delivered on it."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            token = next(self._ids)
+            self._subs[token] = (frozenset(topics), callback, loop)
+        return token
+
+    def unsubscribe(self, token):
+        with self._lock:
+            self._subs.pop(token, None)
+
+    def publish(self, topic, payload=None):
+        arm = []
+        with self._lock:
+            for loop in {loop for _, _, loop in self._subs.values()}:
+                pending = self._pending.setdefault(loop, {})
+                if not pending:
+                    arm.append(loop)  # First change since the last delivery on that loop
+                pending[topic] = payload
+        for loop in arm:
+            try:
+                loop.call_soon_threadsafe(loop.call_later, self.window, self._deliver, loop)
+            except RuntimeError:
+                self._drop_loop(loop)  # Loop closed under us: its sessions are gone
+
+    def watch_sync(self, sync):
+        """Topic carrying the issue lists of one sync worker (hooked up once, however many sessions ask)."""
+        with self._lock:
+            topic = self._syncs.get(sync)
+            if topic is None:
+                topic = self._syncs[sync] = f"issues:{len(self._syncs) + 1}"
+                sync.subscribe(lambda issues: self.publish(topic, issues))
+        return topic
+
+    def _drop_loop(self, loop):
+        with self._lock:
+            self._pending.pop(loop, None)
+            for token in [t for t, (_, _, l) in self._subs.items() if l is loop]:
+                del self._subs[token]
+
+    def _deliver(self, loop):
+        with self._lock:
+            changes = self._pending.pop(loop, {})
+            subs = [(topics, callback) for topics, callback, l in self._subs.values() if l is loop]
+        for topics, callback in subs:
+            mine = {topic: changes[topic] for topic in topics if topic in changes}
+            if mine:
+                loop.create_task(self._call(callback, mine))
+
+    async def _call(self, callback, changes):
+        try:
+            result = callback(changes)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception as e:
+            print(f"Hub listener error: {e}")  # One broken session doesn't stop the rest
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+def get_hub():
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                from src.services.local_db import get_store
+                from src.services.github_outbox import get_outbox
+                hub = SessionHub()
+                get_store().subscribe(lambda kind, task: hub.publish(TASKS, kind))
+                get_outbox().subscribe(lambda applied: hub.publish(OUTBOX, applied))
+                _hub = hub
+    return _hub
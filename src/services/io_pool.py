@@ -0,0 +1,28 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IO_WORKERS = 4  # Disk writes and HTTP calls in flight at once, for the whole process
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_io_pool():
+    """
+    The one executor blocking work goes to (file writes, fsyncs, GitHub
+    calls), shared by every session. Bounded, so a burst of handlers queues
+    up instead of spawning a thread each.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="flowdeck-io")
+    return _pool
+
+async def run_io(fn, *args, **kwargs):
+    """Runs fn(*args, **kwargs) on the I/O pool without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_pool(), functools.partial(fn, *args, **kwargs))
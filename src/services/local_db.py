@@ -1,42 +1,835 @@
 import json
 import os
 import datetime
+import time
+import atexit
+import threading
+import contextlib
+from itertools import islice
+from src.services import perf
+from src.services.locks import RWLock, FileLock
 
-DB_FILE = "my_tasks.json"
-
-def get_local_tasks(include_completed=False):
-    # If file doesn't exist, return empty list
-    if not os.path.exists(DB_FILE):
-        return []
-    
-    try:
-        with open(DB_FILE, "r") as f:
-            tasks = json.load(f)
-            # Filter out tasks that are marked 'completed' (optional)
-            return [t for t in tasks if not t.get('completed', False)]
-    except:
-        return []
+DB_FILE = "my_tasks.json"   # Compacted snapshot (same format as always)
+LOG_FILE = "my_tasks.log"   # Append-only op log, one JSON op per line
+META_FILE = "my_tasks.meta" # Id counter, saved with each snapshot
+COMPACT_EVERY = 500         # Fold the log into the snapshot after this many ops
+FLUSH_WINDOW = 0.25         # Seconds a mutation waits so a burst of edits lands in one write
+ARCHIVE_AFTER_DAYS = 30     # Completed tasks older than this move to the monthly archive
+ID_BLOCK = 256              # Ids a process leases from the shared counter at a time
+SYNC_EVERY = 5              # Seconds between checks for changes made by other processes
 
-def add_local_task(title):
-    tasks = get_local_tasks()
-    new_task = {
-        "id": int(datetime.datetime.now().timestamp()), # Unique ID based on time
-        "title": title,
-        "type": "manual", # To distinguish from GitHub
-        "completed": False,
-        "created_at": str(datetime.datetime.now())
-    }
-    tasks.insert(0, new_task) # Add to top
-    save_tasks(tasks)
+_MISSING = object()         # Undo marker for a field the task didn't have
+
+
+def atomic_write(path, data):
+    # Write to a temp file, fsync, then rename over the target so a crash
+    # leaves either the old file or the new one, never half of each.
+    # `data` is a string or an iterable of string chunks (streamed out).
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        if isinstance(data, str):
+            f.write(data)
+        else:
+            f.writelines(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ConflictError(Exception):
+    """An update was based on a version of the task that is no longer current."""
+
+
+class TaskStore:
+    """
+    Snapshot + append-only log, written behind the UI.
+
+    A mutation only updates the in-memory index and queues its op in a
+    journal; a background writer wakes up `flush_window` seconds later,
+    coalesces what piled up (ten toggles of one checkbox become one op) and
+    appends it to the log with a single write + fsync. The log is folded back
+    into the snapshot (atomic rename) every `compact_every` ops. Call
+    `flush()` before exiting so nothing still in the journal is lost.
+
+    Ids come from a counter that only goes up: it starts above every id the
+    store has ever seen and is saved next to the snapshot, so an id is never
+    handed out twice, not even after its task is deleted.
+
+    Only the working set lives here. Tasks completed more than
+    `archive_after_days` ago are moved out by archive_completed() into
+    gzipped monthly segments (see archive.py), which are only opened when
+    someone asks for history.
+
+    Concurrency: readers share an in-process RW lock, mutations take it
+    exclusively. Several processes (app windows) can share the files: every
+    disk write holds an advisory lock on `<db>.lock` and first replays what
+    the others appended to the log (or reloads, if one of them compacted),
+    so no one's ops get overwritten. Each process leases blocks of ids from
+    the counter in the meta file, so ids stay unique across processes.
+
+    Every task carries a `version` that goes up with each update. Passing
+    `expected_version` to update() makes it a compare-and-set: it raises
+    ConflictError if the task moved on in this process, and if another
+    process changed the task before the write reached the disk, the update
+    is rolled back and listeners get a "conflict" event. Plain updates merge
+    field by field, last writer wins.
+    """
+
+    def __init__(self, db_file=DB_FILE, log_file=LOG_FILE, compact_every=COMPACT_EVERY,
+                 flush_window=FLUSH_WINDOW, meta_file=None, archive_dir=None,
+                 archive_after_days=ARCHIVE_AFTER_DAYS):
+        self.db_file = db_file
+        self.log_file = log_file
+        self.meta_file = meta_file or os.path.splitext(db_file)[0] + ".meta"
+        self.archive_dir = archive_dir or os.path.splitext(db_file)[0] + "_archive"
+        self.archive_after_days = archive_after_days  # None turns tiering off
+        self._archive = None
+        self.compact_every = compact_every
+        self.flush_window = flush_window
+        self._tasks = {}  # id -> record, oldest first
+        self._open = 0    # Number of not-completed tasks, kept up to date on every op
+        self._floor = 1   # No id below this was ever handed out
+        self._next_id = self._id_limit = 0  # Ids leased to this process: [next, limit)
+        self._id_lock = threading.Lock()
+        self._log = None
+        self._log_ops = 0
+        self._log_pos = 0      # Bytes of the log already in memory
+        self._generation = 0   # Bumped in the meta file by every compaction
+        self._lock = RWLock()             # In-memory state + journal
+        self._io_lock = threading.Lock()  # Log / snapshot files, one writer thread at a time
+        self._file_lock = FileLock(db_file + ".lock")  # ... and one process at a time
+        self._journal = []   # Ops not on disk yet, in order
+        self._pending = {}   # task id -> its op in the journal, for coalescing
+        self._wake = threading.Event()
+        self._closed = False
+        self._listeners = []  # callback(kind, task) after add / update / delete / reset / conflict
+        self._external = None  # external id -> task id, built on first bulk import
+        self._bulk = False
+        self._archiver = None
+        self._archiver_lock = threading.Lock()
+        self._load()
+        self._writer = threading.Thread(target=self._run_writer, daemon=True)
+        self._writer.start()
+
+    # --- Loading ---
+    @perf.timed("store.load", "store")
+    def _load(self):
+        with self._file_lock.hold():
+            disk = self._read_disk()
+            self._install(disk)
+            if disk["migrated"] or self._log_ops >= self.compact_every:
+                self._compact()
+
+    def _read_meta(self):
+        if os.path.exists(self.meta_file):
+            try:
+                with open(self.meta_file, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Task store: could not read {self.meta_file}: {e}")
+        return {}
+
+    def _read_disk(self):
+        # Caller holds the file lock. Snapshot + log as they are on disk.
+        meta = self._read_meta()
+        tasks = []
+        if os.path.exists(self.db_file):
+            try:
+                with perf.span("store.read_snapshot", "store"):
+                    with open(self.db_file, "r") as f:
+                        data = f.read()
+                with perf.span("store.parse_snapshot", "store"):
+                    tasks = json.loads(data)
+            except (OSError, ValueError) as e:
+                # Keep the bad file around instead of overwriting it with an empty list
+                keep = f"{self.db_file}.corrupt-{int(time.time())}"
+                print(f"Task store: could not read {self.db_file} ({e}); moved it to {keep}")
+                os.replace(self.db_file, keep)
+                tasks = []
+        indexed, floor, migrated = self._ingest(tasks, meta.get("next_id", 1))
+
+        with perf.span("store.replay_log", "store"):
+            ops, log_pos = self._read_log(0)
+            for op in ops:
+                self._apply(op, indexed)
+                if op.get('op') == 'add':
+                    floor = max(floor, op['task']['id'] + 1)
+        return {"tasks": indexed, "floor": floor, "migrated": migrated, "log_ops": len(ops),
+                "log_pos": log_pos, "generation": meta.get("generation", 0)}
+
+    def _install(self, disk):
+        self._tasks = disk["tasks"]
+        self._floor = max(self._floor, disk["floor"])
+        self._log_ops = disk["log_ops"]
+        self._log_pos = disk["log_pos"]
+        self._generation = disk["generation"]
+        self._recount()
+
+    def _read_log(self, pos):
+        # Caller holds the file lock. Complete ops after byte `pos`, and where
+        # they end. A half-written tail from a crash is cut off, so the next
+        # append doesn't glue onto it.
+        ops = []
+        if not os.path.exists(self.log_file):
+            return ops, 0
+        with open(self.log_file, "rb") as f:
+            f.seek(pos)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    ops.append(json.loads(line))
+                except ValueError:
+                    break
+                pos += len(line)
+        if os.path.getsize(self.log_file) > pos:
+            with open(self.log_file, "r+b") as f:
+                f.truncate(pos)
+        return ops, pos
+
+    def _ingest(self, tasks, floor):
+        # Builds an index from a newest-first list. Files written before the
+        # counter existed used the add time in seconds as the id, so tasks
+        # added in the same second share one; the oldest keeps it and the
+        # others get fresh ids. Returns (index, next free id, any id changed).
+        indexed = {}
+        ids = [t['id'] for t in tasks if isinstance(t.get('id'), int)]
+        floor = max([floor] + [i + 1 for i in ids])
+        changed = False
+        for t in reversed(tasks):
+            if not isinstance(t.get('id'), int) or t['id'] in indexed:
+                old = t.get('id')
+                t['id'] = floor
+                floor += 1
+                print(f"Task store: task {old!r} ({t.get('title')!r}) now has id {t['id']}")
+                changed = True
+            indexed[t['id']] = t
+        return indexed, floor, changed
+
+    def _recount(self):
+        self._open = sum(1 for t in self._tasks.values() if not t.get('completed', False))
+
+    def _take_ids(self, count):
+        """A range of `count` fresh ids, leased from the shared counter in blocks."""
+        with self._id_lock:
+            if self._id_limit - self._next_id < count:
+                size = max(count, ID_BLOCK)
+                with self._file_lock.hold():
+                    meta = self._read_meta()
+                    start = max(meta.get("next_id", 1), self._floor)
+                    meta["next_id"] = start + size
+                    atomic_write(self.meta_file, json.dumps(meta))
+                self._next_id, self._id_limit = start, start + size
+                self._floor = max(self._floor, start + size)
+            ids = range(self._next_id, self._next_id + count)
+            self._next_id += count
+            return ids
+
+    # --- Log ---
+    @staticmethod
+    def _apply(op, tasks):
+        kind = op.get('op')
+        if kind == 'add':
+            tasks[op['task']['id']] = op['task']
+        elif kind == 'update':
+            task = tasks.get(op['id'])
+            if task is not None:
+                task.update(op['fields'])
+                task['version'] = op.get('version', task.get('version', 0) + 1)
+        elif kind == 'delete':
+            tasks.pop(op['id'], None)
+
+    @staticmethod
+    def _op_id(op):
+        return op['task']['id'] if op['op'] == 'add' else op['id']
+
+    def _append(self, op):
+        # Caller holds the write lock. Nothing touches the disk here.
+        task_id = self._op_id(op)
+        queued = self._pending.get(task_id)
+        if queued is not None and op['op'] == 'update':
+            # Fold into the op already waiting for this task
+            if queued['op'] == 'add':
+                queued['task'] = dict(queued['task'], **op['fields'])
+                queued['task']['version'] = op['version']
+            else:
+                queued['fields'].update(op['fields'])
+                queued['version'] = op['version']
+                queued['_strict'] = queued.get('_strict') or op.get('_strict')
+                for field, value in op.get('_undo', {}).items():
+                    queued['_undo'].setdefault(field, value)
+        else:
+            if op['op'] == 'add':
+                op = {"op": "add", "task": dict(op['task'])}
+            elif op['op'] == 'update':
+                op = dict(op, fields=dict(op['fields']))
+            self._journal.append(op)
+            self._pending[task_id] = op
+        self._wake.set()
+
+    def _run_writer(self):
+        while not self._closed:
+            # Wake up for our own mutations, or now and then to pick up what
+            # other windows wrote
+            if self._wake.wait(SYNC_EVERY):
+                time.sleep(self.flush_window)  # Let the rest of the burst arrive
+            if self._closed:
+                break
+            try:
+                if self._wake.is_set():
+                    self.flush()
+                else:
+                    self.refresh()
+            except OSError as e:
+                print(f"Task store: write failed, will retry: {e}")
+                time.sleep(1)
+
+    def _disk_changed(self):
+        # Cheap check before taking any lock: did another process write?
+        try:
+            size = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
+        except OSError:
+            return True
+        return size != self._log_pos or self._read_meta().get("generation", 0) != self._generation
+
+    def refresh(self):
+        """Picks up changes other processes made to the files."""
+        if not self._disk_changed():
+            return
+        self.flush(force=True)
+
+    def _catch_up(self, batch):
+        """
+        Caller holds the io lock and the file lock, and has taken `batch` off
+        the journal. Folds whatever other processes wrote since we last looked
+        into memory, with our unwritten ops (batch + journal) re-applied on
+        top. Returns (what is left of batch, events for the listeners).
+        """
+        meta = self._read_meta()
+        if meta.get("generation", 0) != self._generation:
+            # Someone compacted: start over from their snapshot
+            disk = self._read_disk()
+            with self._lock.write():
+                self._install(disk)
+                batch, events = self._rebase(batch, None)
+                self._recount()
+            return batch, events + [("reset", None)]
+
+        ops, pos = self._read_log(self._log_pos)
+        if not ops:
+            self._log_pos = pos
+            return batch, []
+        with self._lock.write():
+            batch, events = self._rebase(batch, ops)
+            self._recount()
+        self._log_pos = pos
+        self._log_ops += len(ops)
+        return batch, events
+
+    def _rebase(self, batch, foreign):
+        # Caller holds the write lock. Applies `foreign` ops to memory (None:
+        # memory was just reloaded from disk), then replays our own unwritten
+        # ops on top, checking each update against the version it was made on.
+        events = []
+        touched = None
+        if foreign is not None:
+            touched = {}
+            for op in foreign:
+                task_id = self._op_id(op)
+                touched.setdefault(task_id, task_id in self._tasks)
+                self._apply(op, self._tasks)
+            changed = {}
+            for op in foreign:
+                if op.get('op') == 'update':
+                    changed.setdefault(op['id'], set()).update(op['fields'])
+
+        dropped = []
+        chained = {}  # task id -> (version our previous op was made as, what it became)
+        for op in batch + self._journal:
+            task_id = self._op_id(op)
+            if touched is not None and task_id not in touched:
+                continue  # Nobody else touched it; memory already has our change
+            if op['op'] == 'add':
+                if touched is None:
+                    self._tasks[task_id] = dict(op['task'])
+                continue
+            if op['op'] == 'delete':
+                self._tasks.pop(task_id, None)
+                continue
+            task = self._tasks.get(task_id)
+            made_as = op['version']
+            prev = chained.get(task_id)
+            if prev is not None and op['_base'] == prev[0]:
+                op['_base'] = prev[1]  # Follows our own earlier op, which got renumbered
+            if task is not None and task.get('version', 0) == op['_base']:
+                task.update(op['fields'])
+                task['version'] = op['version']
+            elif task is not None and not op.get('_strict'):
+                # Someone else changed it too: last writer wins, field by field
+                task.update(op['fields'])
+                op['_base'] = task.get('version', 0)
+                task['version'] = op['version'] = op['_base'] + 1
+            else:
+                # Deleted elsewhere, or a compare-and-set that lost the race
+                if task is not None and touched is not None:
+                    for field, value in op['_undo'].items():
+                        if field in changed.get(task_id, ()):
+                            continue  # Their value is already in place
+                        if value is _MISSING:
+                            task.pop(field, None)
+                        else:
+                            task[field] = value
+                dropped.append(op)
+                events.append(("conflict", dict(task) if task is not None else {"id": task_id}))
+                continue
+            chained[task_id] = (made_as, op['version'])
+
+        if dropped:
+            gone = set(map(id, dropped))
+            batch = [op for op in batch if id(op) not in gone]
+            self._journal = [op for op in self._journal if id(op) not in gone]
+            self._pending = {k: op for k, op in self._pending.items() if id(op) not in gone}
+        for task_id, existed in (touched or {}).items():
+            task = self._tasks.get(task_id)
+            if task is None:
+                events.append(("delete", {"id": task_id}))
+            else:
+                events.append(("update" if existed else "add", dict(task)))
+        return batch, events
+
+    @perf.timed("store.flush", "store")
+    def flush(self, force=False):
+        """Writes every journaled op to disk. Safe to call from any thread."""
+        with self._io_lock:
+            with self._lock.write():
+                self._wake.clear()
+                batch, self._journal, self._pending = self._journal, [], {}
+            if not batch and not force:
+                return
+            events = []
+            try:
+                with self._file_lock.hold():
+                    batch, events = self._catch_up(batch)
+                    self._write(batch)
+            except OSError:
+                with self._lock.write():
+                    # Put the batch back in front of anything queued since
+                    self._journal = batch + self._journal
+                    for op in batch:
+                        self._pending.setdefault(self._op_id(op), op)
+                    self._wake.set()
+                raise
+        for kind, task in events:
+            self._notify(kind, task)
+
+    def _write(self, batch):
+        # Caller holds the io lock and the file lock, and is caught up
+        if not batch:
+            return
+        if not self._bulk and self._log_ops + len(batch) >= self.compact_every:
+            self._compact()
+        else:
+            self._write_log(batch)
+
+    @perf.timed("store.write_log", "store")
+    def _write_log(self, batch):
+        if self._log is None:
+            self._log = open(self.log_file, "a")
+        self._log.write("".join(
+            json.dumps({k: v for k, v in op.items() if not k.startswith("_")}) + "\n" for op in batch))
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._log_ops += len(batch)
+        self._log_pos = os.fstat(self._log.fileno()).st_size
+
+    def compact(self):
+        """Folds the log into the snapshot now."""
+        with self._io_lock:
+            with self._lock.write():
+                self._wake.clear()
+                batch, self._journal, self._pending = self._journal, [], {}
+            with self._file_lock.hold():
+                _, events = self._catch_up(batch)
+                self._compact()
+        for kind, task in events:
+            self._notify(kind, task)
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """
+        For imports: batches go to the log as they are flushed, but the
+        snapshot is rewritten at most once, when the block ends.
+        """
+        self._bulk = True
+        try:
+            yield self
+        finally:
+            self._bulk = False
+            self.flush()
+            if self._log_ops >= self.compact_every:
+                self.compact()
+
+    @perf.timed("store.compact", "store")
+    def _compact(self):
+        # Caller holds the file lock (and the io lock), and memory is caught
+        # up, so the snapshot has everyone's ops
+        with self._lock.read():
+            snapshot = [dict(t) for t in reversed(self._tasks.values())]
+        meta = self._read_meta()
+        meta["next_id"] = max(meta.get("next_id", 1), self._floor)
+        meta["generation"] = meta.get("generation", 0) + 1
+        # Counter first: if we crash before the snapshot lands, the old
+        # snapshot + log still can't push it back below an id in use
+        atomic_write(self.meta_file, json.dumps(meta))
+        atomic_write(self.db_file, json.JSONEncoder(indent=4).iterencode(snapshot))
+        # Ops are idempotent by id, so a crash between these two steps just
+        # replays a few ops onto a snapshot that already contains them.
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        open(self.log_file, "w").close()
+        self._log_ops = 0
+        self._log_pos = 0
+        self._generation = meta["generation"]
+
+    # --- Listeners ---
+    def subscribe(self, callback):
+        with self._lock.write():
+            self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock.write():
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self, kind, task):
+        # Called outside the lock, so a listener may read the store
+        for callback in list(self._listeners):
+            try:
+                callback(kind, task)
+            except Exception as e:
+                print(f"Task store listener error: {e}")
+
+    # --- Public API ---
+    def all(self, include_completed=False):
+        with self._lock.read():
+            tasks = reversed(list(self._tasks.values()))
+            return [dict(t) for t in tasks if include_completed or not t.get('completed', False)]
+
+    @perf.timed("store.page", "store")
+    def page(self, offset, limit, include_completed=False, completed_only=False):
+        """Newest-first slice of the tasks, without copying the rest."""
+        with self._lock.read():
+            tasks = reversed(self._tasks.values())
+            if completed_only:
+                tasks = (t for t in tasks if t.get('completed', False))
+            elif not include_completed:
+                tasks = (t for t in tasks if not t.get('completed', False))
+            return [dict(t) for t in islice(tasks, offset, offset + limit)]
+
+    def count(self, include_completed=False, completed_only=False):
+        with self._lock.read():
+            if completed_only:
+                return len(self._tasks) - self._open
+            return len(self._tasks) if include_completed else self._open
+
+    def get(self, task_id):
+        with self._lock.read():
+            task = self._tasks.get(task_id)
+            return dict(task) if task is not None else None
+
+    def add(self, title):
+        task_id = self._take_ids(1)[0]
+        with self._lock.write():
+            new_task = {
+                "id": task_id,
+                "title": title,
+                "type": "manual", # To distinguish from GitHub
+                "completed": False,
+                "created_at": str(datetime.datetime.now()),
+                "version": 1
+            }
+            self._tasks[new_task['id']] = new_task
+            self._open += 1
+            self._append({"op": "add", "task": new_task})
+            new_task = dict(new_task)
+        self._notify("add", dict(new_task))
+        return new_task
+
+    def update(self, task_id, expected_version=None, **fields):
+        """
+        Sets fields on a task. With `expected_version`, only if the task is
+        still at that version (raises ConflictError otherwise).
+        """
+        with self._lock.write():
+            task = self._tasks.get(task_id)
+            if task is None:
+                return False
+            if expected_version is not None and expected_version != task.get('version', 0):
+                raise ConflictError(f"task {task_id} is at version {task.get('version', 0)}, "
+                                    f"not {expected_version}")
+            self._append(self._set_fields(task, fields, strict=expected_version is not None))
+            task = dict(task)
+        self._notify("update", task)
+        return True
+
+    def _set_fields(self, task, fields, strict=False):
+        # Caller holds the write lock. Updates the record, returns its op.
+        base = task.get('version', 0)
+        if 'completed' in fields and bool(fields['completed']) != bool(task.get('completed', False)):
+            self._open += -1 if fields['completed'] else 1
+        undo = {field: task.get(field, _MISSING) for field in fields}
+        task.update(fields)
+        task['version'] = base + 1
+        return {"op": "update", "id": task['id'], "fields": dict(fields), "version": base + 1,
+                "_base": base, "_undo": undo, "_strict": strict}
+
+    def modify(self, task_id, change):
+        """
+        Read-modify-write that holds across processes: `change(task)` gets the
+        current task and returns the fields to set. It runs under the file
+        lock after catching up, and the result is on disk when this returns,
+        so nobody can slip in between (counters, appends to lists, ...).
+        Returns the updated task, or None if there is no such task.
+        """
+        with self._io_lock:
+            with self._lock.write():
+                self._wake.clear()
+                batch, self._journal, self._pending = self._journal, [], {}
+            with self._file_lock.hold():
+                batch, events = self._catch_up(batch)
+                with self._lock.write():
+                    task = self._tasks.get(task_id)
+                    if task is not None:
+                        batch.append(self._set_fields(task, change(dict(task))))
+                        task = dict(task)
+                self._write(batch)
+        for kind, changed in events:
+            self._notify(kind, changed)
+        if task is not None:
+            self._notify("update", task)
+        return task
+
+    def add_many(self, records):
+        """
+        Inserts a batch of imported tasks and flushes it as one write.
+        Records carrying an `external_id` already in the store (or earlier in
+        the batch) are skipped. Returns (added, skipped).
+        """
+        records = list(records)
+        ids = iter(self._take_ids(len(records)))  # One lease for the whole batch
+        added = []
+        skipped = 0
+        with self._lock.write():
+            if self._external is None:
+                # Archived tasks count too, or re-importing a backlog would
+                # bring back everything that was archived
+                self._external = {t['external_id']: t['id'] for t in self.iter_archived()
+                                  if t.get('external_id') is not None}
+                self._external.update((t['external_id'], t['id']) for t in self._tasks.values()
+                                      if t.get('external_id') is not None)
+            for record in records:
+                external_id = record.get('external_id')
+                if external_id is not None and external_id in self._external:
+                    skipped += 1
+                    continue
+                task = {
+                    "id": next(ids),
+                    "title": record['title'],
+                    "type": record.get('type') or "manual",
+                    "completed": bool(record.get('completed', False)),
+                    "created_at": record.get('created_at') or str(datetime.datetime.now()),
+                    "version": 1
+                }
+                for field in ('completed_at', 'external_id'):
+                    if record.get(field) is not None:
+                        task[field] = record[field]
+                if external_id is not None:
+                    self._external[external_id] = task['id']
+                self._tasks[task['id']] = task
+                if not task['completed']:
+                    self._open += 1
+                self._journal.append({"op": "add", "task": dict(task)})
+                added.append(task)
+            # Listener copies only when someone listens; the CLI has nobody
+            notify = [dict(t) for t in added] if self._listeners else []
+        self.flush()
+        for task in notify:
+            self._notify("add", task)
+        return len(added), skipped
+
+    def iter_tasks(self, include_completed=True, chunk=1000):
+        """Oldest-first copies of the tasks, a chunk at a time, for exports."""
+        with self._lock.read():
+            ids = list(self._tasks)
+        for i in range(0, len(ids), chunk):
+            with self._lock.read():
+                tasks = [self._tasks.get(task_id) for task_id in ids[i:i + chunk]]
+                tasks = [dict(t) for t in tasks if t is not None]
+            for task in tasks:
+                if include_completed or not task.get('completed', False):
+                    yield task
+
+    # --- Archive ---
+    @property
+    def archive(self):
+        if self._archive is None:
+            from src.services.archive import TaskArchive
+            self._archive = TaskArchive(self.archive_dir)
+        return self._archive
+
+    @perf.timed("store.archive", "store")
+    def archive_completed(self, older_than_days=None):
+        """
+        Moves tasks completed more than `older_than_days` (default:
+        archive_after_days) days ago to the archive. Returns how many moved.
+        """
+        days = self.archive_after_days if older_than_days is None else older_than_days
+        if days is None:
+            return 0
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
+        moved = []
+        with self._io_lock:
+            with self._lock.write():
+                self._wake.clear()
+                batch, self._journal, self._pending = self._journal, [], {}
+            with self._file_lock.hold():
+                _, events = self._catch_up(batch)  # The compaction below writes the batch
+                with self._lock.read():
+                    old = [dict(t) for t in self._tasks.values() if t.get('completed', False)
+                           and (t.get('completed_at') or t.get('created_at') or "9999")[:10] < cutoff]
+                if old:
+                    # Archive first, then drop from the hot file: a crash in between
+                    # leaves a task in both, and readers skip archived ids that are hot
+                    self.archive.add(old)
+                    with self._lock.write():
+                        for t in old:
+                            if self._tasks.get(t['id'], {}).get('completed', False):  # Not reopened meanwhile
+                                moved.append(self._tasks.pop(t['id']))
+                        self._recount()
+                if old or batch:
+                    self._compact()
+        for kind, task in events:
+            self._notify(kind, task)
+        for task in moved:
+            self._notify("archive", task)
+        return len(moved)
+
+    def start_archiver(self):
+        """Runs archive_completed() once on the I/O pool (once per store, however many sessions start it)."""
+        from src.services.io_pool import get_io_pool
+        with self._archiver_lock:
+            if self._archiver is None:
+                self._archiver = get_io_pool().submit(self.archive_completed)
+
+    def iter_archived(self, month=None, newest_first=True):
+        """Archived tasks by month (or just `month`). Opens segments lazily."""
+        tasks = self.archive.iter_month(month) if month else self.archive.iter_tasks(newest_first)
+        for task in tasks:
+            if task['id'] not in self._tasks:  # Reopened or not dropped yet: the hot copy wins
+                yield task
+
+    def delete(self, task_id):
+        with self._lock.write():
+            task = self._tasks.pop(task_id, None)
+            if task is None:
+                return False
+            if self._external is not None and task.get('external_id') is not None:
+                self._external.pop(task['external_id'], None)
+            if not task.get('completed', False):
+                self._open -= 1
+            self._append({"op": "delete", "id": task_id})
+        self._notify("delete", task)
+        return True
+
+    def replace_all(self, tasks):
+        with self._io_lock:
+            with self._file_lock.hold():
+                with self._lock.write():
+                    self._tasks, floor, _ = self._ingest([dict(t) for t in tasks], self._floor)
+                    self._floor = max(self._floor, floor)
+                    self._recount()
+                    self._external = None
+                    # The new snapshot supersedes anything still journaled
+                    self._journal, self._pending = [], {}
+                self._compact()
+        self._notify("reset", None)
+
+    def close(self):
+        self.flush()
+        self._closed = True
+        self._wake.set()
+        with self._io_lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+        self._file_lock.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    # One store per process, shared by every session (in web mode, every
+    # browser tab); sessions connecting at once must not each open their own
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                store = TaskStore()
+                atexit.register(store.flush)
+                _store = store
+    return _store
+
+def flush_tasks():
+    # Nothing to flush if the store was never opened
+    if _store is not None:
+        _store.flush()
+
+def get_local_tasks(include_completed=False, include_archived=False):
+    tasks = get_store().all(include_completed=include_completed)
+    if include_completed and include_archived:
+        tasks.extend(get_store().iter_archived())
     return tasks
 
-def mark_task_complete(task_id):
-    tasks = get_local_tasks()
-    for t in tasks:
-        if t['id'] == task_id:
-            t['completed'] = True
-    save_tasks(tasks)
+def get_archived_tasks(month=None):
+    return list(get_store().iter_archived(month))
+
+def get_local_tasks_page(offset, limit, include_completed=False, completed_only=False):
+    return get_store().page(offset, limit, include_completed, completed_only)
+
+def count_local_tasks(include_completed=False, completed_only=False):
+    return get_store().count(include_completed, completed_only)
+
+def add_local_task(title):
+    # Returns the open tasks, like it always has; get_store().add() returns
+    # just the new task and skips building the list
+    get_store().add(title)
+    return get_local_tasks()
+
+def delete_local_task(task_id):
+    return get_store().delete(task_id)
+
+def mark_task_complete(task_id, is_complete=True, focus_seconds=0):
+    # Completion events also feed the stats rollups (see stats.py)
+    from src.services.stats import get_stats
+
+    # Before the store changes: on the first run get_stats() backfills from
+    # the stored tasks, and this change must not be in there as well
+    stats = get_stats()
+    store = get_store()
+    task = store.get(task_id)
+    if task is None or bool(task.get('completed', False)) == bool(is_complete):
+        stats.record_focus(focus_seconds)  # Nothing to tick off, the time still counts
+        return
+    if is_complete:
+        now = datetime.datetime.now()
+        store.update(task_id, completed=True, completed_at=now.isoformat())
+        stats.record_completion(task_id, task['title'], focus_seconds, at=now)
+    else:
+        store.update(task_id, completed=False, completed_at=None)
+        if task.get('completed_at'):
+            stats.record_reopen(task_id, task['completed_at'])
 
 def save_tasks(tasks):
-    with open(DB_FILE, "w") as f:
-        json.dump(tasks, f, indent=4)
\ No newline at end of file
+    get_store().replace_all(tasks)
@@ -0,0 +1,195 @@
+import os
+import json
+import time
+import atexit
+import functools
+import threading
+import contextlib
+import collections
+
+MAX_EVENTS = 20000  # Ring buffer: the trace always holds the most recent events
+
+# Off by default: span() is then a shared no-op and timed() one flag check.
+# FLOWDECK_PERF=1 turns recording on at startup; FLOWDECK_TRACE=trace.json
+# does too and writes the trace there on exit. The debug overlay turns it on
+# while it is open.
+_enabled = False
+_events = collections.deque(maxlen=MAX_EVENTS)  # (ph, name, cat, start_ns, dur_ns, tid, args)
+_threads = {}  # native thread id -> name, for the trace viewer
+_local = threading.local()
+_origin = time.perf_counter_ns()
+_NULL = contextlib.nullcontext()
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+def enabled():
+    return _enabled
+
+def _tid():
+    tid = threading.get_native_id()
+    if tid not in _threads:
+        _threads[tid] = threading.current_thread().name
+    return tid
+
+def _record(ph, name, cat, start_ns, dur_ns, args):
+    if getattr(_local, "quiet", 0):
+        return
+    _events.append((ph, name, cat, start_ns, dur_ns, _tid(), args))
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _record("X", self.name, self.cat, self.start, end - self.start, self.args)
+        return False
+
+    def set(self, **args):
+        # Attach results found inside the span (row counts, bytes, ...)
+        self.args = dict(self.args or {}, **args)
+
+
+def span(name, cat="app", **args):
+    """
+    `with span("store.load"):` times the block. Spans on one thread nest in
+    the trace viewer by time, so wrap sub-steps in their own spans.
+    """
+    if not _enabled:
+        return _NULL
+    return _Span(name, cat, args or None)
+
+def timed(name=None, cat="app"):
+    """Decorator form of span(); the name defaults to the function's qualified name."""
+    def wrap(fn):
+        label = name or fn.__qualname__
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Span(label, cat, None):
+                return fn(*args, **kwargs)
+        return inner
+    return wrap
+
+def counter(name, **values):
+    """A counter sample (shown as a graph track in the trace viewer)."""
+    if _enabled:
+        _record("C", name, "counter", time.perf_counter_ns(), 0, values)
+
+@contextlib.contextmanager
+def quiet():
+    # Nothing recorded on this thread inside the block (the overlay's own redraws)
+    _local.quiet = getattr(_local, "quiet", 0) + 1
+    try:
+        yield
+    finally:
+        _local.quiet -= 1
+
+
+def recent(limit=20, cat=None):
+    """The last `limit` finished spans, newest first, as dicts."""
+    found = []
+    for ph, name, c, start, dur, tid, args in reversed(list(_events)):
+        if ph != "X" or (cat is not None and c != cat):
+            continue
+        found.append({"name": name, "cat": c, "ms": dur / 1e6, "args": args or {}})
+        if len(found) >= limit:
+            break
+    return found
+
+def clear():
+    _events.clear()
+
+
+# --- Page instrumentation ---
+def instrument_page(page):
+    """
+    Times every page.update() / control.update() of a page and counts the
+    controls and bytes each one sends. Bytes are measured by encoding the
+    commands once more, so only while recording is on.
+    """
+    if getattr(page, "_perf_instrumented", False):
+        return page
+    page._perf_instrumented = True
+    conn = page.connection
+    if conn is not None and not getattr(conn, "_perf_instrumented", False):
+        # One connection serves every session; wrap it once
+        conn._perf_instrumented = True
+        send_commands = conn.send_commands
+        def counted_send(session_id, commands):
+            if _enabled:
+                _count_commands(commands)
+            return send_commands(session_id, commands)
+        conn.send_commands = counted_send
+
+    update = page.update
+    def timed_update(*controls):
+        if not _enabled:
+            return update(*controls)
+        # did_mount() may update again inside an update: each level counts its own
+        outer, sent = getattr(_local, "sent", None), [0, 0]
+        _local.sent = sent
+        try:
+            with _Span("page.update", "render", None) as s:
+                update(*controls)
+                s.set(controls=sent[0], bytes=sent[1])
+        finally:
+            _local.sent = outer
+        counter("update", controls=sent[0], bytes=sent[1])
+    page.update = timed_update
+    return page
+
+def _count_commands(commands):
+    from flet.core.protocol import CommandEncoder
+
+    sent = getattr(_local, "sent", None)
+    if sent is None:
+        return  # page.add() and friends, outside a timed update
+    for command in commands:
+        # An "add" carries one sub-command per control it creates
+        sent[0] += len(command.commands) if command.name == "add" else 1
+    sent[1] += len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+
+
+# --- Export ---
+def trace_events():
+    """The buffer as Chrome trace-event dicts (chrome://tracing, ui.perfetto.dev)."""
+    pid = os.getpid()
+    out = [{"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": name}}
+           for tid, name in list(_threads.items())]
+    for ph, name, cat, start, dur, tid, args in list(_events):
+        event = {"ph": ph, "name": name, "cat": cat, "pid": pid, "tid": tid,
+                 "ts": (start - _origin) / 1000}
+        if ph == "X":
+            event["dur"] = dur / 1000
+        if args:
+            event["args"] = args
+        out.append(event)
+    return out
+
+def export_trace(path):
+    """Writes the recorded events to `path` in Chrome trace-event JSON. Returns the event count."""
+    from src.services.local_db import atomic_write
+
+    events = trace_events()
+    atomic_write(path, json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+    return len(events)
+
+
+if os.getenv("FLOWDECK_PERF") or os.getenv("FLOWDECK_TRACE"):
+    enable()
+    if os.getenv("FLOWDECK_TRACE"):
+        atexit.register(export_trace, os.getenv("FLOWDECK_TRACE"))
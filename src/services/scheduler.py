@@ -0,0 +1,84 @@
+import time
+import asyncio
+import threading
+import itertools
+
+
+class TickScheduler:
+    """
+    One asyncio task drives every periodic UI tick in the app (dashboard
+    clock, focus timer, ...), for every session on the event loop. Views
+    subscribe when they mount and unsubscribe when they unmount; when the
+    last one leaves the task is cancelled, so nothing keeps running for a
+    view that is gone. Subscribe and unsubscribe from the event loop.
+
+    Ticks are scheduled against time.monotonic() deadlines, so they don't
+    drift the way a `sleep(1)` loop does. Each callback gets the tick time and
+    returns the controls it changed (or nothing); those are pushed with a
+    single page.update(...) per page per tick.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._subs = {}
+        self._ids = itertools.count(1)
+        self._task = None
+
+    def subscribe(self, callback):
+        token = next(self._ids)
+        self._subs[token] = callback
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return token
+
+    def unsubscribe(self, token):
+        self._subs.pop(token, None)
+        if not self._subs and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        deadline = time.monotonic()
+        while True:
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            now = time.monotonic()
+            self.tick(now)
+            # Next deadline on the fixed grid; if we fell behind, skip the
+            # missed ticks instead of firing them in a burst
+            deadline += self.interval
+            if deadline <= now:
+                deadline = now + self.interval - (now - deadline) % self.interval
+
+    def tick(self, now):
+        callbacks = list(self._subs.values())
+
+        dirty = {}  # page -> changed controls
+        for callback in callbacks:
+            try:
+                changed = callback(now) or []
+            except Exception as e:
+                print(f"Tick error: {e}")
+                continue
+            for control in changed:
+                if control.page is not None:  # Skip controls no longer on a page
+                    dirty.setdefault(control.page, []).append(control)
+
+        for page, controls in dirty.items():
+            try:
+                page.update(*controls)
+            except Exception as e:
+                print(f"Tick update error: {e}")
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = TickScheduler()
+    return _scheduler
@@ -0,0 +1,277 @@
+import re
+import bisect
+import threading
+
+from src.services import perf
+
+WORD = re.compile(r"[a-z0-9]+")
+FUZZY_MIN = 4  # Shorter words only match exactly or by prefix; typos in "ui" are hopeless
+
+
+def tokenize(text):
+    return WORD.findall((text or "").lower())
+
+def _deletes(word):
+    # Every way to drop one letter. Two words within one edit (insert, delete,
+    # substitute, swap) share at least one of these, so they meet in the index.
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over local tasks and GitHub issues.
+
+    Documents are keyed like the dashboard rows, ("local", id) / ("issue", id),
+    and store the fields a row needs. Internally each one gets a small int
+    handle, handed out in increasing order, so postings are sets of ints and
+    "newest first" is just descending handles. Words from the title and repo
+    map to the handles that contain them; a sorted copy of the vocabulary
+    answers prefix queries with a bisect, and a one-letter-deletion table
+    answers typo-tolerant ones. put()/remove() only touch the words of that
+    one document, so adds, toggles and syncs never rebuild anything.
+
+    Query words are ANDed. Besides plain words a query can filter with
+    is:open, is:done, is:task, is:issue and repo:<name>.
+    """
+
+    def __init__(self):
+        self._handles = {}   # key -> handle
+        self._docs = {}      # handle -> doc
+        self._next = 0
+        self._words = {}     # handle -> words indexed for it
+        self._postings = {}  # word -> set of handles
+        self._vocab = []     # sorted words, for prefix lookups
+        self._variants = {}  # word or one-deletion variant -> set of words
+        self._done = set()   # handles of completed tasks
+        self._kind = {"local": set(), "issue": set()}
+        self._repos = {}     # lower-case repo name -> set of handles
+        self.version = 0     # Bumped on every change, for callers that cache results
+        self._lock = threading.Lock()
+
+    # --- Vocabulary ---
+    def _add_word(self, word, handle):
+        handles = self._postings.get(word)
+        if handles is None:
+            handles = self._postings[word] = set()
+            bisect.insort(self._vocab, word)
+            if len(word) >= FUZZY_MIN:
+                for variant in _deletes(word) | {word}:
+                    self._variants.setdefault(variant, set()).add(word)
+        handles.add(handle)
+
+    def _drop_word(self, word, handle):
+        handles = self._postings.get(word)
+        if handles is None:
+            return
+        handles.discard(handle)
+        if not handles:
+            del self._postings[word]
+            del self._vocab[bisect.bisect_left(self._vocab, word)]
+            if len(word) >= FUZZY_MIN:
+                for variant in _deletes(word) | {word}:
+                    words = self._variants.get(variant)
+                    if words is not None:
+                        words.discard(word)
+                        if not words:
+                            del self._variants[variant]
+
+    # --- Documents ---
+    def put(self, key, doc):
+        """Adds or re-indexes one document (a row dict with title / repo / completed)."""
+        words = set(tokenize(doc.get('title'))) | set(tokenize(doc.get('repo')))
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                handle = self._handles[key] = self._next
+                self._next += 1
+                self._kind[key[0]].add(handle)
+                old_doc = None
+            else:
+                old_doc = self._docs[handle]
+            old = self._words.get(handle, set())
+            for word in old - words:
+                self._drop_word(word, handle)
+            for word in words - old:
+                self._add_word(word, handle)
+            self._words[handle] = words
+
+            if old_doc is not None and old_doc.get('repo'):
+                self._repos.get(old_doc['repo'].lower(), set()).discard(handle)
+            if doc.get('repo'):
+                self._repos.setdefault(doc['repo'].lower(), set()).add(handle)
+            if doc.get('completed', False):
+                self._done.add(handle)
+            else:
+                self._done.discard(handle)
+            self._docs[handle] = doc
+            self.version += 1
+
+    def remove(self, key):
+        with self._lock:
+            handle = self._handles.pop(key, None)
+            if handle is None:
+                return
+            doc = self._docs.pop(handle)
+            for word in self._words.pop(handle, ()):
+                self._drop_word(word, handle)
+            self._kind[key[0]].discard(handle)
+            self._done.discard(handle)
+            if doc.get('repo'):
+                self._repos.get(doc['repo'].lower(), set()).discard(handle)
+            self.version += 1
+
+    def put_task(self, task):
+        self.put(("local", task['id']), {
+            "kind": "local", "id": task['id'], "title": task.get('title', ""),
+            "type": task.get('type', "manual"), "completed": task.get('completed', False),
+        })
+
+    def put_issue(self, issue):
+        self.put(("issue", issue['id']), {
+            "kind": "issue", "id": issue['id'], "title": issue.get('title', ""),
+            "repo": issue.get('repo', ""), "url": issue.get('url'), "node_id": issue.get('node_id'), "type": "issue",
+            "completed": False,
+        })
+
+    def on_task_change(self, kind, task):
+        # TaskStore listener
+        if kind == "reset":
+            self._reload_tasks()
+        elif kind in ("delete", "archive") or 'title' not in task:
+            self.remove(("local", task['id']))
+        else:
+            self.put_task(task)
+
+    def _reload_tasks(self):
+        from src.services.local_db import get_local_tasks
+        with self._lock:
+            stale = [key for key in self._handles if key[0] == "local"]
+        for key in stale:
+            self.remove(key)
+        for t in reversed(get_local_tasks(include_completed=True)):
+            self.put_task(t)
+
+    def sync_issues(self, issues):
+        """Brings the issue documents in line with a fresh issue list, touching only what changed."""
+        fresh = {i['id']: i for i in issues}
+        with self._lock:
+            indexed = {self._docs[h]['id']: self._docs[h] for h in self._kind["issue"]}
+        for issue_id in indexed.keys() - fresh.keys():
+            self.remove(("issue", issue_id))
+        for issue in reversed(issues):  # Oldest first in, so newest gets the highest handle
+            doc = indexed.get(issue['id'])
+            if doc is None or doc['title'] != issue.get('title', "") or doc['repo'] != issue.get('repo', ""):
+                self.put_issue(issue)
+
+    # --- Queries ---
+    def _matches(self, term):
+        # (handles matching the word exactly or as a prefix, handles matching only with a typo)
+        strong = set()
+        vocab = self._vocab
+        i = bisect.bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            strong |= self._postings[vocab[i]]
+            i += 1
+        weak = set()
+        if len(term) >= FUZZY_MIN:
+            for variant in _deletes(term) | {term}:
+                for word in self._variants.get(variant, ()):
+                    weak |= self._postings[word]
+            weak -= strong
+        return strong, weak
+
+    def _filter(self, name, value):
+        if name == "is":
+            if value == "done":
+                return self._done
+            if value == "open":
+                return self._docs.keys() - self._done  # Issues in the list are all open
+            if value in ("task", "issue"):
+                return self._kind["local" if value == "task" else "issue"]
+            return set()
+        if name == "repo":
+            handles = set()
+            for repo, repo_handles in self._repos.items():
+                if repo.startswith(value):
+                    handles |= repo_handles
+            return handles
+        return set()
+
+    def get(self, handle):
+        """The doc behind a handle from search(), or None if it was removed since."""
+        with self._lock:
+            doc = self._docs.get(handle)
+            return dict(doc) if doc is not None else None
+
+    @perf.timed("search.query", "search")
+    def search(self, query):
+        """
+        Handles of the matching docs: those where every word matched exactly
+        or by prefix first, then those that needed a typo. Within each group
+        local tasks come before issues, newest first, like the dashboard.
+        """
+        terms, filters = [], []
+        for part in (query or "").lower().split():
+            name, sep, value = part.partition(":")
+            if sep and name in ("is", "repo"):
+                filters.append((name, value))
+            else:
+                terms.extend(tokenize(part))
+
+        with self._lock:
+            strong = weak = None
+            for term in terms:
+                s, w = self._matches(term)
+                if strong is None:
+                    strong, weak = s, s | w
+                else:
+                    strong &= s
+                    weak &= s | w
+                if not weak:
+                    return []
+            for name, value in filters:
+                handles = self._filter(name, value)
+                if strong is None:
+                    strong, weak = set(handles), set(handles)
+                else:
+                    strong &= handles
+                    weak &= handles
+            if strong is None:
+                return self._ordered(set(self._docs))
+            weak -= strong
+            return self._ordered(strong) + self._ordered(weak)
+
+    def _ordered(self, handles):
+        local = handles & self._kind["local"]
+        return sorted(local, reverse=True) + sorted(handles - local, reverse=True)
+
+    def __len__(self):
+        return len(self._docs)
+
+_index = None
+_index_lock = threading.Lock()
+
+def get_search_index():
+    """
+    The app-wide index, built on first use from the task store and the cached
+    issues, and shared by every session. It follows the store and the app's
+    GitHub sync by itself.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from src.services.local_db import get_store
+                from src.services.github_sync import get_sync
+                with perf.span("search.build", "search"):
+                    index = SearchIndex()
+                    store = get_store()
+                    sync = get_sync()
+                    # Subscribe before reading, so nothing slips between
+                    store.subscribe(index.on_task_change)
+                    sync.subscribe(index.sync_issues)
+                    for task in reversed(store.all(include_completed=True)):
+                        index.put_task(task)
+                    index.sync_issues(sync.get_cached_issues())
+                _index = index
+    return _index
@@ -0,0 +1,224 @@
+import json
+import os
+import datetime
+import threading
+from src.services.local_db import atomic_write
+from src.services import perf
+
+STATS_FILE = "my_stats.json"   # Rollup snapshot
+EVENTS_FILE = "my_stats.log"   # Append-only completion events
+COMPACT_EVERY = 200
+RECENT_DAYS = 7                # Days whose individual wins we keep around
+
+
+def _day(at):
+    return at.strftime("%Y-%m-%d")
+
+def _week(at):
+    year, week, _ = at.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class StatsStore:
+    """
+    Rolling per-day and per-week aggregates, updated as completion events
+    come in rather than recomputed from every task. Events are appended to a
+    log and folded into the rollup snapshot every `compact_every` events, the
+    same way TaskStore handles tasks.
+
+    A day row looks like {"completed": 3, "focus_seconds": 4500}; the last
+    RECENT_DAYS days also keep their individual wins for the debrief list.
+
+    `backfill` returns the tasks to seed a brand new stats file from (the
+    completed ones count on their completed_at day), so history from before
+    the stats existed isn't lost. It runs once: after that the file exists.
+    """
+
+    def __init__(self, stats_file=STATS_FILE, events_file=EVENTS_FILE, compact_every=COMPACT_EVERY,
+                 backfill=None):
+        self.stats_file = stats_file
+        self.events_file = events_file
+        self.compact_every = compact_every
+        self.days = {}
+        self.weeks = {}
+        self.wins = {}  # day -> [win, ...], recent days only
+        self._sorted_days = None
+        self.seq = 0    # Last event folded in; lets a replay skip what the snapshot has
+        self._log = None
+        self._log_events = 0
+        self._lock = threading.Lock()
+        self._load(backfill)
+
+    # --- Loading ---
+    def _load(self, backfill=None):
+        if backfill is not None and not os.path.exists(self.stats_file) and not os.path.exists(self.events_file):
+            self._backfill(backfill())
+            self._compact()
+            return
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, "r") as f:
+                    data = json.load(f)
+                self.days = data.get("days", {})
+                self.weeks = data.get("weeks", {})
+                self.wins = data.get("wins", {})
+                self.seq = data.get("seq", 0)
+            except (OSError, ValueError) as e:
+                print(f"Stats: could not read {self.stats_file}: {e}")
+
+        torn = False
+        if os.path.exists(self.events_file):
+            with open(self.events_file, "r") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        torn = True  # Half-written tail from a crash, drop it
+                        break
+                    if event["seq"] <= self.seq:
+                        continue  # Already in the snapshot (crash mid-compaction)
+                    self._apply(event)
+                    self._log_events += 1
+
+        if torn or self._log_events >= self.compact_every:
+            self._compact()
+
+    @perf.timed("stats.backfill", "store")
+    def _backfill(self, tasks):
+        # Completions from before the stats file: no focus time on record for them
+        for task in tasks:
+            if not task.get('completed', False):
+                continue
+            try:
+                at = datetime.datetime.fromisoformat(task.get('completed_at') or task['created_at'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._bump(at, 1, 0)
+            self.wins.setdefault(_day(at), []).append({
+                "id": task.get('id'), "title": task.get('title', ""), "focus_seconds": 0, "at": at.isoformat(),
+            })
+
+    # --- Events ---
+    def _bump(self, at, completed, focus_seconds):
+        for table, key in ((self.days, _day(at)), (self.weeks, _week(at))):
+            row = table.setdefault(key, {"completed": 0, "focus_seconds": 0})
+            row["completed"] += completed
+            row["focus_seconds"] += focus_seconds
+        self._sorted_days = None
+
+    def _apply(self, event):
+        self.seq = event["seq"]
+        at = datetime.datetime.fromisoformat(event["at"])
+        if event["type"] == "complete":
+            self._bump(at, 1, event.get("focus_seconds", 0))
+            self.wins.setdefault(_day(at), []).append({
+                "id": event.get("task_id"),
+                "title": event["title"],
+                "focus_seconds": event.get("focus_seconds", 0),
+                "at": event["at"],
+            })
+        elif event["type"] == "focus":
+            # Time spent without finishing the task still counts as focus
+            self._bump(at, 0, event["focus_seconds"])
+        elif event["type"] == "reopen":
+            # Un-count the completion on the day it happened; the focus time
+            # was really spent, so that stays
+            done_at = datetime.datetime.fromisoformat(event["completed_at"])
+            self._bump(done_at, -1, 0)
+            day_wins = self.wins.get(_day(done_at), [])
+            self.wins[_day(done_at)] = [w for w in day_wins if w["id"] != event.get("task_id")]
+
+    @perf.timed("stats.append", "store")
+    def _append(self, event):
+        event["seq"] = self.seq + 1
+        self._apply(event)
+        if self._log is None:
+            self._log = open(self.events_file, "a")
+        self._log.write(json.dumps(event) + "\n")
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._log_events += 1
+        if self._log_events >= self.compact_every:
+            self._compact()
+
+    @perf.timed("stats.compact", "store")
+    def _compact(self):
+        cutoff = _day(datetime.datetime.now() - datetime.timedelta(days=RECENT_DAYS))
+        self.wins = {day: w for day, w in self.wins.items() if day > cutoff}
+        data = {"days": self.days, "weeks": self.weeks, "wins": self.wins, "seq": self.seq}
+        atomic_write(self.stats_file, json.dumps(data))
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        open(self.events_file, "w").close()
+        self._log_events = 0
+
+    # --- Public API ---
+    def record_completion(self, task_id, title, focus_seconds=0, at=None):
+        at = at or datetime.datetime.now()
+        with self._lock:
+            self._append({"type": "complete", "task_id": task_id, "title": title,
+                          "focus_seconds": int(focus_seconds), "at": at.isoformat()})
+
+    def record_focus(self, focus_seconds, at=None):
+        if focus_seconds <= 0:
+            return
+        at = at or datetime.datetime.now()
+        with self._lock:
+            self._append({"type": "focus", "focus_seconds": int(focus_seconds), "at": at.isoformat()})
+
+    def record_reopen(self, task_id, completed_at, at=None):
+        at = at or datetime.datetime.now()
+        with self._lock:
+            self._append({"type": "reopen", "task_id": task_id,
+                          "completed_at": completed_at, "at": at.isoformat()})
+
+    def day(self, at=None):
+        """Aggregates (and wins, for recent days) of one day. O(1)."""
+        key = _day(at or datetime.datetime.now())
+        with self._lock:
+            row = dict(self.days.get(key, {"completed": 0, "focus_seconds": 0}))
+            row["date"] = key
+            row["wins"] = list(self.wins.get(key, []))
+            return row
+
+    def week(self, at=None):
+        key = _week(at or datetime.datetime.now())
+        with self._lock:
+            row = dict(self.weeks.get(key, {"completed": 0, "focus_seconds": 0}))
+            row["week"] = key
+            return row
+
+    def history(self, offset, limit, before=None):
+        """Day rows, newest first, for days before `before` (default: today)."""
+        before = before or _day(datetime.datetime.now())
+        with self._lock:
+            if self._sorted_days is None:
+                self._sorted_days = sorted(self.days, reverse=True)
+            keys = [d for d in self._sorted_days if d < before][offset:offset + limit]
+            return [dict(self.days[d], date=d) for d in keys]
+
+    def history_count(self, before=None):
+        before = before or _day(datetime.datetime.now())
+        with self._lock:
+            return sum(1 for d in self.days if d < before)
+
+
+def _stored_tasks():
+    # Working set and archive, for the first-run backfill
+    import itertools
+    from src.services.local_db import get_store
+    store = get_store()
+    return itertools.chain(store.iter_tasks(include_completed=True), store.iter_archived())
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+def get_stats():
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = StatsStore(backfill=_stored_tasks)
+    return _stats
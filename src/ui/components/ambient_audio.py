@@ -0,0 +1,92 @@
+import time
+import asyncio
+import weakref
+import flet as ft
+from src.services.ambient_mixer import get_ambient_mixer, LAYERS, LOOP_SECONDS
+from src.services.io_pool import run_io
+
+DEBOUNCE = 0.2  # Seconds a slider must rest before the mix follows it
+
+
+class AmbientPlayer:
+    """
+    The ambient sounds of one page: a single looping ft.Audio playing the
+    mix of the enabled layers (see AmbientMixer), however many are on. The
+    player joins page.overlay the first time a sound is switched on.
+
+    Toggles apply at once; slider moves are debounced, so a drag becomes one
+    volume change (and at most one re-mix) when it settles. When the mix
+    changes under a playing loop, the new one is seeked to the same spot.
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.enabled = set()
+        self.volumes = {name: 50 for name in LAYERS}
+        self.audio = None
+        self.started = None  # time.monotonic() at loop position 0, while playing
+        self._pending = None
+        self._apply_lock = asyncio.Lock()
+
+    async def set_layer(self, name, on):
+        (self.enabled.add if on else self.enabled.discard)(name)
+        await self.apply()
+
+    def set_volume(self, name, value):
+        self.volumes[name] = value
+        if self._pending is not None:
+            self._pending.cancel()
+        loop = asyncio.get_running_loop()
+        self._pending = loop.call_later(DEBOUNCE, self.page.run_task, self.apply)
+
+    async def apply(self):
+        self._pending = None
+        async with self._apply_lock:  # A slow re-mix finishes before the next one starts
+            src, volume = await run_io(get_ambient_mixer().mix,
+                                       {name: self.volumes[name] for name in self.enabled})
+            if src is None:
+                self.pause()
+                return
+            if self.audio is None:
+                self.audio = ft.Audio(src=src, volume=volume, autoplay=False, release_mode="loop")
+                self.page.overlay.append(self.audio)
+                self.page.update()
+                self.play(0)
+                return
+            new_mix = src != self.audio.src
+            if new_mix or volume != self.audio.volume:
+                # Just the volume when only the loudest layer moved
+                self.audio.src = src
+                self.audio.volume = volume
+                self.audio.update()
+            if self.started is None:
+                self.play(0)
+            elif new_mix:
+                self.play(self.position())  # Same spot in the loop, new balance
+
+    def position(self):
+        # Where the loop is now, without asking the client
+        if self.started is None:
+            return 0
+        return int((time.monotonic() - self.started) * 1000) % (LOOP_SECONDS * 1000)
+
+    def play(self, position):
+        self.audio.play()
+        if position:
+            self.audio.seek(position)
+        self.started = time.monotonic() - position / 1000
+
+    def pause(self):
+        if self.audio is not None and self.started is not None:
+            self.audio.pause()
+        self.started = None
+
+
+# One player per page, added to page.overlay exactly once
+_players = weakref.WeakKeyDictionary()
+
+def get_ambient_player(page):
+    player = _players.get(page)
+    if player is None:
+        player = _players[page] = AmbientPlayer(page)
+    return player
@@ -1,39 +1,101 @@
+import asyncio
+import weakref
 import flet as ft
 
+BLUR = ft.Blur(10, 10, ft.BlurTileMode.MIRROR)
+BLUR_LIMIT = 12         # Cards a list may show with a blur each; longer lists share one blurred layer
+HOVER_MS = 200          # Hover transition, animated by the client
+HOVER_THROTTLE = 0.05   # Seconds hover events pile up before the changed cards are pushed
+
+# (bgcolor, border, shadow, scale) at rest and under the pointer
+_REST = (
+    ft.colors.with_opacity(0.05, ft.colors.WHITE),
+    ft.border.all(1, ft.colors.with_opacity(0.1, ft.colors.WHITE)),
+    ft.BoxShadow(spread_radius=1, blur_radius=10, color=ft.colors.with_opacity(0.1, ft.colors.BLACK)),
+    1.0,
+)
+_HOVER = (
+    ft.colors.with_opacity(0.1, "#6200EA"),                            # Purple tint
+    ft.border.all(1, ft.colors.with_opacity(0.5, "#BB86FC")),          # Glow border
+    ft.BoxShadow(spread_radius=1, blur_radius=20, color=ft.colors.with_opacity(0.4, "#6200EA")),
+    1.02,                                                              # Slight lift
+)
+
+_hovered = weakref.WeakKeyDictionary()  # page -> {id(card): card} waiting to be pushed
+
+def _queue_hover(card):
+    # One page.update() per HOVER_THROTTLE for every card that changed, so a
+    # mouse sweep is a few small messages instead of two per card
+    page = card.page
+    if page is None:
+        return
+    waiting = _hovered.get(page)
+    if waiting is None:
+        waiting = _hovered[page] = {}
+    if not waiting:
+        asyncio.get_running_loop().call_later(HOVER_THROTTLE, _flush_hover, page)
+    waiting[id(card)] = card
+
+def _flush_hover(page):
+    cards = _hovered.pop(page, {}).values()
+    changed = [card for card in cards if card.page is not None and card.show_hover()]
+    if changed:
+        try:
+            page.update(*changed)
+        except Exception:
+            pass  # Session went away meanwhile
+
+def glass_backdrop(content, **kwargs):
+    """One blurred layer behind a whole list of cards made with blur=False."""
+    return ft.Container(content=content, border_radius=15, blur=BLUR, **kwargs)
+
+
 class GlassCard(ft.Container):
-    def __init__(self, content, width=None, height=None, on_click=None, padding=20):
+    """
+    Frosted card with a hover glow. Enter / exit only record the pointer;
+    changed cards are pushed together every HOVER_THROTTLE seconds (a card
+    the pointer crossed in between sends nothing) and the client animates
+    the change. Cards in long lists pass blur=False and sit on one
+    glass_backdrop(): a backdrop filter per card is the most expensive thing
+    the client draws.
+    """
+
+    def __init__(self, content, width=None, height=None, on_click=None, padding=20, blur=True):
+        bgcolor, border, shadow, scale = _REST
         super().__init__(
             content=content,
             width=width,
             height=height,
             border_radius=15,
             padding=padding,
-            # Default State
-            bgcolor=ft.colors.with_opacity(0.05, ft.colors.WHITE),
-            border=ft.border.all(1, ft.colors.with_opacity(0.1, ft.colors.WHITE)),
-            blur=ft.Blur(10, 10, ft.BlurTileMode.MIRROR),
-            shadow=ft.BoxShadow(
-                spread_radius=1,
-                blur_radius=10,
-                color=ft.colors.with_opacity(0.1, ft.colors.BLACK),
-            ),
+            bgcolor=bgcolor,
+            border=border,
+            shadow=shadow,
+            scale=scale,
+            blur=BLUR if blur else None,
             on_click=on_click,
-            on_hover=self.handle_hover, # <--- Connect the hover event
-            animate=ft.animation.Animation(200, "easeOut"), # Smooth transition
-            animate_scale=ft.animation.Animation(200, "easeOut"),
+            on_hover=self.handle_hover,
+            animate=ft.animation.Animation(HOVER_MS, "easeOut"),  # Smooth transition, run by the client
+            animate_scale=ft.animation.Animation(HOVER_MS, "easeOut"),
         )
+        self.hovered = False  # Where the pointer is
+        self.shown = False    # What the client was last sent
+
+    async def handle_hover(self, e):
+        self.hovered = e.data == "true"
+        _queue_hover(self)
+
+    def show_hover(self):
+        """Applies the pointer state; returns True if it changed."""
+        if self.hovered == self.shown:
+            return False
+        self.shown = self.hovered
+        self.bgcolor, self.border, self.shadow, self.scale = _HOVER if self.hovered else _REST
+        return True
 
-    def handle_hover(self, e):
-        if e.data == "true": # Mouse Enter
-            self.bgcolor = ft.colors.with_opacity(0.1, "#6200EA") # Purple tint
-            self.border = ft.border.all(1, ft.colors.with_opacity(0.5, "#BB86FC")) # Glow border
-            self.shadow.blur_radius = 20
-            self.shadow.color = ft.colors.with_opacity(0.4, "#6200EA") # Purple shadow
-            self.scale = 1.02 # Slight lift
-        else: # Mouse Exit
-            self.bgcolor = ft.colors.with_opacity(0.05, ft.colors.WHITE)
-            self.border = ft.border.all(1, ft.colors.with_opacity(0.1, ft.colors.WHITE))
-            self.shadow.blur_radius = 10
-            self.shadow.color = ft.colors.with_opacity(0.1, ft.colors.BLACK)
-            self.scale = 1.0
-        self.update()
\ No newline at end of file
+    def set_blur(self, on):
+        """Returns True if it changed."""
+        if (self.blur is not None) == on:
+            return False
+        self.blur = BLUR if on else None
+        return True
@@ -0,0 +1,89 @@
+import time
+import flet as ft
+from src.services import perf
+from src.services.io_pool import run_io
+from src.services.scheduler import get_scheduler
+
+HOTKEY = "F9"
+ROWS = 16  # Timings shown
+
+
+class PerfOverlay(ft.Container):
+    """
+    Debug overlay with the last timings (store, sync, render and every
+    page.update with the controls / bytes it sent), redrawn once a second
+    while open. Opening it turns recording on; "Save trace" writes what has
+    been recorded as a Chrome trace file. Toggled with HOTKEY.
+    """
+
+    def __init__(self):
+        self.rows = [ft.Text("", size=11, font_family="monospace", color="white70", no_wrap=True)
+                     for _ in range(ROWS)]
+        self.status = ft.Text("", size=11, color="white54")
+        self.tick_token = None
+        self.was_enabled = False
+        super().__init__(
+            visible=False,
+            right=10,
+            top=10,
+            width=460,
+            padding=12,
+            border_radius=10,
+            bgcolor=ft.colors.with_opacity(0.85, "black"),
+            border=ft.border.all(1, ft.colors.with_opacity(0.2, "white")),
+            content=ft.Column(
+                spacing=2,
+                controls=[
+                    ft.Row(
+                        alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                        controls=[
+                            ft.Text(f"PERF  ({HOTKEY} to close)", size=12, weight="bold", color="#BB86FC"),
+                            ft.TextButton("Save trace", on_click=self.save_trace),
+                        ]
+                    ),
+                    *self.rows,
+                    self.status,
+                ]
+            )
+        )
+
+    async def toggle(self):
+        self.visible = not self.visible
+        if self.visible:
+            self.was_enabled = perf.enabled()
+            perf.enable()
+            self.redraw()
+            self.tick_token = get_scheduler().subscribe(self.on_tick)
+        else:
+            perf.enable(self.was_enabled)
+            if self.tick_token is not None:
+                get_scheduler().unsubscribe(self.tick_token)
+                self.tick_token = None
+        with perf.quiet():
+            self.update()
+
+    def redraw(self):
+        spans = perf.recent(ROWS)
+        for text, s in zip(self.rows, spans + [None] * (ROWS - len(spans))):
+            text.value = self.describe(s) if s else ""
+
+    @staticmethod
+    def describe(s):
+        line = f"{s['ms']:8.2f} ms  {s['name']}"
+        if "controls" in s['args']:
+            line += f"  {s['args']['controls']} ctl, {s['args']['bytes']:,} B"
+        return line
+
+    def on_tick(self, now):
+        # Redrawn and pushed here, unrecorded, so the overlay doesn't time itself
+        self.redraw()
+        with perf.quiet():
+            self.update()
+        return []
+
+    async def save_trace(self, e):
+        path = time.strftime("flowdeck-trace-%Y%m%d-%H%M%S.json")
+        count = await run_io(perf.export_trace, path)
+        self.status.value = f"{count} events -> {path}"
+        with perf.quiet():
+            self.status.update()
@@ -0,0 +1,99 @@
+import flet as ft
+from src.ui.components.glass_card import GlassCard
+
+class TaskCard(GlassCard):
+    """
+    One task row. The card is created once per task id and then patched in
+    place (set_done / set_text), so Flet only sends the properties that
+    actually changed instead of a brand new control tree.
+
+    Cards are isolated: updating the list around them doesn't walk into
+    every card's children looking for changes, so a patched card has to be
+    pushed itself (VirtualList.refresh() says which ones were).
+    """
+
+    def __init__(self, title, subtitle, is_done=False, on_toggle=None, on_focus=None, blur=True):
+        self.title = title
+        self.is_done = is_done
+        self.on_toggle = on_toggle
+        self.on_focus = on_focus
+
+        self.checkbox = ft.Checkbox(value=is_done, on_change=self.handle_toggle)
+        self.title_text = ft.Text(
+            title,
+            size=16,
+            overflow=ft.TextOverflow.ELLIPSIS,
+            style=self.title_style(is_done)
+        )
+        self.subtitle_text = ft.Text(subtitle, size=12, color="white54")
+        # Hide Play button if done
+        self.play_button = ft.Container(
+            visible=not is_done,
+            content=ft.IconButton(
+                ft.icons.PLAY_ARROW,
+                icon_color="#BB86FC",
+                tooltip="Focus Mode",
+                on_click=self.handle_focus
+            )
+        )
+
+        super().__init__(
+            width=600,
+            height=80,
+            blur=blur,
+            content=ft.Row(
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                controls=[
+                    ft.Row(controls=[
+                        self.checkbox,
+                        ft.Column(
+                            alignment=ft.MainAxisAlignment.CENTER,
+                            spacing=2,
+                            controls=[self.title_text, self.subtitle_text]
+                        )
+                    ]),
+                    self.play_button
+                ]
+            )
+        )
+
+    def is_isolated(self):
+        return True
+
+    @staticmethod
+    def title_style(is_done):
+        # A style that has a line through it once the task is done
+        return ft.TextStyle(
+            decoration=ft.TextDecoration.LINE_THROUGH if is_done else ft.TextDecoration.NONE,
+            color=ft.colors.with_opacity(0.5, "white") if is_done else "white",
+            weight=ft.FontWeight.BOLD
+        )
+
+    # on_toggle(value) / on_focus(title) are coroutines
+    async def handle_toggle(self, e):
+        if self.on_toggle:
+            await self.on_toggle(e.control.value)
+
+    async def handle_focus(self, e):
+        if self.on_focus:
+            await self.on_focus(self.title)
+
+    def set_done(self, is_done):
+        """Returns True if anything changed."""
+        if is_done == self.is_done:
+            return False
+        self.is_done = is_done
+        self.checkbox.value = is_done
+        self.title_text.style = self.title_style(is_done)
+        self.play_button.visible = not is_done
+        return True
+
+    def set_text(self, title, subtitle):
+        changed = False
+        if title != self.title:
+            self.title = self.title_text.value = title
+            changed = True
+        if subtitle != self.subtitle_text.value:
+            self.subtitle_text.value = subtitle
+            changed = True
+        return changed
@@ -0,0 +1,95 @@
+import flet as ft
+from src.services import perf
+
+def slice_segments(segments, offset, limit):
+    """
+    Rows [offset, offset + limit) of a list made of consecutive segments.
+    `segments` is a list of (size, read) where read(offset, limit) returns
+    that slice of the segment, so only the segments in the window are read.
+    """
+    rows = []
+    for size, read in segments:
+        if offset >= size:
+            offset -= size
+            continue
+        rows.extend(read(offset, min(size - offset, limit - len(rows))))
+        offset = 0
+        if len(rows) >= limit:
+            break
+    return rows
+
+class VirtualList(ft.ListView):
+    """
+    Windowed list for big backlogs. Rows are pulled from `fetch(offset, limit)`
+    one page at a time: the first page is built up front and the next one only
+    when the user scrolls near the end of what is loaded. Every row has the
+    same fixed extent, so Flutter can lay the list out without measuring it.
+
+    Cards are cached by `key(row)` like the dashboard sections, so refresh()
+    re-fetches the loaded window and only patches/adds/drops what changed.
+    `patch(card, row)` returns True when it changed the card.
+    """
+
+    def __init__(self, fetch, key, make, patch=None, item_extent=80, page_size=40, prefetch=10, **kwargs):
+        super().__init__(
+            item_extent=item_extent,
+            on_scroll=self.handle_scroll,
+            on_scroll_interval=100,
+            **kwargs
+        )
+        self.fetch = fetch
+        self.key = key
+        self.make = make
+        self.patch = patch
+        self.page_size = page_size
+        self.prefetch = prefetch  # Rows left below the viewport before we page more in
+        self.cards = {}
+        self.loaded = 0
+        self.exhausted = False
+
+    def refresh(self):
+        """
+        (Re)load the current window, at least one page. Returns the cards that
+        were patched; update them along with the list (isolated cards aren't
+        reached by the list's own update).
+        """
+        want = max(self.loaded, self.page_size)
+        rows = self.fetch(0, want)
+        self.loaded = len(rows)
+        self.exhausted = len(rows) < want
+        self.controls, patched = self.reconcile(rows)
+        return patched
+
+    def load_more(self):
+        if self.exhausted:
+            return False
+        rows = self.fetch(self.loaded, self.page_size)
+        self.exhausted = len(rows) < self.page_size
+        self.loaded += len(rows)
+        for row in rows:
+            card = self.cards[self.key(row)] = self.make(row)
+            self.controls.append(card)
+        return bool(rows)
+
+    @perf.timed("virtual_list.reconcile", "render")
+    def reconcile(self, rows):
+        controls = []
+        patched = []
+        seen = set()
+        for row in rows:
+            key = self.key(row)
+            seen.add(key)
+            card = self.cards.get(key)
+            if card is None:
+                card = self.cards[key] = self.make(row)
+            elif self.patch and self.patch(card, row):
+                patched.append(card)
+            controls.append(card)
+        for key in [k for k in self.cards if k not in seen]:
+            del self.cards[key]
+        return controls, patched
+
+    async def handle_scroll(self, e):
+        extent = self.item_extent + (self.spacing or 0)
+        if e.max_scroll_extent - e.pixels < extent * self.prefetch and self.load_more():
+            self.update()
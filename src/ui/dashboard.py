@@ -1,22 +1,47 @@
 import flet as ft
 import datetime
-import threading
-import time
-from src.ui.components.glass_card import GlassCard
-from src.services.github_sync import fetch_my_issues
-from src.services.local_db import get_local_tasks, add_local_task, mark_task_complete
+from src.ui.components.task_card import TaskCard
+from src.ui.components.glass_card import GlassCard, glass_backdrop, BLUR, BLUR_LIMIT
+from src.services.github_sync import get_sync
+from src.services.scheduler import get_scheduler
+from src.ui.components.virtual_list import VirtualList, slice_segments
+from src.services.local_db import get_store, get_local_tasks_page, count_local_tasks, mark_task_complete
+from src.services.search_index import get_search_index
+from src.services.hub import get_hub, TASKS, OUTBOX
+from src.services.github_outbox import get_outbox, is_pull, CLOSE, REOPEN
+from src.services.io_pool import run_io
+from src.services import perf
+
+CARD_HEIGHT = 80  # TaskCard is a fixed 600x80, so every row gets the same extent
 
 class Dashboard(ft.UserControl):
-    def __init__(self, page, on_start_focus, on_show_debrief):
+    def __init__(self, page, on_start_focus, on_show_debrief, now=datetime.datetime.now):
         super().__init__()
         self.page = page
         self.on_start_focus = on_start_focus
         self.on_show_debrief = on_show_debrief
+        self.now = now  # Clock for the time, date and greeting (benchmarks pin it)
         
         # UI State
         self.clock_text = ft.Text("00:00:00", size=32, weight="bold", color="#E0E0E0", font_family="monospace")
         self.date_text = ft.Text("", size=14, color="white54")
-        self.task_column = ft.Column(spacing=15, scroll=ft.ScrollMode.AUTO)
+        self.task_column = ft.Column(spacing=15, expand=True)
+        self.empty_text = ft.Text("No active tasks. Time to relax?", color="white24", italic=True, visible=False)
+        self.gh_issues = []
+
+        # Only the cards near the viewport are built; more are paged in on scroll
+        self.task_list = VirtualList(
+            fetch=self.fetch_rows,
+            key=lambda row: (row['kind'], row['id']),
+            make=self.make_row,
+            patch=self.patch_row,
+            item_extent=CARD_HEIGHT,
+            spacing=15,
+            expand=True
+        )
+        # Long lists: one blurred layer behind every card instead of one per card
+        self.list_backdrop = glass_backdrop(self.task_list, expand=True)
+        self.shared_blur = True
         
         # Input Field
         self.input_task = ft.TextField(
@@ -29,43 +54,123 @@ class Dashboard(ft.UserControl):
             on_submit=self.add_manual_task 
         )
 
-        # Start Clock
-        self.running = True
-        self.th = threading.Thread(target=self.update_clock, args=(), daemon=True)
-        self.th.start()
-
-    def update_clock(self):
-        while self.running:
-            now = datetime.datetime.now()
-            self.clock_text.value = now.strftime("%I:%M:%S %p")
-            self.date_text.value = now.strftime("%a, %b %d, %Y")
-            try:
-                self.update()
-            except:
-                pass
-            time.sleep(1)
+        # Search box: filters the list through the in-memory index (built on first use)
+        self.search_box = ft.TextField(
+            hint_text="Search (try is:open, repo:flow)",
+            prefix_icon=ft.icons.SEARCH,
+            bgcolor=ft.colors.with_opacity(0.1, ft.colors.WHITE),
+            border_radius=15,
+            border_color="transparent",
+            color="white",
+            width=300,
+            on_change=self.on_search
+        )
+        self.query = ""
+        self.search_index = None
+        self.search_cache = None  # (query, index version, matching keys)
+        self.tick_token = None
+        self.hub_token = None
+
+    def update_clock(self, tick=None):
+        # Called by the shared scheduler once a second; only changed Texts are pushed
+        now = self.now()
+        changed = []
+        for text, value in ((self.clock_text, now.strftime("%I:%M:%S %p")),
+                            (self.date_text, now.strftime("%a, %b %d, %Y"))):
+            if text.value != value:
+                text.value = value
+                changed.append(text)
+        return changed
 
     def did_mount(self):
+        # Tasks and issues come from the process-wide store and sync worker,
+        # shared with every other session; the hub tells us when they change
+        self.sync = get_sync()
+        self.outbox = get_outbox()
+        self.hub = get_hub()
+        self.issues_topic = self.hub.watch_sync(self.sync)
+        self.start_listening()
         self.load_tasks()
 
-    def add_manual_task(self, e):
-        if not self.input_task.value:
+    def will_unmount(self):
+        self.stop_listening()
+
+    async def on_show(self):
+        # Back from another view (the ViewManager keeps us alive): catch up on
+        # what changed meanwhile, e.g. a task finished in focus mode
+        self.start_listening()
+        self.gh_issues = self.sync.get_cached_issues()
+        self.page.update(*self.refresh_list())
+
+    def on_hide(self):
+        self.stop_listening()
+
+    def start_listening(self):
+        if self.tick_token is None:
+            self.hub_token = self.hub.subscribe([TASKS, OUTBOX, self.issues_topic], self.on_shared_change)
+            self.update_clock()
+            self.tick_token = get_scheduler().subscribe(self.update_clock)
+
+    def stop_listening(self):
+        if self.tick_token is not None:
+            self.hub.unsubscribe(self.hub_token)
+            get_scheduler().unsubscribe(self.tick_token)
+            self.tick_token = None
+
+    async def add_manual_task(self, e):
+        title = self.input_task.value
+        if not title:
             return
-        add_local_task(self.input_task.value)
         self.input_task.value = ""
-        self.load_tasks()
-        self.update()
+        await run_io(get_store().add, title)
+        # Reconciles the loaded window, so only the new card goes over the wire
+        self.page.update(self.input_task, *self.refresh_list())
 
-    def toggle_task(self, task_id, current_value):
-        # Toggle the task state
-        mark_task_complete(task_id, is_complete=current_value)
-        self.load_tasks()
+    async def toggle_task(self, task_id, current_value):
+        # Toggle the task state (local only, no GitHub round trip; the stats
+        # file write goes to the I/O pool)
+        await run_io(mark_task_complete, task_id, is_complete=current_value)
+        card = self.task_list.cards.get(("local", task_id))
+        if card and card.set_done(current_value):
+            card.update()
+
+    async def toggle_issue(self, issue, done):
+        # Optimistic: the card flips now and the write goes out through the
+        # outbox (queued on the I/O pool, sent whenever GitHub lets us)
+        card = self.task_list.cards.get(("issue", issue['id']))
+        if card and card.set_done(done):
+            card.update()
+        await run_io(self.outbox.enqueue, CLOSE if done else REOPEN, issue)
+
+    async def on_search(self, e):
+        self.query = self.search_box.value.strip()
+        if self.query and self.search_index is None:
+            self.search_index = await run_io(get_search_index)  # First search builds it: keep that off the loop
+        self.page.update(*self.refresh_list())
+
+    def search_keys(self):
+        # Same query and nothing changed in the index since: reuse the last answer
+        version = self.search_index.version
+        if self.search_cache is None or self.search_cache[:2] != (self.query, version):
+            self.search_cache = (self.query, version, self.search_index.search(self.query))
+        return self.search_cache[2]
 
+    async def on_shared_change(self, changes):
+        # Called by the hub on the event loop, at most once per fan-out window,
+        # when tasks changed (in this session or any other) or new issues arrived
+        if self.issues_topic in changes:
+            self.gh_issues = changes[self.issues_topic]
+        try:
+            self.page.update(*self.refresh_list())
+        except Exception:
+            pass  # Not on the page anymore
+
+    @perf.timed("dashboard.load_tasks", "render")
     def load_tasks(self):
         self.task_column.controls.clear()
         
         # hero section with greeting
-        hour = datetime.datetime.now().hour
+        hour = self.now().hour
         if 5 <= hour < 12: greeting = "Good Morning,"
         elif 12 <= hour < 17: greeting = "Good Afternoon,"
         else: greeting = "Good Evening,"
@@ -87,97 +192,112 @@ class Dashboard(ft.UserControl):
             )
         )
         #end of hero
-        
-        # 1. Fetch Data
-        try:
-            gh_issues = fetch_my_issues()
-        except:
-            gh_issues = []
-            
-        # CRITICAL: Ensure local_db.py allows 'include_completed'
-        local_tasks = get_local_tasks(include_completed=True)
-
-        # 2. Section: Manual Tasks
-        if local_tasks:
-            self.task_column.controls.append(ft.Text("MY TASKS", size=12, color="#BB86FC", weight="bold"))
-            for t in local_tasks:
-                is_done = t.get('completed', False)
-                card = self.create_task_card(
-                    title=t['title'], 
-                    subtitle="Manual Entry", 
-                    is_manual=True,
-                    task_id=t['id'],
-                    is_done=is_done
-                )
-                self.task_column.controls.append(card)
-
-        # 3. Section: GitHub Issues
-        if gh_issues:
-            self.task_column.controls.append(ft.Container(height=10))
-            self.task_column.controls.append(ft.Text("GITHUB ISSUES", size=12, color="#BB86FC", weight="bold"))
-            for issue in gh_issues:
-                self.task_column.controls.append(self.create_task_card(
-                    title=issue['title'], 
-                    subtitle=f"Repo: {issue['repo']}",
-                    is_manual=False
-                ))
-
-        if not local_tasks and not gh_issues:
-             self.task_column.controls.append(
-                ft.Text("No active tasks. Time to relax?", color="white24", italic=True)
-            )
 
+        self.task_column.controls.extend([self.empty_text, self.list_backdrop])
+        self.gh_issues = self.sync.get_cached_issues()
+        self.refresh_list()
         self.update()
 
-    def create_task_card(self, title, subtitle, is_manual, task_id=None, is_done=False):
-        # 1. Define the Style Object correctly
-        # This tells Flet: "Make a style that has a line through it"
-        task_style = ft.TextStyle(
-            decoration=ft.TextDecoration.LINE_THROUGH if is_done else ft.TextDecoration.NONE,
-            color=ft.colors.with_opacity(0.5, "white") if is_done else "white",
-            weight=ft.FontWeight.BOLD
-        )
+    @perf.timed("dashboard.refresh_list", "render")
+    def refresh_list(self):
+        """Re-reads the visible rows; returns the controls to push."""
+        patched = self.task_list.refresh()
+        self.empty_text.visible = self.task_list.loaded == 0
+        self.empty_text.value = "Nothing matches that search." if self.query else "No active tasks. Time to relax?"
+        return [self.task_list, self.empty_text, *patched, *self.fit_blur()]
 
-        return GlassCard(
-            width=600,
-            height=80,
-            content=ft.Row(
-                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
-                controls=[
-                    ft.Row(controls=[
-                        ft.Checkbox(
-                            value=is_done, 
-                            on_change=lambda e: self.toggle_task(task_id, e.control.value) if is_manual else None
-                        ),
-                        ft.Column(
-                            alignment=ft.MainAxisAlignment.CENTER,
-                            spacing=2,
-                            controls=[
-                                # 2. Apply the style object to the Text
-                                ft.Text(
-                                    title, 
-                                    size=16, 
-                                    overflow=ft.TextOverflow.ELLIPSIS,
-                                    style=task_style # <--- This is the key fix
-                                ),
-                                ft.Text(subtitle, size=12, color="white54")
-                            ]
-                        )
-                    ]),
-                    # Hide Play button if done
-                    ft.Container(
-                        visible=not is_done,
-                        content=ft.IconButton(
-                            ft.icons.PLAY_ARROW, 
-                            icon_color="#BB86FC", 
-                            tooltip="Focus Mode",
-                            on_click=lambda e: self.on_start_focus(task_id, title)
-                        )
-                    )
-                ]
+    def fit_blur(self):
+        # Up to BLUR_LIMIT rows each card gets its own blur; past that they
+        # share the backdrop's. Returns what to push when that flips.
+        shared = self.task_list.loaded > BLUR_LIMIT
+        if shared == self.shared_blur:
+            return []
+        self.shared_blur = shared
+        self.list_backdrop.blur = BLUR if shared else None
+        cards = [card for card in self.task_list.cards.values()
+                 if isinstance(card, GlassCard) and card.set_blur(not shared)]
+        return [self.list_backdrop, *cards]
+
+    @perf.timed("dashboard.fetch_rows", "render")
+    def fetch_rows(self, offset, limit):
+        """
+        Rows [offset, offset + limit) of the virtual list:
+        MY TASKS header, local tasks (newest first), GITHUB ISSUES header, issues.
+        Local tasks are paged straight from the store.
+        """
+        if self.query:
+            return self.fetch_search_rows(offset, limit)
+
+        segments = []
+        # CRITICAL: Ensure local_db.py allows 'include_completed'
+        n_local = count_local_tasks(include_completed=True)
+        if n_local:
+            segments.append((1, lambda o, l: [{"kind": "header", "id": "local", "label": "MY TASKS"}]))
+            segments.append((n_local, lambda o, l: [
+                dict(t, kind="local") for t in get_local_tasks_page(o, l, include_completed=True)
+            ]))
+        issues = self.gh_issues
+        if issues:
+            segments.append((1, lambda o, l: [{"kind": "header", "id": "github", "label": "GITHUB ISSUES"}]))
+            segments.append((len(issues), lambda o, l: [dict(i, kind="issue") for i in issues[o:o + l]]))
+
+        return slice_segments(segments, offset, limit)
+
+    def fetch_search_rows(self, offset, limit):
+        keys = self.search_keys()
+        if not keys:
+            return []
+        label = f"{len(keys)} RESULT{'S' if len(keys) != 1 else ''}"
+        def read(o, l):
+            docs = (self.search_index.get(k) for k in keys[o:o + l])
+            return [d for d in docs if d is not None]
+        return slice_segments([
+            (1, lambda o, l: [{"kind": "header", "id": "search", "label": label}]),
+            (len(keys), read),
+        ], offset, limit)
+
+    def make_row(self, row):
+        if row['kind'] == "header":
+            return ft.Container(
+                height=CARD_HEIGHT,
+                alignment=ft.alignment.bottom_left,
+                content=ft.Text(row['label'], size=12, color="#BB86FC", weight="bold")
+            )
+        if row['kind'] == "local":
+            task_id = row['id']
+            return TaskCard(
+                title=row['title'],
+                subtitle="Manual Entry",
+                is_done=row.get('completed', False),
+                on_toggle=lambda value: self.toggle_task(task_id, value),
+                on_focus=lambda title: self.on_start_focus(task_id, title),
+                blur=not self.shared_blur
             )
+        issue = row
+        return TaskCard(
+            title=row['title'],
+            subtitle=f"Repo: {row['repo']}",
+            is_done=self.outbox.state_of(row['id']) == "closed",
+            on_toggle=None if is_pull(row) else lambda value: self.toggle_issue(issue, value),
+            on_focus=lambda title: self.on_start_focus(None, title, issue),
+            blur=not self.shared_blur
         )
 
+    def patch_row(self, card, row):
+        # Returns True if the card changed and needs pushing
+        if row['kind'] == "header":
+            changed = card.content.value != row['label']
+            card.content.value = row['label']
+            return changed
+        if row['kind'] == "local":
+            changed = card.set_text(row['title'], "Manual Entry")
+            return card.set_done(row.get('completed', False)) or changed
+        if row['kind'] == "issue":
+            # Closed from here but not synced yet: keep showing it done
+            changed = card.set_text(row['title'], f"Repo: {row['repo']}")
+            return card.set_done(self.outbox.state_of(row['id']) == "closed") or changed
+        return False
+
     def build(self):
         return ft.Column(
             expand=True,
@@ -209,7 +329,8 @@ class Dashboard(ft.UserControl):
                                 icon_color="#BB86FC", 
                                 icon_size=40,
                                 on_click=self.add_manual_task
-                            )
+                            ),
+                            self.search_box
                         ]
                     )
                 ),
@@ -230,7 +351,7 @@ class Dashboard(ft.UserControl):
                         icon=ft.icons.ANALYTICS,
                         bgcolor="#BB86FC",
                         color="black",
-                        on_click=lambda e: self.on_show_debrief()
+                        on_click=self.on_show_debrief
                     )
                 )
             ]
@@ -1,41 +1,80 @@
 import flet as ft
+import datetime
 from src.ui.components.glass_card import GlassCard
-from src.services.local_db import get_local_tasks
+from src.ui.components.virtual_list import VirtualList, slice_segments
+from src.services.stats import get_stats
+from src.services.focus_log import get_focus_log
+from src.services.io_pool import run_io
+from src.services import perf
+
+WIN_ROW_HEIGHT = 50
 
 class DailyDebrief(ft.UserControl):
-    def __init__(self, page, on_back):
+    def __init__(self, page, on_back, now=datetime.datetime.now):
         super().__init__()
         self.page = page
         self.on_back = on_back
+        self.now = now  # Clock deciding which day is "today" (benchmarks pin it)
         
         # Create empty controls that we will update later
         self.tasks_completed_text = ft.Text("0", size=40, weight="bold")
         self.hours_focused_text = ft.Text("0.0", size=40, weight="bold")
-        self.wins_list = ft.Column(spacing=10)
+        self.today = None
+        self.focus_by_task = {}
+        # The ListView itself holds the rows (no Column inside), paged in on scroll:
+        # today's wins, then one row per earlier day from the rollups
+        self.wins_list = VirtualList(
+            fetch=self.fetch_rows,
+            key=lambda row: (row['kind'], row['key']),
+            make=self.create_row,
+            item_extent=WIN_ROW_HEIGHT,
+            spacing=10,
+            expand=True
+        )
 
     def did_mount(self):
-        # This runs EVERY TIME the component is shown
-        self.refresh_stats()
+        # First time the component is shown
+        self.page.run_task(self.refresh_stats)
 
-    def refresh_stats(self):
-        # 1. Fetch fresh data
-        all_tasks = get_local_tasks(include_completed=True)
-        completed_tasks = [t for t in all_tasks if t.get('completed', False)]
-        
-        count_completed = len(completed_tasks)
-        hours_focused = round(count_completed * 0.4, 1) # Approx 25 mins per task
+    async def on_show(self):
+        # Every later time (the ViewManager keeps the view alive)
+        await self.refresh_stats()
+
+    @perf.timed("debrief.read_today", "render")
+    def read_today(self):
+        # Blocking reads, run on the I/O pool
+        now = self.now()
+        midnight = datetime.datetime.combine(now.date(), datetime.time())
+        return get_stats().day(now), get_focus_log().focus_by_task(midnight, midnight + datetime.timedelta(days=1))
+
+    async def refresh_stats(self):
+        # 1. Fetch today's precomputed aggregates (no task scan) and the
+        # per-task focus time for today, straight from the session log
+        self.today, self.focus_by_task = await run_io(self.read_today)
+        count_completed = self.today['completed']
+        hours_focused = round(self.today['focus_seconds'] / 3600, 1)
 
         # 2. Update the UI controls
         self.tasks_completed_text.value = str(count_completed)
         self.hours_focused_text.value = str(hours_focused)
         
-        # 3. Rebuild the list of wins
-        self.wins_list.controls.clear()
-        for t in completed_tasks:
-            self.wins_list.controls.append(self.create_win_row(t))
-        
+        # 3. Reload the first page of wins
+        self.wins_list.refresh()
+
         self.update()
 
+    def fetch_rows(self, offset, limit):
+        stats = get_stats()
+        wins = list(reversed(self.today['wins']))  # Latest win first
+        segments = [(len(wins), lambda o, l: [dict(w, kind="win", key=w['at']) for w in wins[o:o + l]])]
+        n_days = stats.history_count(before=self.today['date'])
+        if n_days:
+            segments.append((1, lambda o, l: [{"kind": "header", "key": "history", "title": "Earlier"}]))
+            segments.append((n_days, lambda o, l: [
+                dict(d, kind="day", key=d['date']) for d in stats.history(o, l, before=self.today['date'])
+            ]))
+        return slice_segments(segments, offset, limit)
+
     def build(self):
         return ft.Container(
             expand=True,
@@ -72,11 +111,7 @@ class DailyDebrief(ft.UserControl):
                     ft.Text("Today's Accomplishments", size=16, weight="bold"),
                     ft.Container(
                         expand=True,
-                        content=ft.ListView(
-                            expand=True,
-                            spacing=10,
-                            controls=[self.wins_list] # We put the column inside the listview
-                        )
+                        content=self.wins_list
                     )
                 ]
             )
@@ -97,8 +132,37 @@ class DailyDebrief(ft.UserControl):
             )
         )
 
+    def create_row(self, row):
+        if row['kind'] == "win":
+            return self.create_win_row(row)
+        if row['kind'] == "header":
+            return ft.Container(
+                height=WIN_ROW_HEIGHT,
+                alignment=ft.alignment.bottom_left,
+                content=ft.Text(row['title'], size=16, weight="bold")
+            )
+        return self.create_day_row(row)
+
+    def create_day_row(self, day):
+        hours = round(day['focus_seconds'] / 3600, 1)
+        return ft.Container(
+            height=WIN_ROW_HEIGHT,
+            padding=15,
+            border_radius=10,
+            bgcolor=ft.colors.with_opacity(0.03, "white"),
+            content=ft.Row(
+                alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
+                controls=[
+                    ft.Text(day['date'], color="white70"),
+                    ft.Text(f"{day['completed']} done  ·  {hours} h focused", color="white54")
+                ]
+            )
+        )
+
     def create_win_row(self, task):
+        focused = self.focus_by_task.get(task['id'], 0) if task['id'] is not None else 0
         return ft.Container(
+            height=WIN_ROW_HEIGHT,
             padding=15,
             border_radius=10,
             bgcolor=ft.colors.with_opacity(0.05, "white"),
@@ -110,6 +174,7 @@ class DailyDebrief(ft.UserControl):
                         ft.Container(width=10),
                         ft.Text(task['title'], weight="bold")
                     ]),
+                    ft.Text(f"{round(focused / 60)} min focused", color="white54", visible=focused >= 60),
                 ]
             )
         )
\ No newline at end of file
@@ -1,12 +1,21 @@
 import flet as ft
+import math
 import time
-import threading
+import asyncio
+import functools
 from src.ui.components.glass_card import GlassCard
+from src.ui.components.ambient_audio import get_ambient_player
+from src.services.scheduler import get_scheduler
+from src.services.stats import get_stats
+from src.services import focus_log
+from src.services.io_pool import run_io
+from src.services.assets import get_asset_cache, focus_background, is_remote, sized_url, bucket
 
 class FocusMode(ft.UserControl):
-    def __init__(self, page, task_title, on_exit, on_complete):
+    def __init__(self, page, task_title, on_exit, on_complete, task_id=None):
         super().__init__()
         self.page = page
+        self.task_id = task_id
         self.task_title = task_title
         self.on_exit = on_exit
         self.on_complete = on_complete
@@ -15,14 +24,26 @@ class FocusMode(ft.UserControl):
         self.total_seconds = 25 * 60
         self.current_seconds = self.total_seconds
         self.timer_running = False
+        self.deadline = None     # time.monotonic() at which the countdown hits zero
+        self.tick_token = None
+        self.focused_seconds = 0 # Real focus time on this task, banked on pause/stop
+        self.run_from = 0        # Seconds left when the current run started
+        self.session_started = False
+        self.log_lock = asyncio.Lock()  # Keeps focus-log appends in click order
         
-        # Audio Players
-        self.audio_rain = ft.Audio(src="assets/sounds/rain.mp3", autoplay=False, release_mode="loop")
-        self.audio_wind = ft.Audio(src="assets/sounds/wind.mp3", autoplay=False, release_mode="loop")
-        self.audio_thunder = ft.Audio(src="assets/sounds/thunder.mp3", autoplay=False, release_mode="loop")
-        self.page.overlay.extend([self.audio_rain, self.audio_wind, self.audio_thunder])
+        # Ambient sounds: one mixed player per page, kept across visits
+        self.ambient = get_ambient_player(page)
 
         # --- UI COMPONENTS ---
+
+        # 0. Background photo: the cached copy sized for this window if there
+        # is one (prefetched at startup), the CDN otherwise
+        self.background = ft.Image(
+            src=self.background_src(),
+            fit=ft.ImageFit.COVER,
+            opacity=0.8,
+            expand=True
+        )
         
         # 1. The Timer Text (Clickable)
         self.timer_text = ft.Text(
@@ -37,6 +58,8 @@ class FocusMode(ft.UserControl):
             content=self.timer_text
         )
 
+        self.title_text = ft.Text(task_title, size=16, color="white70")
+
         # 2. Play Button
         self.play_icon = ft.IconButton(
             ft.icons.PLAY_ARROW_ROUNDED, 
@@ -56,24 +79,45 @@ class FocusMode(ft.UserControl):
             ]
         )
 
+    async def set_task(self, task_id, task_title):
+        # The view is cached between sessions; a different task starts a fresh timer
+        if (task_id, task_title) != (self.task_id, self.task_title):
+            # Time spent on the previous task still counts, even unfinished
+            previous, seconds = self.task_id, self.bank_run()
+            focused, self.focused_seconds = self.focused_seconds, 0
+            self.session_started = False
+            self.task_id = task_id
+            self.task_title = self.title_text.value = task_title
+            self.stop_ticking()
+            self.timer_running = False
+            self.play_icon.icon = ft.icons.PLAY_ARROW_ROUNDED
+            self.current_seconds = self.total_seconds
+            mins, secs = divmod(self.current_seconds, 60)
+            self.timer_text.value = "{:02d}:{:02d}".format(mins, secs)
+            await self.log(focus_log.PAUSE, previous, seconds)
+            await run_io(get_stats().record_focus, focused)
+
     def create_mode_button(self, label, mins):
         return ft.Container(
             padding=ft.padding.symmetric(horizontal=15, vertical=8),
             border_radius=20,
             bgcolor=ft.colors.with_opacity(0.2, "black"),
-            on_click=lambda e: self.set_time_direct(mins),
+            on_click=functools.partial(self.set_time_direct, mins),
             content=ft.Text(label, size=12, color="white")
         )
 
-    def set_time_direct(self, minutes):
+    async def set_time_direct(self, minutes, e=None):
+        seconds = self.bank_run()
+        self.stop_ticking()
         self.timer_running = False
         self.play_icon.icon = ft.icons.PLAY_ARROW_ROUNDED
         self.total_seconds = minutes * 60
         self.current_seconds = self.total_seconds
         self.timer_text.value = "{:02d}:00".format(minutes)
         self.update()
+        await self.log(focus_log.PAUSE, self.task_id, seconds)
 
-    def open_edit_time_dialog(self, e):
+    async def open_edit_time_dialog(self, e):
         if self.timer_running: return
 
         # Input field for custom time
@@ -84,60 +128,168 @@ class FocusMode(ft.UserControl):
             text_align="center"
         )
 
-        def save_time(e):
+        async def save_time(e):
             try:
                 mins = int(time_input.value)
-                self.set_time_direct(mins)
-                self.page.dialog.open = False
-                self.page.update()
             except ValueError:
-                pass # Ignore invalid input
+                return # Ignore invalid input
+            self.page.dialog.open = False
+            self.page.update()
+            await self.set_time_direct(mins)
+
+        async def cancel(e):
+            self.page.dialog.open = False
+            self.page.update()
 
         self.page.dialog = ft.AlertDialog(
             title=ft.Text("Set Timer Duration"),
             content=time_input,
             actions=[
-                ft.TextButton("Cancel", on_click=lambda e: setattr(self.page.dialog, 'open', False) or self.page.update()),
+                ft.TextButton("Cancel", on_click=cancel),
                 ft.ElevatedButton("Save", on_click=save_time)
             ]
         )
         self.page.dialog.open = True
         self.page.update()
 
-    def toggle_timer(self, e):
-        self.timer_running = not self.timer_running
-        if self.timer_running:
+    async def toggle_timer(self, e):
+        # State flips before the first await, so a double click sees it
+        if not self.timer_running:
+            self.timer_running = True
             self.play_icon.icon = ft.icons.PAUSE_ROUNDED
-            threading.Thread(target=self.run_timer, daemon=True).start()
+            # Count down against a monotonic deadline so ticks can't drift
+            self.deadline = time.monotonic() + self.current_seconds
+            self.run_from = self.current_seconds
+            kind, seconds = (focus_log.RESUME if self.session_started else focus_log.START), 0
+            self.session_started = True
+            self.stop_ticking()
+            self.tick_token = get_scheduler().subscribe(self.run_timer)
         else:
+            kind, seconds = focus_log.PAUSE, self.bank_run()
+            self.timer_running = False
             self.play_icon.icon = ft.icons.PLAY_ARROW_ROUNDED
+            self.current_seconds = self.remaining_seconds()
+            self.stop_ticking()
         self.update()
+        await self.log(kind, self.task_id, seconds)
 
-    def run_timer(self):
-        while self.timer_running and self.current_seconds > 0:
-            mins, secs = divmod(self.current_seconds, 60)
-            self.timer_text.value = "{:02d}:{:02d}".format(mins, secs)
-            self.current_seconds -= 1
+    def bank_run(self, now=None):
+        # Move the time counted down since the run started into focused_seconds;
+        # returns those seconds (0 if the timer wasn't running)
+        if not self.timer_running:
+            return 0
+        remaining = self.remaining_seconds(now)
+        seconds = self.run_from - remaining
+        self.focused_seconds += seconds
+        self.run_from = remaining
+        return seconds
+
+    async def log(self, kind, task_id, seconds=0):
+        # One focus-log record (an fsync) on the I/O pool; the lock keeps the
+        # records in the order they happened. A pause with nothing banked is skipped.
+        if kind == focus_log.PAUSE and not seconds:
+            return
+        ts = time.time()
+        async with self.log_lock:
+            await run_io(focus_log.get_focus_log().append, kind, task_id, seconds, ts)
+
+    async def finish(self, e):
+        task_id, title, seconds = self.task_id, self.task_title, self.bank_run()
+        self.session_started = False
+        self.stop_ticking()
+        self.timer_running = False
+        self.play_icon.icon = ft.icons.PLAY_ARROW_ROUNDED
+        focused, self.focused_seconds = self.focused_seconds, 0
+        await self.log(focus_log.FINISH, task_id, seconds)
+        await self.on_complete(task_id, title, focused)
+
+    def remaining_seconds(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0, math.ceil(self.deadline - now))
+
+    def stop_ticking(self):
+        if self.tick_token is not None:
+            get_scheduler().unsubscribe(self.tick_token)
+            self.tick_token = None
+
+    def run_timer(self, now):
+        # Called by the shared scheduler once a second while running
+        if not self.timer_running:
+            return []
+        self.current_seconds = self.remaining_seconds(now)
+        mins, secs = divmod(self.current_seconds, 60)
+        value = "{:02d}:{:02d}".format(mins, secs)
+        changed = []
+        if value != self.timer_text.value:
+            self.timer_text.value = value
+            changed.append(self.timer_text)
+        if self.current_seconds == 0:
+            # Ticks are plain callbacks; the log write runs as its own task
+            self.page.run_task(self.log, focus_log.PAUSE, self.task_id, self.bank_run(now))
+            self.timer_running = False
+            self.play_icon.icon = ft.icons.PLAY_ARROW_ROUNDED
+            changed.append(self.play_icon)
+            self.stop_ticking()
+        return changed
+
+    def window_size(self):
+        return self.page.window.width, self.page.window.height
+
+    def background_src(self):
+        source = focus_background()
+        src, _ = get_asset_cache().lookup(source, *self.window_size())
+        if src is None:
+            src = sized_url(source, *bucket(*self.window_size())) if is_remote(source) else source
+        return src
+
+    async def load_background(self):
+        # Swap in the right-size local copy, fetching it if the prefetch
+        # hasn't (window resized since, or first run). Offline with nothing
+        # cached we keep what we have: the dark overlay still reads fine.
+        cache, source = get_asset_cache(), focus_background()
+        src, exact = cache.lookup(source, *self.window_size())
+        if not exact:
             try:
-                self.update()
-            except:
-                break
-            time.sleep(1)
+                src = await run_io(cache.fetch, source, *self.window_size())
+            except Exception as e:
+                print(f"Background fetch failed: {e}")
+        if src and src != self.background.src:
+            self.background.src = src
+            self.background.update()
+
+    def did_mount(self):
+        self.page.run_task(self.load_background)
+
+    def will_unmount(self):
+        self.stop_ticking()
+
+    def on_hide(self):
+        # The countdown keeps its deadline while we're away; we just stop drawing it
+        self.stop_ticking()
+
+    def on_show(self):
+        self.page.run_task(self.load_background)
+        if self.timer_running and self.tick_token is None:
+            changed = self.run_timer(time.monotonic())
+            if self.timer_running:
+                self.tick_token = get_scheduler().subscribe(self.run_timer)
+            if changed:
+                self.page.update(*changed)
 
     # --- AUDIO SETTINGS ---
-    def open_audio_settings(self, e):
-        # (Same logic as before, just kept cleaner)
-        def toggle(e, ctrl): ctrl.play() if e.control.value else ctrl.pause()
-        def slide(e, ctrl): ctrl.volume = e.control.value / 100; ctrl.update()
-        
+    async def open_audio_settings(self, e):
+        # The rows show (and change) the page's mixer state, so reopening keeps it
+        async def toggle(name, e): await self.ambient.set_layer(name, e.control.value)
+        async def slide(name, e): self.ambient.set_volume(name, e.control.value)
+
         dlg = ft.AlertDialog(
             title=ft.Text("Ambient Sounds"),
             content=ft.Column(
                 height=200,
                 controls=[
-                    self._sound_row("Rain", self.audio_rain, toggle, slide),
-                    self._sound_row("Wind", self.audio_wind, toggle, slide),
-                    self._sound_row("Thunder", self.audio_thunder, toggle, slide),
+                    self._sound_row("Rain", "rain", toggle, slide),
+                    self._sound_row("Wind", "wind", toggle, slide),
+                    self._sound_row("Thunder", "thunder", toggle, slide),
                 ]
             )
         )
@@ -145,31 +297,25 @@ class FocusMode(ft.UserControl):
         dlg.open = True
         self.page.update()
 
-    def _sound_row(self, name, audio, on_toggle, on_slide):
+    def _sound_row(self, label, name, on_toggle, on_slide):
         return ft.Row(
             controls=[
-                ft.Text(name, width=60),
-                ft.Switch(on_change=lambda e: on_toggle(e, audio)),
-                ft.Slider(min=0, max=100, value=50, expand=True, on_change=lambda e: on_slide(e, audio))
+                ft.Text(label, width=60),
+                ft.Switch(value=name in self.ambient.enabled, on_change=functools.partial(on_toggle, name)),
+                ft.Slider(min=0, max=100, value=self.ambient.volumes[name], expand=True,
+                          on_change=functools.partial(on_slide, name))
             ]
         )
 
-    def exit_focus(self, e):
-        self.audio_rain.pause()
-        self.audio_wind.pause()
-        self.audio_thunder.pause()
-        self.on_exit()
+    async def exit_focus(self, e):
+        self.ambient.pause()
+        await self.on_exit()
 
     def build(self):
         return ft.Stack(
             controls=[
                 # LAYER 1: Background Image (Cherry Blossom / Scenic)
-                ft.Image(
-                    src="https://images.unsplash.com/photo-1490750967868-58cb9bdda31c?q=80&w=2070&auto=format&fit=crop",
-                    fit=ft.ImageFit.COVER,
-                    opacity=0.8,
-                    expand=True
-                ),
+                self.background,
                 
                 # LAYER 2: Dark Overlay for text readability
                 ft.Container(bgcolor=ft.colors.with_opacity(0.4, "black"), expand=True),
@@ -202,7 +348,7 @@ class FocusMode(ft.UserControl):
                                     self.mode_row,          # The pills (Pomodoro etc)
                                     self.timer_container,   # The giant text
                                     self.play_icon,         # Play button
-                                    ft.Text(self.task_title, size=16, color="white70") # Current Task
+                                    self.title_text         # Current Task
                                 ]
                             )
                         ),
@@ -238,7 +384,7 @@ class FocusMode(ft.UserControl):
                                         icon=ft.icons.CHECK, 
                                         bgcolor="white", 
                                         color="black", 
-                                        on_click=self.on_complete
+                                        on_click=self.finish
                                     )
                                 ]
                             )
@@ -0,0 +1,65 @@
+import inspect
+import flet as ft
+
+async def _call_hook(view, name):
+    # on_show / on_hide may be plain methods or coroutines
+    hook = getattr(view, name, None)
+    if hook is not None:
+        result = hook()
+        if inspect.isawaitable(result):
+            await result
+
+class ViewManager:
+    """
+    Keeps every top-level view alive in one Stack and switches between them
+    by flipping `visible`, instead of building a new control tree on each
+    navigation. A view is built (via its registered factory) the first time
+    it is needed and mounted the first time it is shown.
+
+    Views may define on_show() / on_hide(), plain or async: on_hide runs
+    before a view is hidden, on_show after an already-mounted view becomes
+    visible again (the first time round, did_mount does that job).
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.stack = ft.Stack(expand=True)
+        self.factories = {}
+        self.views = {}
+        self.current = None
+
+    def register(self, name, factory):
+        self.factories[name] = factory
+
+    def get(self, name):
+        if name not in self.views:
+            self.views[name] = self.factories[name]()
+        return self.views[name]
+
+    async def show(self, name):
+        view = self.get(name)
+        previous = self.views.get(self.current)
+        self.current = name
+        if previous is view:
+            return view
+
+        if previous is not None:
+            await _call_hook(previous, "on_hide")
+            previous.visible = False
+
+        view.visible = True
+        if view not in self.stack.controls:
+            self.stack.controls.append(view)
+            self.page.update(self.stack)  # First mount: did_mount fires
+            return view
+
+        # Only the two `visible` flags go over the wire
+        self.page.update(*[v for v in (previous, view) if v is not None])
+        await _call_hook(view, "on_show")
+        return view
+
+    async def close(self):
+        """Session is going away: let the visible view stop listening to the shared services."""
+        view = self.views.get(self.current)
+        if view is not None:
+            await _call_hook(view, "on_hide")